@@ -1,148 +1,414 @@
-import csv
-import json
-import os
-
-# CONFIGURATION
-INPUT_FILE = "source.csv"  # This must match your converted file name
-OUTPUT_FILE = "canon.json"
-
-# --- THE HARDCODED DIGITAL CANON ---
-# These are the artifacts that exist outside the spreadsheet.
-DIGITAL_CANON = [
-    {"title": "Akira", "director": "Otomo, Katsuhiro", "year": "1988", "type": "ANIME_CEL", "weight": 10.0, "notes": "The Nuclear Cathedral."},
-    {"title": "Neon Genesis Evangelion", "director": "Anno, Hideaki", "year": "1995", "type": "ANIME_CEL", "weight": 9.5, "notes": "The AT Field / Soul Barrier."},
-    {"title": "Ghost in the Shell", "director": "Oshii, Mamoru", "year": "1995", "type": "ANIME_CEL", "weight": 9.5, "notes": "The Ghost in the Machine."},
-    {"title": "Cowboy Bebop", "director": "Watanabe, Shinichiro", "year": "1998", "type": "ANIME_CEL", "weight": 9.0, "notes": "The Jazz of the Void."},
-    {"title": "Robot Jones", "director": "Miller, Greg", "year": "2002", "type": "ANIMATION_WESTERN", "weight": 7.5, "notes": "The Prototype of the Remnant."},
-    {"title": "Angel's Egg", "director": "Oshii, Mamoru", "year": "1985", "type": "ANIME_CEL", "weight": 8.5, "notes": "Faith in the Wasteland."},
-    {"title": "Tekken 3", "director": "Namco", "year": "1997", "type": "GAME_FIGHTING", "weight": 9.0, "notes": "The Frame Data of Reality."},
-    {"title": "Tekken 8", "director": "Harada, Katsuhiro", "year": "2024", "type": "GAME_FIGHTING", "weight": 8.5, "notes": "The Current Battlefield. Blue Spark Protocol."},
-    {"title": "Metal Gear Solid 2: Sons of Liberty", "director": "Kojima, Hideo", "year": "2001", "type": "GAME_NARRATIVE", "weight": 10.0, "notes": "Prediction of the Digital Wasteland."},
-    {"title": "Silent Hill 2", "director": "Team Silent", "year": "2001", "type": "GAME_HORROR", "weight": 9.5, "notes": "The James Protocol. Trauma Audit."},
-    {"title": "Sonic Adventure 2", "director": "Iizuka, Takashi", "year": "2001", "type": "GAME_DREAMCAST", "weight": 8.0, "notes": "The Tragedy of the Ark."},
-    {"title": "Deus Ex", "director": "Spector, Warren", "year": "2000", "type": "GAME_SIM", "weight": 9.0, "notes": "God from the Machine."},
-    {"title": "Jet Set Radio", "director": "Sega", "year": "2000", "type": "GAME_DREAMCAST", "weight": 8.5, "notes": "The Aesthetic of Rebellion."},
-    {"title": "Final Fantasy VII", "director": "Kitase, Yoshinori", "year": "1997", "type": "GAME_RPG", "weight": 9.5, "notes": "Identity Crisis in the Industrial City."}
-]
-
-# THE KIM PROTOCOL WEIGHTING ALGORITHM
-def calculate_shodan_weight(row):
-    weight = 5.0 
-    
-    # Flexible column reading (handles case sensitivity)
-    title = row.get('Title') or row.get('title') or ''
-    director = row.get('Director') or row.get('director') or ''
-    year_str = row.get('Year') or row.get('year') or '0'
-    country = row.get('Country') or row.get('country') or ''
-    fmt = row.get('Format') or row.get('format') or ''
-
-    # 1. DURABILITY CHECK (Age)
-    try:
-        year = int(year_str)
-        if year < 1960: weight += 2.0
-        elif year < 1980: weight += 1.5
-        elif year < 2000: weight += 1.0
-        elif year > 2020: weight -= 1.0
-    except:
-        pass
-
-    # 2. THE HIGH PRIESTS
-    heavy_hitters = [
-        "Kurosawa", "Bergman", "Godard", "Tarkovsky", "Kubrick", 
-        "Hitchcock", "Dreyer", "Ozu", "Fellini", "Lang", "Malick", "Trier"
-    ]
-    for heavy in heavy_hitters:
-        if heavy in director:
-            weight += 2.0
-            break
-
-    # 3. HAPTICS (Format)
-    if "Blu-Ray" in fmt:
-        weight += 0.5
-
-    # 4. ORIGIN BOOTSTRAP
-    if "US" not in country:
-        weight += 0.5
-
-    return min(max(round(weight, 1), 1.0), 10.0)
-
-def main():
-    print("/// PROJECT SHODAN: ARK GENERATION ///")
-    
-    canon_entries = []
-    
-    # PHASE 1: INGEST ANALOG (The CSV)
-    if os.path.exists(INPUT_FILE):
-        print(f"[SYSTEM] Reading {INPUT_FILE}...")
-        try:
-            # utf-8-sig handles the BOM from Excel exports
-            with open(INPUT_FILE, mode='r', encoding='utf-8-sig', errors='replace') as f:
-                reader = csv.DictReader(f)
-                
-                count = 0
-                for row in reader:
-                    title = row.get('Title') or row.get('title')
-                    if not title: continue
-                    
-                    weight = calculate_shodan_weight(row)
-                    
-                    entry = {
-                        "id": f"ARCHIVE-{len(canon_entries):04d}",
-                        "title": title.strip(),
-                        "director": row.get('Director') or row.get('director'),
-                        "year": row.get('Year') or row.get('year'),
-                        "format": row.get('Format') or row.get('format'),
-                        "type": "CINEMA_ANALOG",
-                        "shodan_weight": weight,
-                        "status": "ARCHIVED",
-                        "tags": ["CRITERION"]
-                    }
-                    canon_entries.append(entry)
-                    count += 1
-            print(f"[SUCCESS] Ingested {count} Analog Artifacts.")
-        except Exception as e:
-            print(f"[ERROR] Failed to read CSV: {e}")
-    else:
-        print(f"[CRITICAL] '{INPUT_FILE}' NOT FOUND.")
-        print("Please ensure you exported your Excel file to CSV and named it 'source.csv'.")
-        return
-
-    # PHASE 2: INJECT DIGITAL (Hardcoded List)
-    print("[SYSTEM] Injecting Digital Canon...")
-    for item in DIGITAL_CANON:
-        entry = {
-            "id": f"DIGITAL-{len(canon_entries):04d}",
-            "title": item["title"],
-            "director": item["director"],
-            "year": item["year"],
-            "format": "DIGITAL/ROM",
-            "type": item["type"],
-            "shodan_weight": item["weight"],
-            "status": "ARCHIVED",
-            "tags": ["KIM_PROTOCOL", "MANUAL_ENTRY"],
-            "notes": item.get("notes", "")
-        }
-        canon_entries.append(entry)
-
-    # OUTPUT GENERATION
-    database = {
-        "meta": {
-            "operator": "James Leitner",
-            "version": "2.0",
-            "protocol": "Kim Protocol",
-            "total_artifacts": len(canon_entries)
-        },
-        "canon": canon_entries
-    }
-    
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(database, f, indent=2)
-        
-    print(f"[SUCCESS] Total Database Size: {len(canon_entries)} entries.")
-    print(f"[OUTPUT] Generated '{OUTPUT_FILE}'.")
-    print("The Ark is sealed.")
-
-if __name__ == "__main__":
-    main()
-    print("--------------------------------------------------")
-    print("PROJECT SHODAN: Ark Generation Complete. Logic is Sound.")
\ No newline at end of file
+import argparse
+import csv
+import hashlib
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import shodan_core as core
+from shodan_ark import iter_ark
+from shodan_store import STORE_DB, open_ark
+
+# CONFIGURATION
+INPUT_FILE = "source.csv"  # This must match your converted file name
+OUTPUT_FILE = "canon.json"
+CHUNK_ROWS = 1000  # CSV rows per scoring chunk (the unit of work for --workers)
+
+# --- THE HARDCODED DIGITAL CANON ---
+# These are the artifacts that exist outside the spreadsheet.
+DIGITAL_CANON = [
+    {"title": "Akira", "director": "Otomo, Katsuhiro", "year": "1988", "type": "ANIME_CEL", "weight": 10.0, "notes": "The Nuclear Cathedral."},
+    {"title": "Neon Genesis Evangelion", "director": "Anno, Hideaki", "year": "1995", "type": "ANIME_CEL", "weight": 9.5, "notes": "The AT Field / Soul Barrier."},
+    {"title": "Ghost in the Shell", "director": "Oshii, Mamoru", "year": "1995", "type": "ANIME_CEL", "weight": 9.5, "notes": "The Ghost in the Machine."},
+    {"title": "Cowboy Bebop", "director": "Watanabe, Shinichiro", "year": "1998", "type": "ANIME_CEL", "weight": 9.0, "notes": "The Jazz of the Void."},
+    {"title": "Robot Jones", "director": "Miller, Greg", "year": "2002", "type": "ANIMATION_WESTERN", "weight": 7.5, "notes": "The Prototype of the Remnant."},
+    {"title": "Angel's Egg", "director": "Oshii, Mamoru", "year": "1985", "type": "ANIME_CEL", "weight": 8.5, "notes": "Faith in the Wasteland."},
+    {"title": "Tekken 3", "director": "Namco", "year": "1997", "type": "GAME_FIGHTING", "weight": 9.0, "notes": "The Frame Data of Reality."},
+    {"title": "Tekken 8", "director": "Harada, Katsuhiro", "year": "2024", "type": "GAME_FIGHTING", "weight": 8.5, "notes": "The Current Battlefield. Blue Spark Protocol."},
+    {"title": "Metal Gear Solid 2: Sons of Liberty", "director": "Kojima, Hideo", "year": "2001", "type": "GAME_NARRATIVE", "weight": 10.0, "notes": "Prediction of the Digital Wasteland."},
+    {"title": "Silent Hill 2", "director": "Team Silent", "year": "2001", "type": "GAME_HORROR", "weight": 9.5, "notes": "The James Protocol. Trauma Audit."},
+    {"title": "Sonic Adventure 2", "director": "Iizuka, Takashi", "year": "2001", "type": "GAME_DREAMCAST", "weight": 8.0, "notes": "The Tragedy of the Ark."},
+    {"title": "Deus Ex", "director": "Spector, Warren", "year": "2000", "type": "GAME_SIM", "weight": 9.0, "notes": "God from the Machine."},
+    {"title": "Jet Set Radio", "director": "Sega", "year": "2000", "type": "GAME_DREAMCAST", "weight": 8.5, "notes": "The Aesthetic of Rebellion."},
+    {"title": "Final Fantasy VII", "director": "Kitase, Yoshinori", "year": "1997", "type": "GAME_RPG", "weight": 9.5, "notes": "Identity Crisis in the Industrial City."}
+]
+
+# THE KIM PROTOCOL WEIGHTING ALGORITHM
+# Weights live in the "ark" profile of shodan_rules.json (see shodan_core.Ruleset).
+def calculate_shodan_weight(row):
+    # Flexible column reading (handles case sensitivity)
+    title = row.get('Title') or row.get('title') or ''
+    director = row.get('Director') or row.get('director') or ''
+    year_str = row.get('Year') or row.get('year') or '0'
+    country = row.get('Country') or row.get('country') or ''
+    fmt = row.get('Format') or row.get('format') or ''
+
+    return core.get_plan("ark").score(title, director, year_str, country, fmt)
+
+META = {
+    "operator": "James Leitner",
+    "version": "2.0",
+    "protocol": "Kim Protocol"
+}
+
+class ArkManifest:
+    """
+    Row-hash manifest kept beside the Ark. Maps each source row's identity
+    (normalized title + year) to a stable numeric id and the content hash it
+    was last scored from, so a rebuild only re-scores rows that changed.
+    `dropped` collects the entry ids that must leave the Ark (retired or
+    failed rows), for stores that patch in place.
+    """
+    def __init__(self, data=None, rules=None):
+        data = data or {}
+        self.rules = rules
+        self.rescore_all = data.get("rules") != rules
+        self.next_id = data.get("next_id", 0)
+        self.source = data.get("source")
+        self.rows = data.get("rows", {})
+        self.seen = set()
+        self.complete = True
+        self.failed = set()
+        self.dropped = []
+        self.delta = {"added": 0, "changed": 0, "unchanged": 0, "deleted": 0, "failed": 0}
+
+    @classmethod
+    def load(cls, path, rules=None):
+        if not os.path.exists(path): return cls(rules=rules)
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), rules)
+
+    def current(self, fingerprint):
+        """True when the last build read this exact source under these rules and every row scored."""
+        return (fingerprint is not None and fingerprint == self.source and not self.rescore_all
+                and all(slot["hash"] for slot in self.rows.values()))
+
+    def claim(self, identity, digest):
+        """Returns (id, fresh) for a source row; fresh rows must be (re)scored."""
+        # Repeated identities (same title/year twice) get an occurrence suffix
+        base, n = identity, 1
+        while identity in self.seen:
+            identity = f"{base}#{n}"
+            n += 1
+        self.seen.add(identity)
+        slot = self.rows.get(identity)
+        if slot is None:
+            self.rows[identity] = {"id": self.next_id, "hash": digest}
+            self.next_id += 1
+            self.delta["added"] += 1
+            return self.rows[identity]["id"], True
+        if slot["hash"] != digest or self.rescore_all:
+            slot["hash"] = digest
+            self.delta["changed"] += 1
+            return slot["id"], True
+        self.delta["unchanged"] += 1
+        return slot["id"], False
+
+    def reject(self, ark_id):
+        """Marks a row whose scoring failed: it is re-scored on the next build."""
+        self.failed.add(ark_id)
+        self.dropped.append(entry_id("ARCHIVE", ark_id))
+        self.delta["failed"] += 1
+
+    def close(self):
+        """Retires rows that vanished from the source (skipped if ingestion failed)."""
+        if not self.complete: return
+        for identity in [k for k in self.rows if k not in self.seen]:
+            prefix = "DIGITAL" if identity.startswith(DIGITAL_PREFIX) else "ARCHIVE"
+            self.dropped.append(entry_id(prefix, self.rows.pop(identity)["id"]))
+            self.delta["deleted"] += 1
+
+    def save(self, path):
+        for slot in self.rows.values():
+            if slot["id"] in self.failed: slot["hash"] = None
+        data = {"version": 1, "rules": self.rules, "source": self.source if self.complete else None,
+                "next_id": self.next_id, "rows": self.rows}
+        with open(path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+        os.replace(path + ".tmp", path)
+
+class PreviousArk:
+    """
+    The existing Ark, streamed alongside a rebuild instead of loaded whole.
+    get(id) reads forward to the requested artifact; entries passed on the
+    way are held only until claimed, so memory stays flat while the source
+    keeps its order. If the old Ark turns out unreadable, get() returns None
+    from then on and those rows are simply re-scored.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._entries = iter_ark(path)
+        self._held = {}
+
+    def get(self, ark_id):
+        entry = self._held.pop(ark_id, None)
+        if entry is not None or self._entries is None: return entry
+        try:
+            for entry in self._entries:
+                if entry.get("id") == ark_id: return entry
+                self._held[entry.get("id")] = entry
+        except Exception as e:
+            print(f"[WARNING] Existing Ark unreadable ({e}). Re-scoring the remaining rows.")
+        self._entries = None
+        return None
+
+def manifest_path(output):
+    """One manifest per Ark file: canon.json -> canon.json.manifest."""
+    return output + ".manifest"
+
+def source_fingerprint(input_file):
+    """Hash of the CSV bytes plus the Digital Canon: equal fingerprints mean an identical build."""
+    digest = hashlib.sha1(json.dumps(DIGITAL_CANON, sort_keys=True).encode())
+    try:
+        with open(input_file, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+def rules_fingerprint():
+    """Hash of the ark scoring doctrine; a change forces every row to be re-scored."""
+    doctrine = {"profile": core.RULESET.profiles.get("ark"), "tables": core.RULESET.tables}
+    return hashlib.sha1(json.dumps(doctrine, sort_keys=True).encode()).hexdigest()
+
+DIGITAL_PREFIX = "DIGITAL::"
+
+def entry_id(prefix, ark_id):
+    return f"{prefix}-{ark_id:04d}"
+
+def row_identity(title, year):
+    return f"{core.normalize_key(title)}|{(year or '').strip()}"
+
+def row_digest(values):
+    return hashlib.sha1("\x1f".join(f"{k}={v}" for k, v in values).encode('utf-8')).hexdigest()
+
+def analog_key(row):
+    """(identity, digest) of a CSV row, as claimed from the manifest."""
+    title = row.get('Title') or row.get('title')
+    return row_identity(title, row.get('Year') or row.get('year')), row_digest(row.items())
+
+def digital_key(item):
+    return DIGITAL_PREFIX + row_identity(item["title"], item["year"]), row_digest(sorted(item.items()))
+
+def build_analog_entry(row, ark_id):
+    title = row.get('Title') or row.get('title')
+    return {
+        "id": entry_id("ARCHIVE", ark_id),
+        "title": title.strip(),
+        "director": row.get('Director') or row.get('director'),
+        "year": row.get('Year') or row.get('year'),
+        "format": row.get('Format') or row.get('format'),
+        "type": "CINEMA_ANALOG",
+        "shodan_weight": calculate_shodan_weight(row),
+        "status": "ARCHIVED",
+        "tags": ["CRITERION"]
+    }
+
+def build_digital_entry(item, ark_id):
+    return {
+        "id": entry_id("DIGITAL", ark_id),
+        "title": item["title"],
+        "director": item["director"],
+        "year": item["year"],
+        "format": "DIGITAL/ROM",
+        "type": item["type"],
+        "shodan_weight": item["weight"],
+        "status": "ARCHIVED",
+        "tags": ["KIM_PROTOCOL", "MANUAL_ENTRY"],
+        "notes": item.get("notes", "")
+    }
+
+def score_chunk(jobs):
+    """
+    Worker: scores one chunk of (ark_id, row) jobs. A bad row costs only its
+    own entry: returns (entry, None) or (None, error) per job, in order.
+    """
+    results = []
+    for ark_id, row in jobs:
+        try:
+            results.append((build_analog_entry(row, ark_id), None))
+        except Exception as e:
+            results.append((None, f"{type(e).__name__}: {e}"))
+    return results
+
+def read_chunks(input_file, chunk_rows=CHUNK_ROWS):
+    """Yields the CSV as lists of (line number, row), skipping untitled rows."""
+    # utf-8-sig handles the BOM from Excel exports
+    with open(input_file, mode='r', encoding='utf-8-sig', errors='replace') as f:
+        reader = csv.DictReader(f)
+        chunk = []
+        for row in reader:
+            if not (row.get('Title') or row.get('title')): continue
+            chunk.append((reader.line_num, row))
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+        if chunk: yield chunk
+
+def iter_artifacts(input_file=INPUT_FILE, manifest=None, previous=None, workers=1, chunk_rows=CHUNK_ROWS,
+                   changed_only=False):
+    """
+    Yields Ark entries one at a time: the CSV chunk by chunk (PHASE 1), then
+    the Digital Canon (PHASE 2). Ids come from the manifest, claimed in source
+    order, so output is identical for any worker count. Rows whose hash is
+    unchanged are reused from `previous` (id -> entry), or skipped entirely
+    with changed_only; the rest are scored, in a process pool when workers > 1.
+    """
+    manifest = manifest if manifest is not None else ArkManifest()
+    previous = previous or {}
+
+    def resolve(identity, digest, prefix, build, source):
+        ark_id, fresh = manifest.claim(identity, digest)
+        if not fresh and changed_only: return None
+        reused = None if fresh else previous.get(entry_id(prefix, ark_id))
+        return reused or build(source, ark_id)
+
+    def finish(number, slots, jobs, work):
+        """Merges a chunk's scored entries back into source order and reports on it."""
+        lost = None
+        try:
+            results = work.result() if isinstance(work, Future) else work
+        except Exception as e:
+            # The worker itself died: the whole chunk is retried on the next build
+            lost = f"{type(e).__name__}: {e}"
+            print(f"[ERROR] Chunk {number} lost: {lost}")
+            results = [(None, lost)] * len(jobs)
+        for (slot, ark_id, line, title), (entry, error) in zip(jobs, results):
+            if error:
+                manifest.reject(ark_id)
+                if not lost: print(f"[ERROR] Chunk {number}, line {line} ('{title}'): {error}")
+            slots[slot] = entry
+        errors = sum(1 for _, error in results if error)
+        print(f"[PROGRESS] Chunk {number}: {len(slots)} rows | {len(jobs) - errors} scored | "
+              f"{len(slots) - len(jobs)} reused | {errors} failed")
+        return [entry for entry in slots if entry is not None]
+
+    # PHASE 1: INGEST ANALOG (The CSV)
+    print(f"[SYSTEM] Reading {input_file}...")
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    pending = deque()
+    count = 0
+    try:
+        for number, rows in enumerate(read_chunks(input_file, chunk_rows), 1):
+            slots, jobs = [], []
+            for line, row in rows:
+                title = row.get('Title') or row.get('title')
+                ark_id, fresh = manifest.claim(*analog_key(row))
+                if not fresh and changed_only: continue
+                reused = None if fresh else previous.get(entry_id("ARCHIVE", ark_id))
+                if reused is None: jobs.append((len(slots), ark_id, line, title, row))
+                slots.append(reused)
+            batch = [(ark_id, row) for _, ark_id, _, _, row in jobs]
+            work = pool.submit(score_chunk, batch) if pool else score_chunk(batch)
+            pending.append((number, slots, [job[:4] for job in jobs], work))
+            # Keep a couple of chunks in flight per worker; emit in source order
+            while len(pending) > (2 * workers if pool else 0):
+                for entry in finish(*pending.popleft()):
+                    count += 1
+                    yield entry
+        while pending:
+            for entry in finish(*pending.popleft()):
+                count += 1
+                yield entry
+        print(f"[SUCCESS] Ingested {count} Analog Artifacts.")
+    except (OSError, csv.Error) as e:
+        manifest.complete = False
+        print(f"[ERROR] Failed to read CSV: {e}")
+    finally:
+        if pool: pool.shutdown(cancel_futures=True)
+
+    # PHASE 2: INJECT DIGITAL (Hardcoded List)
+    print("[SYSTEM] Injecting Digital Canon...")
+    for item in DIGITAL_CANON:
+        entry = resolve(*digital_key(item), "DIGITAL", build_digital_entry, item)
+        if entry is not None: yield entry
+
+# Output formats -> default path. The store (shodan_store.open_ark) is picked by extension.
+FORMATS = {"json": OUTPUT_FILE, "jsonl": "canon.jsonl", "ark": "canon.ark", "sqlite": STORE_DB}
+
+def convert(source, output):
+    """Re-encodes an existing Ark in another format (import/export), without touching the CSV."""
+    source_store, target = open_ark(source), open_ark(output)
+    try:
+        total = target.write_artifacts(source_store.iter_artifacts(), META)
+    finally:
+        source_store.close()
+        target.close()
+    print(f"[SUCCESS] Converted {total} artifacts: '{source}' -> '{output}'.")
+
+def main(fmt="json", output=None, full=False, source=None, workers=1):
+    print("/// PROJECT SHODAN: ARK GENERATION ///")
+    output = output or FORMATS[fmt]
+    if source:
+        return convert(source, output)
+    
+    if not os.path.exists(INPUT_FILE):
+        print(f"[CRITICAL] '{INPUT_FILE}' NOT FOUND.")
+        print("Please ensure you exported your Excel file to CSV and named it 'source.csv'.")
+        return
+
+    manifest_file = manifest_path(output)
+    manifest = ArkManifest(rules=rules_fingerprint()) if full else ArkManifest.load(manifest_file, rules_fingerprint())
+    incremental = bool(manifest.rows) and not manifest.rescore_all and os.path.exists(output)
+
+    # THE SHORTCUT: same source bytes, same doctrine -> the Ark on disk is already current
+    fingerprint = source_fingerprint(INPUT_FILE)
+    if incremental and manifest.current(fingerprint):
+        print(f"[DELTA] Source unchanged ({len(manifest.rows)} rows). '{output}' left untouched.")
+        return
+    manifest.source = fingerprint
+
+    store = open_ark(output)
+    try:
+        if incremental and hasattr(store, "patch_artifacts"):
+            # THE PATCH: only added/edited artifacts are written; retired ids are deleted
+            def changes():
+                yield from iter_artifacts(INPUT_FILE, manifest, None, workers, changed_only=True)
+                manifest.close()
+            total = store.patch_artifacts(changes(), manifest.dropped, META)
+        else:
+            # THE DELTA: unchanged artifacts are streamed out of the existing Ark (ids stay stable)
+            previous, aside = None, None
+            if incremental:
+                if output.endswith(".jsonl"):
+                    # JSON Lines is rewritten in place: read the old Ark from beside it
+                    aside = output + ".previous"
+                    os.replace(output, aside)
+                previous = PreviousArk(aside or output)
+
+            # OUTPUT GENERATION (streamed: each artifact is written as it is scored)
+            try:
+                total = store.write_artifacts(iter_artifacts(INPUT_FILE, manifest, previous, workers), META)
+            except BaseException:
+                if aside: os.replace(aside, output)
+                raise
+            if aside: os.remove(aside)
+    finally:
+        store.close()
+    manifest.close()
+    manifest.save(manifest_file)
+        
+    delta = manifest.delta
+    print(f"[DELTA] +{delta['added']} ADDED | ~{delta['changed']} CHANGED | -{delta['deleted']} DELETED | ={delta['unchanged']} REUSED")
+    if delta['failed']:
+        print(f"[WARNING] {delta['failed']} rows failed to score; they are left out and retried next build.")
+    print(f"[SUCCESS] Total Database Size: {total} entries.")
+    print(f"[OUTPUT] Generated '{output}'.")
+    print("The Ark is sealed.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PROJECT SHODAN: ARK GENERATION")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="json",
+                        help="json: classic canon.json layout; jsonl: streamed JSON Lines; ark: memory-mapped binary vault; "
+                             "sqlite: the SQLite store (shodan_store.py)")
+    parser.add_argument("--output", help="output path (default: canon.json / canon.jsonl / canon.ark / shodan.sqlite3); "
+                                         "the extension picks the format")
+    parser.add_argument("--full", action="store_true", help="ignore the manifest and re-score every row (ids restart)")
+    parser.add_argument("--convert", metavar="ARK", help="re-encode an existing Ark (any format) instead of reading the CSV")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="scoring processes (0 = one per core); output is identical for any count")
+    args = parser.parse_args()
+    main(args.format, args.output, args.full, args.convert, args.workers or os.cpu_count() or 1)
+    print("--------------------------------------------------")
+    print("PROJECT SHODAN: Ark Generation Complete. Logic is Sound.")
@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import time
 import sys
@@ -6,344 +7,529 @@ import getpass
 import socket
 import subprocess
 import urllib.request
-import urllib.parse
 import re
-import concurrent.futures
-import threading
 import platform
-import uuid 
+import uuid
 import hashlib
 import json
 from datetime import datetime
+import ghost_hash
+import ghost_journal
+import ghost_scan
+import ghost_telemetry
+import ghost_weather
+import ghost_web
+import ghost_whois
 
-# GLOBAL LOCK
-print_lock = threading.Lock()
+MISSION_LOG = "mission_log.txt"
 
 def slow_print(text, speed=0.02):
+    # The typewriter effect is for the operator only: piped or redirected output prints at once
+    if not sys.stdout.isatty():
+        print(text)
+        return
     for character in text:
         sys.stdout.write(character)
         sys.stdout.flush()
         time.sleep(speed)
     print()
 
-def scan_port(target_ip, port):
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(1)
-        result = sock.connect_ex((target_ip, port))
-        if result == 0:
-            with print_lock:
-                print(f"[+] PORT {port}: OPEN (VULNERABILITY DETECTED)")
-        sock.close()
-    except:
-        pass
-
-def raw_whois(server, query):
-    try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.settimeout(10)
-        s.connect((server, 43))
-        s.send(f"{query}\r\n".encode())
-        response = b""
-        while True:
-            data = s.recv(4096)
-            if not data: break
-            response += data
-        s.close()
-        return response.decode('utf-8', errors='ignore')
-    except Exception as e:
-        return f"Error: {e}"
+def emit(data):
+    """Subcommand output: one JSON document per result, flushed for pipelines."""
+    print(json.dumps(data))
+    sys.stdout.flush()
 
 def get_mac():
     mac = uuid.getnode()
     return ':'.join(('%012X' % mac)[i:i+2] for i in range(0, 12, 2))
 
-# [UPDATED MODULE: WEATHER RECON v2.0 (AUTO-TARGETING)]
-def weather_recon(city=None):
+def system_recon():
+    """Host fingerprint as a dict (IPs are None when unreachable)."""
+    recon = {
+        "os_type": f"{platform.system()} {platform.release()}",
+        "os_version": platform.version(),
+        "machine": platform.machine(),
+        "hostname": socket.gethostname(),
+        "mac_address": get_mac(),
+        "internal_ip": None,
+        "public_ip": None,
+    }
     try:
-        # DYNAMIC TARGETING LOGIC
-        if city:
-            slow_print(f"CALIBRATING SENSORS FOR: {city.upper()}...")
-            city_encoded = urllib.parse.quote(city)
-            url = f"https://wttr.in/{city_encoded}?format=j1"
-        else:
-            slow_print("CALIBRATING SENSORS FOR: LOCAL SIGNAL (IP TRIANGULATION)...")
-            url = "https://wttr.in/?format=j1"
-        
-        req = urllib.request.Request(url)
-        req.add_header('User-Agent', 'GhostProtocol/10.3')
-        
-        with urllib.request.urlopen(req, timeout=5) as response:
-            data = json.loads(response.read().decode('utf-8'))
-            
-            # PARSE TELEMETRY
-            current = data['current_condition'][0]
-            
-            # Extract Location Name from Nearest Area (Verification of IP Target)
-            try:
-                location_name = data['nearest_area'][0]['areaName'][0]['value']
-                region_name = data['nearest_area'][0]['region'][0]['value']
-                target_sector = f"{location_name}, {region_name}"
-            except:
-                target_sector = "UNKNOWN SECTOR"
-
-            temp_f = current['temp_F']
-            wind_speed = current['windspeedMiles']
-            wind_dir = current['winddir16Point']
-            desc = current['weatherDesc'][0]['value']
-            humidity = current['humidity']
-            visibility = current['visibility']
-            
-            # DISPLAY MATRIX
-            print("-" * 50)
-            print(f" SECTOR:        {target_sector.upper()}") 
-            print(f" CONDITIONS:    {desc.upper()}")
-            print(f" THERMAL:       {temp_f}°F")
-            print(f" WIND VECTOR:   {wind_speed} MPH [{wind_dir}]")
-            print(f" VISIBILITY:    {visibility} MILES")
-            print(f" HUMIDITY:      {humidity}%")
-            print("-" * 50)
-            
-            # THRESHOLD ALERTS (THE SENTINEL LOGIC)
-            alerts = []
-            if int(wind_speed) > 20:
-                alerts.append("HIGH WIND VELOCITY")
-            if "snow" in desc.lower() or "squall" in desc.lower() or "ice" in desc.lower():
-                alerts.append("FROZEN PRECIPITATION")
-            if int(visibility) < 2:
-                alerts.append("LOW VISIBILITY (BLINDING)")
-                
-            if alerts:
-                print("\033[1;31m") # RED ALERT
-                for alert in alerts:
-                    slow_print(f"[!] WARNING: {alert} DETECTED")
-                print("\033[1;32m") # RETURN TO GREEN
-            else:
-                slow_print("[*] ATMOSPHERE STABLE.")
-                
-    except Exception as e:
-        slow_print(f"[-] SENSOR MALFUNCTION: {e}")
-
-# SYSTEM STARTUP
-if platform.system().lower() == 'windows':
-    os.system('cls')
-else:
-    os.system('clear')
-
-print("\033[1;32m")
-slow_print("GHOST PROTOCOL v10.3 (AUTO-TARGET) LOADED.")
-print("---------------------------------")
-
-current_user = getpass.getuser()
-slow_print(f"OPERATOR: {current_user}")
-slow_print(f"KERNEL:   {platform.release()}")
-
-while True:
-    print("\nSELECT OPERATION:")
-    print("1.  ARCHIVE MISSION (LOGOS - LOCAL)")
-    print("2.  NETWORK PING (ECHO)")
-    print("3.  PORT SCANNER (THREADED)")
-    print("4.  EXTRACT PAGE TITLE")
-    print("5.  WHOIS LOOKUP")
-    print("6.  SYSTEM RECON")
-    print("7.  HASH GENERATOR")
-    print("8.  BRUTE FORCE SIMULATOR")
-    print("9.  ATMOSPHERIC SENSORS (AUTO/MANUAL)")
-    print("10. SOMATIC TELEMETRY (REAL-TIME)")
-    print("11. DISCONNECT")
-    
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        s.connect(("8.8.8.8", 80))
+        recon["internal_ip"] = s.getsockname()[0]
+        s.close()
+    except:
+        pass
     try:
-        choice = input("\n> ")
-    except KeyboardInterrupt:
-        print("\n\n[*] CONNECTION SEVERED.")
-        break
-
-    if choice == "1":
-        slow_print("ENTER MISSION OBJECTIVE:")
-        mission = input("> ")
-        if mission == "": mission = "routine_update"
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"{timestamp} | {mission}\n"
-        print("\n--- STAGING ENTRY ---")
-        print(log_entry.strip())
-        confirm = input("SAVE TO DISK? [Y/n]: ").lower()
-        if confirm != "n":
-            with open("mission_log.txt", "a") as f:
-                f.write(log_entry)
-            print("\033[1;32m")
-            slow_print("[+] ENTRY LOGGED. READY FOR MANUAL COMMIT.")
+        recon["public_ip"] = urllib.request.urlopen('https://api.ipify.org', timeout=3).read().decode('utf8')
+    except:
+        pass
+    return recon
+
+def hash_text(secret):
+    return {
+        "input": secret,
+        "md5": hashlib.md5(secret.encode()).hexdigest(),
+        "sha256": hashlib.sha256(secret.encode()).hexdigest(),
+    }
+
+def page_title(url):
+    """Fetches a page and returns its <title> (None if absent). Raises on connection failure."""
+    return ghost_web.page_title(url)
+
+def log_mission(mission, path=MISSION_LOG, timestamp=None):
+    """Appends a 'timestamp | text' line to the mission log (and its index). Returns the entry."""
+    return ghost_journal.journal_for(path).append(mission, timestamp)
+
+def ping(target, count=2, capture=False):
+    param = '-n' if platform.system().lower() == 'windows' else '-c'
+    return subprocess.run(["ping", param, str(count), target], capture_output=capture, text=capture)
+
+# [UPDATED MODULE: WEATHER RECON v2.0 (AUTO-TARGETING)]
+def weather_report(city=None):
+    """wttr.in telemetry for a city (None = IP auto-detect), parsed, with threshold alerts. Cached per sector."""
+    return ghost_weather.default_station().report(city)
+
+def weather_recon(cities=None):
+    """One sector (a city, or None for IP auto-detect) in detail, or a comma list of sectors as one board."""
+    if isinstance(cities, str):
+        cities = [c.strip() for c in cities.split(",") if c.strip()]
+    cities = cities or [None]
+    station = ghost_weather.default_station()
+    if len(cities) == 1:
+        city = cities[0]
+        slow_print(f"CALIBRATING SENSORS FOR: {city.upper()}..." if city else "CALIBRATING SENSORS FOR: LOCAL SIGNAL (IP TRIANGULATION)...")
+    else:
+        slow_print(f"CALIBRATING SENSORS FOR {len(cities)} SECTORS...")
+    reports = station.sweep(cities)
+    station.save()
+
+    if len(reports) == 1:
+        report = reports[0]
+        if "error" in report:
+            slow_print(f"[-] SENSOR MALFUNCTION: {report['error']}")
+            return
+        # DISPLAY MATRIX
+        print("-" * 50)
+        print(f" SECTOR:        {report['sector'].upper()}")
+        print(f" CONDITIONS:    {report['conditions'].upper()}")
+        print(f" THERMAL:       {report['temp_f']}°F")
+        print(f" WIND VECTOR:   {report['wind_mph']} MPH [{report['wind_dir']}]")
+        print(f" VISIBILITY:    {report['visibility_miles']} MILES")
+        print(f" HUMIDITY:      {report['humidity']}%")
+        if report["cached"]: print(f" SIGNAL AGE:    {report['age_s']:.0f}s (CACHED)")
+        print("-" * 50)
+    else:
+        print("-" * 78)
+        print(f" {'SECTOR':<24} {'CONDITIONS':<20} {'TEMP':>5} {'WIND':>8} {'VIS':>5}  AGE")
+        print("-" * 78)
+        for report in reports:
+            if "error" in report:
+                print(f" {report['sector'][:24]:<24} SENSOR MALFUNCTION: {report['error'][:40]}")
+                continue
+            age = f"{report['age_s']:.0f}s" if report["cached"] else "LIVE"
+            print(f" {report['sector'][:24]:<24} {report['conditions'][:20]:<20} {report['temp_f']:>4}F "
+                  f"{report['wind_mph']:>4} MPH {report['visibility_miles']:>3}mi  {age}")
+        print("-" * 78)
+
+    alerts = ghost_weather.alert_board(reports)
+    if alerts:
+        print("\033[1;31m") # RED ALERT
+        for alert in alerts:
+            prefix = f"{alert['sector'].upper()}: " if len(reports) > 1 else ""
+            slow_print(f"[!] WARNING: {prefix}{alert['alert']} DETECTED")
+        print("\033[1;32m") # RETURN TO GREEN
+    elif any("error" not in r for r in reports):
+        slow_print("[*] ATMOSPHERE STABLE.")
+
+# --- THE INTERACTIVE CONSOLE ---
+def interactive():
+    # SYSTEM STARTUP
+    if sys.stdout.isatty():
+        if platform.system().lower() == 'windows':
+            os.system('cls')
         else:
-            slow_print("ENTRY DISCARDED.")
+            os.system('clear')
 
-    elif choice == "2":
-        target = input("ENTER TARGET: ")
-        if target == "": target = "google.com"
-        param = '-n' if platform.system().lower() == 'windows' else '-c'
-        subprocess.run(["ping", param, "2", target])
+    print("\033[1;32m")
+    slow_print("GHOST PROTOCOL v10.3 (AUTO-TARGET) LOADED.")
+    print("---------------------------------")
+
+    current_user = getpass.getuser()
+    slow_print(f"OPERATOR: {current_user}")
+    slow_print(f"KERNEL:   {platform.release()}")
+
+    while True:
+        print("\nSELECT OPERATION:")
+        print("1.  ARCHIVE MISSION (LOGOS - LOCAL)")
+        print("2.  NETWORK PING (ECHO)")
+        print("3.  PORT SCANNER (ASYNC)")
+        print("4.  EXTRACT PAGE TITLE")
+        print("5.  WHOIS LOOKUP")
+        print("6.  SYSTEM RECON")
+        print("7.  HASH GENERATOR")
+        print("8.  BRUTE FORCE SIMULATOR")
+        print("9.  ATMOSPHERIC SENSORS (AUTO/MANUAL)")
+        print("10. SOMATIC TELEMETRY (REAL-TIME)")
+        print("11. DISCONNECT")
 
-    elif choice == "3":
-        target = input("ENTER TARGET DOMAIN: ")
-        if target == "": target = "google.com"
-        try:
-            target_ip = socket.gethostbyname(target)
-            slow_print(f"TARGET RESOLVED: {target_ip}")
-            slow_print("INITIALIZING 100 THREADS...")
-            with concurrent.futures.ThreadPoolExecutor(max_workers=100) as executor:
-                for port in range(1, 1025):
-                    executor.submit(scan_port, target_ip, port)
-            slow_print("SCAN COMPLETE.")
-        except socket.gaierror:
-            slow_print("ERROR: COULD NOT RESOLVE HOST.")
-
-    elif choice == "4":
-        slow_print("ENTER TARGET URL:")
-        url = input("> ")
-        if url == "": url = "https://www.amazon.com"
-        if not url.startswith("http"): url = "https://" + url
-        slow_print(f"CONNECTING TO {url}...")
         try:
-            req = urllib.request.Request(url)
-            req.add_header('User-Agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0.4472.124')
-            response = urllib.request.urlopen(req, timeout=5)
-            html_content = response.read().decode('utf-8', errors='ignore')
-            pattern = re.search('<title>(.*?)</title>', html_content, flags=re.IGNORECASE)
-            if pattern:
-                slow_print(f"TARGET IDENTIFIED: {pattern.group(1).strip()}")
+            choice = input("\n> ")
+        except (KeyboardInterrupt, EOFError):
+            print("\n\n[*] CONNECTION SEVERED.")
+            break
+
+        if choice == "1":
+            slow_print("ENTER MISSION OBJECTIVE (OR 'SEARCH [words] [since:DATE] [until:DATE]'):")
+            mission = input("> ")
+            if mission == "": mission = "routine_update"
+            if mission.upper().startswith("SEARCH"):
+                terms = mission.split()[1:]
+                bounds = {t.split(":", 1)[0].lower(): t.split(":", 1)[1] for t in terms if t.lower().startswith(("since:", "until:"))}
+                words = [t for t in terms if not t.lower().startswith(("since:", "until:"))]
+                entries = ghost_journal.journal_for(MISSION_LOG).query(bounds.get("since"), bounds.get("until"), words)
+                print("---------------------------------")
+                for entry in entries:
+                    print(f"{entry['timestamp']} | {entry['mission']}")
+                print("---------------------------------")
+                slow_print(f"{len(entries)} ENTRIES RECOVERED FROM THE ARCHIVE.")
+                continue
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            print("\n--- STAGING ENTRY ---")
+            print(f"{timestamp} | {mission}")
+            confirm = input("SAVE TO DISK? [Y/n]: ").lower()
+            if confirm != "n":
+                log_mission(mission, timestamp=timestamp)
+                print("\033[1;32m")
+                slow_print("[+] ENTRY LOGGED. READY FOR MANUAL COMMIT.")
             else:
-                slow_print("WARNING: NO TITLE SIGNAL FOUND.")
-        except Exception as e:
-            slow_print(f"CONNECTION FAILED: {e}")
-
-    elif choice == "5":
-        target = input("ENTER DOMAIN (e.g., google.com): ")
-        if target == "": target = "google.com"
-        slow_print("CONTACTING ROOT SERVER (IANA)...")
-        iana_response = raw_whois("whois.iana.org", target)
-        referral = re.search(r'refer:\s*(.*)', iana_response, re.IGNORECASE)
-        if referral:
-            whois_server = referral.group(1).strip()
-            slow_print(f"REDIRECTING TO: {whois_server}")
+                slow_print("ENTRY DISCARDED.")
+
+        elif choice == "2":
+            target = input("ENTER TARGET: ")
+            if target == "": target = "google.com"
+            ping(target)
+
+        elif choice == "3":
+            target = input("ENTER TARGET DOMAIN (OR CIDR BLOCK): ")
+            if target == "": target = "google.com"
+            spec = input("ENTER PORT RANGE [1-1024]: ").strip() or "1-1024"
+            try:
+                ports = ghost_scan.parse_ports(spec)
+                slow_print(f"SWEEPING {len(ports)} PORTS ({ghost_scan.SCAN_CONCURRENCY} CONCURRENT PROBES)...")
+                def report(r):
+                    if r["state"] == ghost_scan.OPEN:
+                        print(f"[+] {r['ip']} PORT {r['port']}: OPEN (VULNERABILITY DETECTED) [{r['latency_ms']} ms]")
+                started = time.time()
+                for host in ghost_scan.run_scan([target], ports, on_result=report):
+                    if host.get("error"):
+                        slow_print("ERROR: COULD NOT RESOLVE HOST.")
+                    else:
+                        print(f"[*] {host['ip']}: {len(host['open'])} OPEN | {host['closed']} CLOSED | {host['filtered']} FILTERED")
+                slow_print(f"SCAN COMPLETE. ({time.time() - started:.2f} SECONDS)")
+            except ValueError as e:
+                slow_print(f"ERROR: {e}")
+
+        elif choice == "4":
+            slow_print("ENTER TARGET URL(S) (SPACE OR COMMA SEPARATED):")
+            urls = input("> ").replace(",", " ").split() or ["https://www.amazon.com"]
+            slow_print(f"CONNECTING TO {len(urls)} TARGET(S)..." if len(urls) > 1 else f"CONNECTING TO {urls[0]}...")
+
+            def report(r):
+                label = f"[{r['url']}] " if len(urls) > 1 else ""
+                if "error" in r:
+                    slow_print(f"{label}CONNECTION FAILED: {r['error']}")
+                elif r["title"] is not None:
+                    slow_print(f"{label}TARGET IDENTIFIED: {r['title']}")
+                else:
+                    slow_print(f"{label}WARNING: NO TITLE SIGNAL FOUND.")
+            ghost_web.bulk_titles(urls, on_result=report)
+
+        elif choice == "5":
+            target = input("ENTER DOMAIN(S) (e.g., google.com, example.org): ")
+            if target == "": target = "google.com"
+            domains = [d for d in re.split(r"[\s,]+", target) if d]
+            slow_print("CONTACTING ROOT SERVER (IANA)...")
+            for result in ghost_whois.bulk_whois(domains):
+                if result["server"] != ghost_whois.IANA_SERVER:
+                    slow_print(f"REDIRECTING TO: {result['server']}" + (" [CACHED]" if result.get("cached") else ""))
+                print("---------------------------------")
+                print(result.get("response") or f"Error: {result.get('error')}")
+            slow_print("WHOIS DATA STREAM COMPLETE.")
+
+        elif choice == "6":
+            slow_print("GATHERING SYSTEM TELEMETRY...")
+            time.sleep(1)
+            recon = system_recon()
             print("---------------------------------")
-            print(raw_whois(whois_server, target))
-        else:
+            print(f"OS TYPE:     {recon['os_type']}")
+            print(f"OS VERSION:  {recon['os_version']}")
+            print(f"MACHINE:     {recon['machine']}")
+            print(f"HOSTNAME:    {recon['hostname']}")
+            print(f"MAC ADDRESS: {recon['mac_address']}")
+            print(f"INTERNAL IP: {recon['internal_ip'] or 'UNKNOWN'}")
+            print(f"PUBLIC IP:   {recon['public_ip'] or 'CONNECTION TIMED OUT'}")
             print("---------------------------------")
-            print(iana_response)
-        slow_print("WHOIS DATA STREAM COMPLETE.")
-
-    elif choice == "6":
-        slow_print("GATHERING SYSTEM TELEMETRY...")
-        time.sleep(1)
-        print("---------------------------------")
-        print(f"OS TYPE:     {platform.system()} {platform.release()}")
-        print(f"OS VERSION:  {platform.version()}")
-        print(f"MACHINE:     {platform.machine()}")
-        print(f"HOSTNAME:    {socket.gethostname()}")
-        print(f"MAC ADDRESS: {get_mac()}")
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            internal_ip = s.getsockname()[0]
-            s.close()
-            print(f"INTERNAL IP: {internal_ip}")
-        except:
-            print("INTERNAL IP: UNKNOWN")
-        try:
-            external_ip = urllib.request.urlopen('https://api.ipify.org', timeout=3).read().decode('utf8')
-            print(f"PUBLIC IP:   {external_ip}")
-        except:
-            print("PUBLIC IP:   CONNECTION TIMED OUT")
-        print("---------------------------------")
-
-    elif choice == "7":
-        slow_print("ENTER TEXT TO HASH:")
-        secret = input("> ")
-        if secret == "": secret = "password123"
-        md5_val = hashlib.md5(secret.encode()).hexdigest()
-        sha256_val = hashlib.sha256(secret.encode()).hexdigest()
-        print("---------------------------------")
-        print(f"INPUT:    {secret}")
-        print(f"MD5:      {md5_val}")
-        print(f"SHA-256:  {sha256_val}")
-        print("---------------------------------")
-        slow_print("CRYPTOGRAPHIC SIGNATURES GENERATED.")
-
-    elif choice == "8":
-        slow_print("ENTER PASSWORD TO SIMULATE HACK:")
-        target_password = input("> ")
-        if target_password == "": target_password = "admin"
-        target_hash = hashlib.md5(target_password.encode()).hexdigest()
-        slow_print(f"TARGET HASH LOCKED: {target_hash}")
-        wordlist = ["password", "123456", "admin", "welcome", "love", "secret", "god", "help", "letmein"]
-        slow_print("INITIATING DICTIONARY ATTACK...")
-        time.sleep(1)
-        found = False
-        start_time = time.time()
-        for word in wordlist:
-            guess_hash = hashlib.md5(word.encode()).hexdigest()
-            print(f"TRYING: {word} \t [{guess_hash}]")
-            time.sleep(0.1)
-            if guess_hash == target_hash:
-                end_time = time.time()
-                print("\033[1;31m")
-                print(f"\n[!] MATCH FOUND: {word}")
-                print(f"TIME ELAPSED: {round(end_time - start_time, 2)} SECONDS")
-                print("\033[1;32m")
-                found = True
-                break
-        if not found:
-            slow_print("\n[-] ATTACK FAILED. PASSWORD NOT IN DICTIONARY.")
-
-    elif choice == "9":
-        slow_print("ENTER TARGET SECTOR (Leave blank for AUTO-DETECT):")
-        user_input = input("> ")
-        # [UPDATED: Pass valid string or None]
-        if user_input.strip() == "":
-            weather_recon(None)
-        else:
-            weather_recon(user_input)
-
-    elif choice == "10":
-        slow_print("INITIALIZING SOMATIC SENSORS (CTRL+C TO ABORT)...")
-        time.sleep(1)
-        print("-" * 65)
-        print(f"{'TIMESTAMP':<20} | {'PRESSURE (Load)':<15} | {'VOLATILE MEM (MB)':<18}")
-        print("-" * 65)
-        try:
-            while True:
-                try:
-                    with open("/proc/loadavg", "r") as f:
-                        load_data = f.read().split()
-                        load_1m = load_data[0]
-                except FileNotFoundError:
-                    load_1m = "N/A (WIN)"
-                mem_used_mb = 0.0
+
+        elif choice == "7":
+            slow_print("ENTER TEXT TO HASH (OR 'FILE <path> [path...]' FOR FILES / DIRECTORIES):")
+            secret = input("> ")
+            if secret == "": secret = "password123"
+            if secret.upper().startswith("FILE "):
+                paths = secret[5:].split()
+                print("---------------------------------")
+                started = time.perf_counter()
+
+                def report(r):
+                    if "error" in r:
+                        print(f"[-] {r['path']}: {r['error']}")
+                        return
+                    print(f"FILE:     {r['path']} ({r['size']:,} bytes, {r['mb_s']} MB/s)")
+                    for name in ghost_hash.ALGORITHMS:
+                        print(f"{name.upper() + ':':<10}{r[name]}")
                 try:
-                    mem_stats = {}
-                    with open("/proc/meminfo", "r") as f:
-                        for line in f:
-                            parts = line.split()
-                            key = parts[0].strip(":")
-                            value = int(parts[1])
-                            if key in ["MemTotal", "MemAvailable"]:
-                                mem_stats[key] = value
-                    if "MemTotal" in mem_stats and "MemAvailable" in mem_stats:
-                        mem_used_kb = mem_stats["MemTotal"] - mem_stats["MemAvailable"]
-                        mem_used_mb = mem_used_kb / 1024
-                except FileNotFoundError:
-                    pass 
-                timestamp = datetime.now().strftime("%H:%M:%S")
-                sys.stdout.write(f"\r{timestamp:<20} | {load_1m:<15} | {mem_used_mb:.2f} MB           ")
+                    results = ghost_hash.hash_files(ghost_hash.expand_paths(paths), on_result=report)
+                except KeyboardInterrupt:
+                    print("\n[*] HASHING ABORTED.")
+                    continue
+                summary = ghost_hash.summarize(results, time.perf_counter() - started)
+                print("---------------------------------")
+                slow_print(f"{summary['files']} FILES FINGERPRINTED: {summary['bytes'] / 1e6:.1f} MB AT {summary['mb_s']} MB/s.")
+                continue
+            digests = hash_text(secret)
+            print("---------------------------------")
+            print(f"INPUT:    {secret}")
+            print(f"MD5:      {digests['md5']}")
+            print(f"SHA-256:  {digests['sha256']}")
+            print("---------------------------------")
+            slow_print("CRYPTOGRAPHIC SIGNATURES GENERATED.")
+
+        elif choice == "8":
+            slow_print("ENTER PASSWORD TO SIMULATE HACK:")
+            target_password = input("> ")
+            if target_password == "": target_password = "admin"
+            target_hash = hashlib.md5(target_password.encode()).hexdigest()
+            slow_print(f"TARGET HASH LOCKED: {target_hash}")
+            wordlist = ["password", "123456", "admin", "welcome", "love", "secret", "god", "help", "letmein"]
+            slow_print("INITIATING DICTIONARY ATTACK...")
+            time.sleep(1)
+            found = False
+            start_time = time.time()
+            for word in wordlist:
+                guess_hash = hashlib.md5(word.encode()).hexdigest()
+                print(f"TRYING: {word} \t [{guess_hash}]")
+                time.sleep(0.1)
+                if guess_hash == target_hash:
+                    end_time = time.time()
+                    print("\033[1;31m")
+                    print(f"\n[!] MATCH FOUND: {word}")
+                    print(f"TIME ELAPSED: {round(end_time - start_time, 2)} SECONDS")
+                    print("\033[1;32m")
+                    found = True
+                    break
+            if not found:
+                slow_print("\n[-] ATTACK FAILED. PASSWORD NOT IN DICTIONARY.")
+
+        elif choice == "9":
+            slow_print("ENTER TARGET SECTOR(S), COMMA SEPARATED (Leave blank for AUTO-DETECT):")
+            weather_recon(input("> "))
+
+        elif choice == "10":
+            slow_print("INITIALIZING SOMATIC SENSORS (CTRL+C TO ABORT)...")
+            time.sleep(1)
+            print("-" * 65)
+            print(f"{'TIMESTAMP':<20} | {'PRESSURE (Load)':<15} | {'VOLATILE MEM (MB)':<18} | {'CPU %':<6}")
+            print("-" * 65)
+
+            def show(sample):
+                load = sample['load_1m'] if sample['load_1m'] is not None else "N/A (WIN)"
+                mem = sample['mem_used_mb'] or 0.0
+                cpu = (sample.get('cpu') or {}).get('cpu')
+                cpu = f"{cpu:.1f}" if cpu is not None else "--"
+                sys.stdout.write(f"\r{sample['timestamp']:<20} | {load:<15} | {mem:<15.2f} MB | {cpu:<6}    ")
                 sys.stdout.flush()
-                time.sleep(1)
+            sensors = ghost_telemetry.Sampler()
+            try:
+                sensors.run(on_sample=show)
+            except KeyboardInterrupt:
+                print("\n\n[*] SENSORS DISENGAGED.")
+                time.sleep(0.5)
+            finally:
+                sensors.close()
+
+        elif choice == "11":
+            slow_print("SEVERING CONNECTION...")
+            break
+
+        else:
+            print("INVALID COMMAND")
+
+    print("\033[0m")
+
+# --- THE SCRIPTABLE INTERFACE ---
+def cmd_scan(args):
+    try:
+        # --all streams each probe as it completes; nothing is held back for sorting
+        hosts = ghost_scan.run_scan(args.hosts, ghost_scan.parse_ports(args.ports), args.concurrency, args.timeout,
+                                    on_result=emit if args.all else None)
+    except ValueError as e:
+        print(f"[-] {e}", file=sys.stderr)
+        return 2
+    if not args.all:
+        for host in hosts: emit(host)
+    return 1 if any(h.get("error") for h in hosts) else 0
+
+def cmd_whois(args):
+    results = ghost_whois.bulk_whois(args.domains, args.concurrency, on_result=emit)
+    return 1 if any("error" in r for r in results) else 0
+
+def cmd_telemetry(args):
+    with ghost_telemetry.Sampler(args.interval, args.capacity) as sensors:
+        try:
+            sensors.run(args.count, on_sample=emit)
         except KeyboardInterrupt:
-            print("\n\n[*] SENSORS DISENGAGED.")
-            time.sleep(0.5)
+            pass
+        if args.export:
+            sensors.export(args.export)
+        print(f"[TELEMETRY] {sensors.taken} samples ({len(sensors.history)} buffered), {sensors.overhead()} ms CPU per sample", file=sys.stderr)
 
-    elif choice == "11":
-        slow_print("SEVERING CONNECTION...")
-        break 
+def cmd_title(args):
+    urls = list(args.urls)
+    if args.list:
+        with (sys.stdin if args.list == "-" else open(args.list, 'r', encoding='utf-8')) as f:
+            urls.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    client = ghost_web.TitleClient(budget=args.budget)
+    results = ghost_web.bulk_titles(urls, args.concurrency, client, on_result=emit)
+    print(f"[TITLE] {json.dumps(client.stats)}", file=sys.stderr)
+    return 1 if any("error" in r for r in results) else 0
 
-    else:
-        print("INVALID COMMAND")
+def cmd_recon(args):
+    emit(system_recon())
+
+def cmd_hash(args):
+    if not args.file:
+        for text in args.inputs: emit(hash_text(text))
+        return 0
+    started = time.perf_counter()
+    try:
+        results = ghost_hash.hash_files(ghost_hash.expand_paths(args.inputs), args.algorithms.split(","), args.workers,
+                                        args.chunk_kb * 1024, args.mmap, on_result=emit)
+    except ValueError as e:
+        print(f"[-] {e}", file=sys.stderr)
+        return 2
+    print(f"[HASH] {json.dumps(ghost_hash.summarize(results, time.perf_counter() - started))}", file=sys.stderr)
+    return 1 if any("error" in r for r in results) else 0
+
+def cmd_weather(args):
+    station = ghost_weather.WeatherStation(ttl=args.ttl)
+    try:
+        reports = station.sweep(args.cities, args.concurrency, refresh=args.refresh)
+    finally:
+        station.close()
+    for report in reports: emit(report)
+    print(f"[WEATHER] {json.dumps(dict(station.stats, alerts=len(ghost_weather.alert_board(reports))))}", file=sys.stderr)
+    return 1 if any("error" in r for r in reports) else 0
+
+def cmd_ping(args):
+    result = ping(args.target, args.count, capture=True)
+    emit({"target": args.target, "returncode": result.returncode, "output": result.stdout})
+    return result.returncode
+
+def cmd_log(args):
+    emit(log_mission(" ".join(args.mission), args.file))
+
+def cmd_journal(args):
+    journal = ghost_journal.Journal(args.file)
+    if args.rebuild:
+        journal.rebuild()
+    for entry in journal.query(args.since, args.until, args.words, args.any, args.limit):
+        emit(entry)
+    print(f"[JOURNAL] {json.dumps(journal.stats())}", file=sys.stderr)
+
+def positive_int(text):
+    """argparse type: an integer of at least 1 (sizes and worker counts)."""
+    value = int(text)
+    if value < 1: raise argparse.ArgumentTypeError(f"must be at least 1 (got {value})")
+    return value
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="GHOST PROTOCOL: run without a subcommand for the interactive console")
+    sub = parser.add_subparsers(dest="command")
+
+    p = sub.add_parser("scan", help="asynchronous TCP connect scan")
+    p.add_argument("hosts", nargs="+", help="hostnames, IPs or CIDR blocks")
+    p.add_argument("--ports", default="1-1024", help="ranges, e.g. 1-65535 or 22,80,8000-8100")
+    p.add_argument("--concurrency", type=positive_int, default=ghost_scan.SCAN_CONCURRENCY)
+    p.add_argument("--timeout", type=float, default=ghost_scan.SCAN_TIMEOUT, help="seconds before a port counts as filtered")
+    p.add_argument("--all", action="store_true", help="one record per probe (default: per-host summary)")
+    p.set_defaults(func=cmd_scan)
+
+    p = sub.add_parser("whois", help="bulk WHOIS via cached IANA referrals")
+    p.add_argument("domains", nargs="+")
+    p.add_argument("--concurrency", type=int, default=ghost_whois.BULK_CONCURRENCY)
+    p.set_defaults(func=cmd_whois)
+
+    p = sub.add_parser("telemetry", help="load / memory / CPU / network / disk samples as JSON lines")
+    p.add_argument("--interval", type=float, default=ghost_telemetry.SAMPLE_INTERVAL, help="seconds between samples (fractions allowed)")
+    p.add_argument("--count", type=int, default=0, help="samples to take (0 = until interrupted)")
+    p.add_argument("--capacity", type=positive_int, default=ghost_telemetry.RING_CAPACITY, help="samples kept in the ring buffer for export")
+    p.add_argument("--export", metavar="PATH", help="write the buffered samples on exit (.json or .csv)")
+    p.set_defaults(func=cmd_telemetry)
+
+    p = sub.add_parser("title", help="extract page titles (streams, hangs up at </title>)")
+    p.add_argument("urls", nargs="*")
+    p.add_argument("--list", metavar="PATH", help="file with one URL per line ('-' = stdin)")
+    p.add_argument("--concurrency", type=int, default=ghost_web.BULK_CONCURRENCY)
+    p.add_argument("--budget", type=int, default=ghost_web.TITLE_BUDGET, help="bytes read per page before giving up")
+    p.set_defaults(func=cmd_title)
+
+    p = sub.add_parser("recon", help="system fingerprint")
+    p.set_defaults(func=cmd_recon)
+
+    p = sub.add_parser("hash", help="MD5 / SHA-256 of strings, or single-pass multi-digest of files (--file)")
+    p.add_argument("inputs", nargs="+", help="strings, or with --file: files and directories")
+    p.add_argument("--file", action="store_true", help="treat inputs as paths")
+    p.add_argument("--algorithms", default=",".join(ghost_hash.ALGORITHMS), help="comma-separated hashlib names")
+    p.add_argument("--workers", type=int, default=ghost_hash.HASH_WORKERS)
+    p.add_argument("--chunk-kb", type=int, default=ghost_hash.CHUNK_SIZE // 1024)
+    p.add_argument("--mmap", action="store_true", help="read through mmap instead of a chunk buffer")
+    p.set_defaults(func=cmd_hash)
+
+    p = sub.add_parser("weather", help="atmospheric sensors (no city = IP auto-detect), many sectors at once")
+    p.add_argument("cities", nargs="*")
+    p.add_argument("--concurrency", type=int, default=ghost_weather.WEATHER_CONCURRENCY)
+    p.add_argument("--ttl", type=float, default=ghost_weather.WEATHER_TTL, help="seconds a cached sector stays fresh")
+    p.add_argument("--refresh", action="store_true", help="ignore the cache and re-fetch every sector")
+    p.set_defaults(func=cmd_weather)
+
+    p = sub.add_parser("ping", help="ICMP echo")
+    p.add_argument("target")
+    p.add_argument("--count", type=int, default=2)
+    p.set_defaults(func=cmd_ping)
+
+    p = sub.add_parser("log", help="append to the mission log")
+    p.add_argument("mission", nargs="+")
+    p.add_argument("--file", default=MISSION_LOG)
+    p.set_defaults(func=cmd_log)
+
+    p = sub.add_parser("journal", help="query the mission log by date range and words (indexed)")
+    p.add_argument("words", nargs="*", help="entries must contain all of these words")
+    p.add_argument("--since", help="date or timestamp, inclusive (e.g. 2025-12-15)")
+    p.add_argument("--until", help="date or timestamp, inclusive (a date covers the whole day)")
+    p.add_argument("--any", action="store_true", help="match any of the words instead of all")
+    p.add_argument("--limit", type=int, help="only the newest N matches")
+    p.add_argument("--rebuild", action="store_true", help="re-read the whole log into a fresh index")
+    p.add_argument("--file", default=MISSION_LOG)
+    p.set_defaults(func=cmd_journal)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not args.command:
+        interactive()
+        return 0
+    return args.func(args) or 0
 
-print("\033[0m")
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
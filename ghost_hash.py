@@ -0,0 +1,102 @@
+# ghost_hash.py
+# THE FINGERPRINTER: Single-pass, multi-digest file hashing across a thread pool.
+import hashlib
+import mmap
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# --- CONFIGURATION ---
+ALGORITHMS = ("md5", "sha1", "sha256", "blake2b")
+CHUNK_SIZE = 1 << 20    # 1 MiB: large enough that hashlib drops the GIL on every update
+HASH_WORKERS = min(8, (os.cpu_count() or 1) + 2)
+
+def _digests(algorithms):
+    unknown = [a for a in algorithms if a not in hashlib.algorithms_available]
+    if unknown:
+        raise ValueError(f"unknown hash algorithm(s): {', '.join(unknown)}")
+    digests = {name: hashlib.new(name) for name in algorithms}
+    # shake_* have no fixed length (digest_size 0): hexdigest() would need one
+    variable = [name for name, digest in digests.items() if not digest.digest_size]
+    if variable:
+        raise ValueError(f"variable-length hash algorithm(s) not supported: {', '.join(variable)}")
+    return digests
+
+def _feed_chunks(f, digests, chunk_size):
+    """Reads into one reused buffer, so memory stays at chunk_size whatever the file size."""
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    total = 0
+    while True:
+        n = f.readinto(buffer)
+        if not n: return total
+        piece = view[:n]
+        for digest in digests:
+            digest.update(piece)
+        total += n
+
+def _feed_mmap(f, digests, chunk_size):
+    """Walks a read-only mapping in chunk_size windows; the page cache is the only copy."""
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as view:
+            for offset in range(0, len(mapped), chunk_size):
+                with view[offset:offset + chunk_size] as piece:
+                    for digest in digests:
+                        digest.update(piece)
+        return len(mapped)
+
+def hash_file(path, algorithms=ALGORITHMS, chunk_size=CHUNK_SIZE, use_mmap=False):
+    """
+    Every requested digest of one file from a single read of its bytes.
+    Returns {"path", "size", <algorithm>: hexdigest..., "seconds", "mb_s"}
+    or {"path", "error"}.
+    """
+    digests = _digests(algorithms)
+    started = time.perf_counter()
+    try:
+        with open(path, 'rb') as f:
+            if use_mmap and os.fstat(f.fileno()).st_size > 0:
+                size = _feed_mmap(f, digests.values(), chunk_size)
+            else:
+                size = _feed_chunks(f, digests.values(), chunk_size)
+    except OSError as e:
+        return {"path": path, "error": e.strerror or str(e)}
+    seconds = time.perf_counter() - started
+    result = {"path": path, "size": size}
+    result.update((name, digest.hexdigest()) for name, digest in digests.items())
+    result["seconds"] = round(seconds, 4)
+    result["mb_s"] = round(size / 1e6 / seconds, 1) if seconds > 0 else None
+    return result
+
+def expand_paths(targets):
+    """Files stay as given; directories expand to every file beneath them, sorted."""
+    for target in targets:
+        if os.path.isdir(target):
+            for root, dirs, files in os.walk(target):
+                dirs.sort()
+                for name in sorted(files):
+                    yield os.path.join(root, name)
+        else:
+            yield target
+
+def hash_files(paths, algorithms=ALGORITHMS, workers=HASH_WORKERS, chunk_size=CHUNK_SIZE, use_mmap=False, on_result=None):
+    """
+    Hashes files in parallel on a thread pool (hashlib releases the GIL on
+    large buffers). Results come back in input order; on_result(result) is
+    called from the calling thread in completion order.
+    """
+    _digests(algorithms)  # Fail fast on a bad algorithm name
+    paths = list(paths)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(hash_file, path, algorithms, chunk_size, use_mmap) for path in paths]
+        if on_result:
+            for future in as_completed(futures):
+                on_result(future.result())
+        return [future.result() for future in futures]
+
+def summarize(results, seconds):
+    """Batch totals: files, failures, bytes and aggregate throughput over wall-clock seconds."""
+    hashed = [r for r in results if "error" not in r]
+    total = sum(r["size"] for r in hashed)
+    return {"files": len(hashed), "errors": len(results) - len(hashed), "bytes": total,
+            "seconds": round(seconds, 4), "mb_s": round(total / 1e6 / seconds, 1) if seconds > 0 else None}
@@ -0,0 +1,229 @@
+# ghost_journal.py
+# THE CHRONICLE: The mission log with a timestamp index and an inverted word index beside it.
+import bisect
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+
+# --- CONFIGURATION ---
+MISSION_LOG = "mission_log.txt"
+INDEX_SUFFIX = ".idx"
+FINGERPRINT_BYTES = 4096   # Head and tail of the indexed region, hashed to notice rewrites
+
+_ENTRY = re.compile(r'^(\d{4}-\d{2}-\d{2}(?: \d{2}:\d{2}:\d{2}(?:\.\d+)?)?) \| (.*)$')  # Time is optional
+_WORD = re.compile(r'[a-z0-9]+')
+
+def words_of(text):
+    """Lowercase alphanumeric runs; 'full_autonomy' yields 'full' and 'autonomy'."""
+    return _WORD.findall(text.lower())
+
+def _bound(value, upper=False):
+    """A date or timestamp prefix as a comparable string. A date-only upper bound covers the whole day."""
+    if not value: return None
+    value = value.strip().replace("T", " ")
+    return value + "~" if upper else value  # '~' sorts after every digit
+
+class Journal:
+    """
+    The mission log plus an append-only sidecar index. Each sidecar line is
+    either one entry ([timestamp, offset, length, words]) or a checkpoint
+    ({"size", "fingerprint", "malformed"}) closing the batch before it, so
+    an append writes only the new entry's postings. In memory: per entry,
+    its timestamp, byte offset and length, a sorted timestamp list and an
+    inverted word -> entries map. If the log shrank or was rewritten, the
+    index is rebuilt from the raw file and the sidecar written afresh.
+    Lines that are not 'timestamp | text' are counted as malformed and skipped.
+    """
+    def __init__(self, log_path=MISSION_LOG, index_path=None):
+        self.log_path = log_path
+        self.index_path = index_path or log_path + INDEX_SUFFIX
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self.size = 0            # Bytes of the log already indexed (always ends on a newline)
+        self.fingerprint = None
+        self.entries = []        # [timestamp, offset, length] in file order
+        self.by_time = []        # [timestamp, entry number], sorted
+        self.words = {}          # word -> [entry number, ...] ascending
+        self.malformed = 0
+        self._pending = []       # Sidecar lines not yet written
+        self._committed = 0      # Sidecar bytes up to the last checkpoint
+        self._rewrite = True     # The sidecar no longer matches: write it whole
+
+    # --- INDEX FILE ---
+    def _load(self):
+        if not os.path.exists(self.index_path): return
+        pending, committed = [], 0
+        try:
+            with open(self.index_path, 'rb') as f:
+                for raw in f:
+                    if not raw.endswith(b"\n"): break  # A torn last write: everything after the checkpoint is dropped
+                    record = json.loads(raw)
+                    if isinstance(record, list):
+                        pending.append(record)
+                        continue
+                    for timestamp, offset, length, words in pending:
+                        self._add(timestamp, offset, length, words, in_order=False)
+                    pending = []
+                    self.size, self.fingerprint, self.malformed = record["size"], record["fingerprint"], record["malformed"]
+                    committed = f.tell()
+        except (OSError, ValueError, KeyError, TypeError):
+            self._reset()
+            return
+        self.by_time.sort()
+        self._committed = committed
+        self._rewrite = not committed
+
+    def _checkpoint(self):
+        return {"size": self.size, "fingerprint": self.fingerprint, "malformed": self.malformed}
+
+    def save(self):
+        """Writes the sidecar whole (after a rebuild, when every entry is pending); otherwise flush() appends."""
+        data = "".join(json.dumps(line, separators=(",", ":")) + "\n" for line in self._pending + [self._checkpoint()])
+        with open(self.index_path + ".tmp", 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(self.index_path + ".tmp", self.index_path)
+        self._committed = len(data.encode('utf-8'))
+        self._pending = []
+        self._rewrite = False
+
+    def flush(self):
+        """Appends the entries indexed since the last flush, then a checkpoint."""
+        if self._rewrite: return self.save()
+        data = "".join(json.dumps(line, separators=(",", ":")) + "\n" for line in self._pending + [self._checkpoint()])
+        with open(self.index_path, 'r+b' if os.path.exists(self.index_path) else 'w+b') as f:
+            f.seek(self._committed)
+            f.write(data.encode('utf-8'))
+            f.truncate()
+            self._committed = f.tell()
+        self._pending = []
+
+    def _fingerprint(self, f, size):
+        digest = hashlib.sha1()
+        f.seek(0)
+        digest.update(f.read(min(size, FINGERPRINT_BYTES)))
+        f.seek(max(0, size - FINGERPRINT_BYTES))
+        digest.update(f.read(min(size, FINGERPRINT_BYTES)))
+        return digest.hexdigest()
+
+    # --- INDEXING ---
+    def _add(self, timestamp, offset, length, words, in_order=True):
+        number = len(self.entries)
+        self.entries.append([timestamp, offset, length])
+        if not in_order or not self.by_time or timestamp >= self.by_time[-1][0]:
+            self.by_time.append([timestamp, number])
+        else:
+            bisect.insort(self.by_time, [timestamp, number])
+        for word in words:
+            self.words.setdefault(word, []).append(number)
+
+    def _index_line(self, raw, offset):
+        line = raw.decode('utf-8', errors='replace').rstrip("\r\n")
+        if not line.strip(): return
+        match = _ENTRY.match(line)
+        if not match:
+            self.malformed += 1
+            return
+        timestamp, text = match.groups()
+        words = sorted(set(words_of(text)))
+        self._add(timestamp, offset, len(raw), words)
+        self._pending.append([timestamp, offset, len(raw), words])
+
+    def refresh(self):
+        """
+        Brings the index up to date with the log and returns the number of
+        new entries. Only unindexed bytes are read (and only their postings
+        appended to the sidecar), unless the indexed region changed
+        underneath, in which case it rebuilds.
+        """
+        if not os.path.exists(self.log_path):
+            if self.size: self._reset()
+            return 0
+        before = len(self.entries)
+        with open(self.log_path, 'rb') as f:
+            total = os.fstat(f.fileno()).st_size
+            if total < self.size or (self.size and self._fingerprint(f, self.size) != self.fingerprint):
+                self._reset()
+                before = 0
+            if total == self.size: return 0
+            f.seek(self.size)
+            offset = self.size
+            for raw in f:
+                if not raw.endswith(b"\n"): break  # A line still being written: pick it up next time
+                self._index_line(raw, offset)
+                offset += len(raw)
+            if offset == self.size: return 0
+            self.size = offset
+            self.fingerprint = self._fingerprint(f, self.size)
+        self.flush()
+        return len(self.entries) - before
+
+    def rebuild(self):
+        """Discards the index and re-reads the whole log. Returns the entry count."""
+        self._reset()
+        self.refresh()
+        return len(self.entries)
+
+    def append(self, mission, timestamp=None):
+        """Appends a 'timestamp | text' line and indexes it. Returns the entry."""
+        timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        mission = " ".join(mission.splitlines())  # One entry, one line
+        self.refresh()
+        with open(self.log_path, 'ab+') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() and (f.seek(-1, os.SEEK_END), f.read(1))[1] != b"\n":
+                f.write(b"\n")  # Never glue an entry onto an unfinished line
+            f.write(f"{timestamp} | {mission}\n".encode('utf-8'))
+        self.refresh()
+        return {"timestamp": timestamp, "mission": mission}
+
+    # --- QUERIES ---
+    def _read(self, numbers):
+        results = []
+        with open(self.log_path, 'rb') as f:
+            for number in numbers:
+                timestamp, offset, length = self.entries[number]
+                f.seek(offset)
+                line = f.read(length).decode('utf-8', errors='replace').rstrip("\r\n")
+                results.append({"timestamp": timestamp, "mission": line.split(" | ", 1)[1], "offset": offset})
+        return results
+
+    def query(self, since=None, until=None, words=(), any_word=False, limit=None):
+        """
+        Entries between two dates/timestamps (inclusive; either may be None)
+        containing all of `words` (or any, with any_word). The window comes
+        from a bisect over the timestamp index and the words from posting
+        lists; only the matching lines are read from the log. Results are
+        oldest first.
+        """
+        self.refresh()
+        low, high = _bound(since), _bound(until, upper=True)
+        start = bisect.bisect_left(self.by_time, [low, -1]) if low else 0
+        end = bisect.bisect_right(self.by_time, [high, len(self.entries)]) if high else len(self.by_time)
+        window = [number for _, number in self.by_time[start:end]]
+        terms = [w for term in words for w in words_of(term)]
+        if terms:
+            postings = [set(self.words.get(term, ())) for term in terms]
+            hits = set.union(*postings) if any_word else set.intersection(*postings)
+            if low or high:
+                window = [number for number in window if number in hits]
+            else:
+                window = sorted(hits, key=lambda number: (self.entries[number][0], number))
+        if limit: window = window[-limit:]
+        return self._read(window)
+
+    def stats(self):
+        return {"entries": len(self.entries), "words": len(self.words), "malformed": self.malformed,
+                "indexed_bytes": self.size, "first": self.by_time[0][0] if self.by_time else None,
+                "last": self.by_time[-1][0] if self.by_time else None}
+
+_JOURNALS = {}
+
+def journal_for(path=MISSION_LOG):
+    """The process-wide Journal for a log, so repeated appends never reload the sidecar."""
+    journal = _JOURNALS.get(path)
+    if journal is None: journal = _JOURNALS[path] = Journal(path)
+    return journal
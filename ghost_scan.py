@@ -0,0 +1,146 @@
+# ghost_scan.py
+# THE SONAR: Asynchronous TCP connect scanning across hosts, port ranges and CIDR blocks.
+import asyncio
+import errno
+import ipaddress
+import socket
+import time
+
+# --- CONFIGURATION ---
+SCAN_CONCURRENCY = 1000  # Connects in flight (capped below the open-file limit)
+SCAN_TIMEOUT = 1.0       # Seconds before a silent port counts as filtered
+MAX_HOSTS = 65536        # Refuse CIDR blocks larger than a /16
+
+# Port states
+OPEN = "open"
+CLOSED = "closed"
+FILTERED = "filtered"
+
+_UNREACHABLE = {errno.EHOSTUNREACH, errno.ENETUNREACH, errno.EACCES, errno.EPERM}
+
+def parse_ports(spec):
+    """'1-1024,8080' -> sorted list of ports (1-65535)."""
+    ports = set()
+    for part in str(spec).split(","):
+        part = part.strip()
+        if not part: continue
+        low, _, high = part.partition("-")
+        low, high = int(low), int(high or low)
+        if not 1 <= low <= high <= 65535:
+            raise ValueError(f"invalid port range: {part}")
+        ports.update(range(low, high + 1))
+    return sorted(ports)
+
+def fd_budget(wanted):
+    """Caps concurrency below the soft open-file limit (each probe holds one socket)."""
+    if wanted < 1: raise ValueError(f"concurrency must be at least 1 (got {wanted})")
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (ImportError, ValueError, OSError):
+        return wanted
+    if soft == resource.RLIM_INFINITY: return wanted
+    return max(1, min(wanted, soft - 64))
+
+async def resolve_targets(targets):
+    """
+    Hosts, IPs and CIDR blocks -> [(target, ip or None, error or None)], in
+    order. A block expands to its usable hosts (a /32 or /128 to itself).
+    """
+    loop = asyncio.get_running_loop()
+    resolved = []
+    for target in targets:
+        if "/" in target:
+            network = ipaddress.ip_network(target, strict=False)
+            if network.num_addresses > MAX_HOSTS:
+                raise ValueError(f"{target}: block too large (max {MAX_HOSTS} addresses)")
+            hosts = list(network.hosts()) or [network.network_address]
+            resolved.extend((target, str(ip), None) for ip in hosts)
+            continue
+        try:
+            ipaddress.ip_address(target)
+            resolved.append((target, target, None))
+            continue
+        except ValueError:
+            pass
+        try:
+            infos = await loop.getaddrinfo(target, None, type=socket.SOCK_STREAM)
+            resolved.append((target, infos[0][4][0], None))
+        except socket.gaierror as e:
+            resolved.append((target, None, f"could not resolve host: {e}"))
+    return resolved
+
+async def probe(ip, port, timeout=SCAN_TIMEOUT):
+    """One non-blocking connect. Returns (state, latency in ms or None)."""
+    loop = asyncio.get_running_loop()
+    family = socket.AF_INET6 if ":" in ip else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setblocking(False)
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), timeout)
+        return OPEN, round((time.perf_counter() - started) * 1000, 3)
+    except asyncio.TimeoutError:
+        return FILTERED, None
+    except ConnectionRefusedError:
+        return CLOSED, round((time.perf_counter() - started) * 1000, 3)
+    except OSError as e:
+        if e.errno in _UNREACHABLE: return FILTERED, None
+        return CLOSED, round((time.perf_counter() - started) * 1000, 3)
+    finally:
+        sock.close()
+
+async def scan(targets, ports, concurrency=SCAN_CONCURRENCY, timeout=SCAN_TIMEOUT, on_result=None):
+    """
+    Probes every (host, port). A fixed pool of workers pulls from one shared
+    iterator and no probe is kept, so memory stays flat however many probes
+    there are. on_result(record) receives each probe as it completes,
+    {"target", "ip", "port", "state", "latency_ms"}; unresolvable targets get
+    a single "error" record. Returns the per-host summary (see summarize),
+    ordered by host.
+    """
+    hosts = await resolve_targets(targets)
+    ports = list(ports)
+    workers = min(fd_budget(concurrency), max(1, len(hosts) * len(ports)))
+    summary = {}
+
+    def report(record):
+        _tally(summary, record)
+        if on_result: on_result(record)
+
+    for target, ip, error in hosts:
+        if error: report({"target": target, "ip": None, "port": None, "state": None, "latency_ms": None, "error": error})
+    jobs = ((target, ip, port) for target, ip, error in hosts if not error for port in ports)
+
+    async def worker():
+        for target, ip, port in jobs:
+            state, latency = await probe(ip, port, timeout)
+            report({"target": target, "ip": ip, "port": port, "state": state, "latency_ms": latency})
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    order = {target: i for i, target in enumerate(targets)}
+    rank = {ip: (address.version, int(address)) for ip, address in
+            ((ip, ipaddress.ip_address(ip)) for _, ip, error in hosts if not error)}
+    results = sorted(summary.values(), key=lambda h: (order.get(h["target"], 0), rank.get(h["ip"], (0, 0))))
+    for host in results: host["open"].sort(key=lambda p: p["port"])
+    return results
+
+def run_scan(targets, ports, concurrency=SCAN_CONCURRENCY, timeout=SCAN_TIMEOUT, on_result=None):
+    """Blocking wrapper around scan(): streams probes to on_result, returns the per-host summary."""
+    return asyncio.run(scan(targets, ports, concurrency, timeout, on_result))
+
+def _tally(hosts, record):
+    key = (record["target"], record["ip"])
+    host = hosts.setdefault(key, {"target": record["target"], "ip": record["ip"], "open": [], CLOSED: 0, FILTERED: 0})
+    if record.get("error"):
+        host["error"] = record["error"]
+    elif record["state"] == OPEN:
+        host["open"].append({"port": record["port"], "latency_ms": record["latency_ms"]})
+    else:
+        host[record["state"]] += 1
+
+def summarize(records):
+    """Per-host summary of probe records: open ports with latency, counts of closed / filtered."""
+    hosts = {}
+    for record in records: _tally(hosts, record)
+    return list(hosts.values())
@@ -0,0 +1,220 @@
+# ghost_telemetry.py
+# THE SOMATIC SENSORS: Low-overhead /proc sampling into a fixed-size ring buffer.
+import csv
+import json
+import os
+import time
+
+# --- CONFIGURATION ---
+SAMPLE_INTERVAL = 1.0   # Seconds between samples (sub-second rates are fine)
+RING_CAPACITY = 3600    # Samples kept (an hour at 1 Hz)
+SECTOR_BYTES = 512      # /proc/diskstats counts 512-byte sectors regardless of the device
+_SKIP_DISKS = (b"loop", b"ram", b"zram", b"dm-", b"sr")
+
+class ProcFile:
+    """
+    A /proc file opened once and re-read with pread at offset 0 (no reopen,
+    no seek). The read buffer grows if the file ever fills it.
+    """
+    def __init__(self, path, size=8192):
+        self.path = path
+        self.size = size
+        self.fd = os.open(path, os.O_RDONLY)
+
+    def read(self):
+        while True:
+            data = os.pread(self.fd, self.size, 0)
+            if len(data) < self.size: return data
+            self.size *= 2
+
+    def close(self):
+        os.close(self.fd)
+
+def _open(path):
+    try:
+        return ProcFile(path)
+    except OSError:
+        return None
+
+class RingBuffer:
+    """Fixed-capacity sample history: O(1) append, the oldest sample is overwritten."""
+    def __init__(self, capacity=RING_CAPACITY):
+        if capacity < 1: raise ValueError(f"ring buffer capacity must be at least 1 (got {capacity})")
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._next = 0
+        self._count = 0
+
+    def append(self, item):
+        self._items[self._next] = item
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        """Oldest to newest."""
+        start = (self._next - self._count) % self.capacity
+        for i in range(self._count):
+            yield self._items[(start + i) % self.capacity]
+
+    def latest(self):
+        return self._items[(self._next - 1) % self.capacity] if self._count else None
+
+class Sampler:
+    """
+    Samples load, memory, per-core CPU, network and disk counters. Rates
+    (CPU %, bytes/s) come from deltas against the previous sample, so the
+    first sample carries only the absolute values.
+    """
+    def __init__(self, interval=SAMPLE_INTERVAL, capacity=RING_CAPACITY):
+        self.interval = interval
+        self.history = RingBuffer(capacity)
+        self.files = {name: _open(path) for name, path in (
+            ("loadavg", "/proc/loadavg"), ("meminfo", "/proc/meminfo"), ("stat", "/proc/stat"),
+            ("net", "/proc/net/dev"), ("disk", "/proc/diskstats"))}
+        self.cpu_seconds = 0.0  # Sampler's own CPU time, for the overhead report
+        self.taken = 0
+        self._previous = None
+
+    def close(self):
+        for f in self.files.values():
+            if f: f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- PARSERS (bytes in, numbers out) ---
+    def _read(self, name):
+        f = self.files.get(name)
+        return f.read() if f else None
+
+    def _cpu(self):
+        raw = self._read("stat")
+        if raw is None: return None
+        cores = {}
+        for line in raw.split(b"\n"):
+            if not line.startswith(b"cpu"): break
+            fields = line.split()
+            ticks = [int(x) for x in fields[1:]]
+            idle = ticks[3] + (ticks[4] if len(ticks) > 4 else 0)  # idle + iowait
+            cores[fields[0].decode()] = (sum(ticks), idle)
+        return cores
+
+    def _net(self):
+        raw = self._read("net")
+        if raw is None: return None
+        counters = {}
+        for line in raw.split(b"\n")[2:]:
+            name, sep, rest = line.partition(b":")
+            if not sep: continue
+            fields = rest.split()
+            counters[name.strip().decode()] = (int(fields[0]), int(fields[8]))
+        return counters
+
+    def _disk(self):
+        raw = self._read("disk")
+        if raw is None: return None
+        counters = {}
+        for line in raw.split(b"\n"):
+            fields = line.split()
+            if len(fields) < 10 or fields[2].startswith(_SKIP_DISKS): continue
+            counters[fields[2].decode()] = (int(fields[5]) * SECTOR_BYTES, int(fields[9]) * SECTOR_BYTES)
+        return counters
+
+    def _memory(self):
+        raw = self._read("meminfo")
+        if raw is None: return None
+        total = available = None
+        for line in raw.split(b"\n"):
+            if line.startswith(b"MemTotal:"): total = int(line.split()[1])
+            elif line.startswith(b"MemAvailable:"): available = int(line.split()[1])
+            if total is not None and available is not None: break
+        return round((total - available) / 1024, 2) if total is not None and available is not None else None
+
+    # --- SAMPLING ---
+    def sample(self):
+        """Takes one sample, stores it in the ring buffer and returns it."""
+        cpu_start = time.process_time()
+        now = time.time()
+        load = self._read("loadavg")
+        raw = {"cpu": self._cpu(), "net": self._net(), "disk": self._disk()}
+        sample = {
+            "t": round(now, 3),
+            "timestamp": time.strftime("%H:%M:%S", time.localtime(now)),
+            "load_1m": float(load.split()[0]) if load else None,
+            "mem_used_mb": self._memory(),
+        }
+        previous = self._previous
+        elapsed = now - previous[0] if previous else 0.0
+        if raw["cpu"] is not None:
+            sample["cpu"] = {}
+            for core, (total, idle) in raw["cpu"].items():
+                before = previous[1]["cpu"].get(core) if previous and previous[1]["cpu"] else None
+                busy = None
+                if before and total > before[0]:
+                    busy = round(100.0 * (1 - (idle - before[1]) / (total - before[0])), 1)
+                sample["cpu"][core] = busy
+        for key, labels in (("net", ("rx_bps", "tx_bps")), ("disk", ("read_bps", "write_bps"))):
+            if raw[key] is None: continue
+            sample[key] = {}
+            for device, counters in raw[key].items():
+                before = previous[1][key].get(device) if previous and previous[1][key] else None
+                sample[key][device] = {label: round((value - before[i]) / elapsed, 1) if before and elapsed > 0 else None
+                                       for i, (label, value) in enumerate(zip(labels, counters))}
+        self._previous = (now, raw)
+        self.history.append(sample)
+        self.taken += 1
+        self.cpu_seconds += time.process_time() - cpu_start
+        return sample
+
+    def run(self, count=0, on_sample=None):
+        """Samples every `interval` seconds (drift-free) until `count` samples (0 = forever)."""
+        taken = 0
+        deadline = time.monotonic()
+        while True:
+            sample = self.sample()
+            taken += 1
+            if on_sample: on_sample(sample)
+            if count and taken >= count: return
+            deadline += self.interval
+            delay = deadline - time.monotonic()
+            if delay > 0: time.sleep(delay)
+            else: deadline = time.monotonic()  # Fell behind: skip ahead rather than burst
+
+    def overhead(self):
+        """Average CPU milliseconds spent per sample."""
+        return round(self.cpu_seconds * 1000 / max(1, self.taken), 3)
+
+    # --- EXPORT ---
+    def export_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(list(self.history), f)
+
+    def export_csv(self, path):
+        """One row per sample; nested counters flatten to columns like cpu.cpu0 or net.eth0.rx_bps."""
+        rows = [flatten(sample) for sample in self.history]
+        columns = []
+        for row in rows:
+            columns.extend(c for c in row if c not in columns)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def export(self, path):
+        """Exports the ring buffer; the extension picks the format (.json or .csv)."""
+        if path.endswith(".json"): self.export_json(path)
+        else: self.export_csv(path)
+
+def flatten(sample, prefix=""):
+    flat = {}
+    for key, value in sample.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict): flat.update(flatten(value, name + "."))
+        else: flat[name] = value
+    return flat
@@ -0,0 +1,144 @@
+# ghost_weather.py
+# THE SENTINEL: Cached, concurrent atmospheric telemetry for many sectors at once.
+import json
+import os
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import shodan_net
+
+# --- CONFIGURATION ---
+WTTR_BASE = os.getenv("GHOST_WTTR_URL", "https://wttr.in")   # Point at a stand-in for testing
+WEATHER_TTL = float(os.getenv("GHOST_WEATHER_TTL", 600))       # Seconds a sector's reading stays fresh
+WEATHER_CACHE_FILE = os.getenv("GHOST_WEATHER_CACHE", "weather_cache.json")
+WEATHER_CONCURRENCY = 8
+USER_AGENT = "GhostProtocol/10.3"
+
+# Alert thresholds
+WIND_ALERT_MPH = 20
+VISIBILITY_ALERT_MILES = 2
+FROZEN_WORDS = ("snow", "squall", "ice", "sleet", "blizzard")
+
+def parse_report(data):
+    """wttr.in j1 JSON -> flat report dict (without alerts)."""
+    current = data['current_condition'][0]
+    # Location name from the nearest area (verification of the IP target)
+    try:
+        area = data['nearest_area'][0]
+        sector = f"{area['areaName'][0]['value']}, {area['region'][0]['value']}"
+    except (KeyError, IndexError, TypeError):
+        sector = "UNKNOWN SECTOR"
+    return {
+        "sector": sector,
+        "conditions": current['weatherDesc'][0]['value'],
+        "temp_f": current['temp_F'],
+        "wind_mph": current['windspeedMiles'],
+        "wind_dir": current['winddir16Point'],
+        "visibility_miles": current['visibility'],
+        "humidity": current['humidity'],
+    }
+
+def evaluate_alerts(report):
+    """The threshold checks for one report: wind, frozen precipitation, visibility."""
+    alerts = []
+    desc = report["conditions"].lower()
+    if int(report["wind_mph"]) > WIND_ALERT_MPH:
+        alerts.append("HIGH WIND VELOCITY")
+    if any(word in desc for word in FROZEN_WORDS):
+        alerts.append("FROZEN PRECIPITATION")
+    if int(report["visibility_miles"]) < VISIBILITY_ALERT_MILES:
+        alerts.append("LOW VISIBILITY (BLINDING)")
+    return alerts
+
+def _key(city):
+    return " ".join((city or "").lower().split())  # "" = IP auto-detect
+
+class WeatherStation:
+    """
+    Fetches wttr.in telemetry per sector through one keep-alive client. Parsed
+    reports are cached for `ttl` seconds (in memory and in a JSON file), so a
+    repeat check inside the TTL never touches the network.
+    """
+    def __init__(self, base=WTTR_BASE, ttl=WEATHER_TTL, cache_path=WEATHER_CACHE_FILE, client=None):
+        self.base = base.rstrip("/")
+        self.ttl = ttl
+        self.cache_path = cache_path
+        self.client = client or shodan_net.HttpClient(retries=1, user_agent=USER_AGENT)
+        self.cache = {}   # sector key -> [report, fetched]
+        self.stats = {"fetched": 0, "cache_hits": 0, "errors": 0}
+        self._load()
+
+    # --- CACHE ---
+    def _load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path): return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                self.cache = json.load(f)
+        except (OSError, ValueError):
+            self.cache = {}
+
+    def save(self):
+        if not self.cache_path: return
+        now = time.time()
+        self.cache = {k: v for k, v in self.cache.items() if now - v[1] <= self.ttl}
+        with open(self.cache_path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f)
+        os.replace(self.cache_path + ".tmp", self.cache_path)
+
+    # --- SENSORS ---
+    def url(self, city=None):
+        path = "/" + urllib.parse.quote(city) if city else "/"
+        return f"{self.base}{path}?format=j1"
+
+    def report(self, city=None, refresh=False):
+        """
+        One sector's report with "alerts", "cached" and "age_s". Raises
+        NetworkDown / ValueError / KeyError when the sensors fail.
+        """
+        key = _key(city)
+        cached = self.cache.get(key)
+        if cached and not refresh and time.time() - cached[1] <= self.ttl:
+            self.stats["cache_hits"] += 1
+            report = dict(cached[0])
+            report.update(query=city, cached=True, age_s=round(time.time() - cached[1], 1))
+            return report
+        status, _, body = self.client.get(self.url(city))
+        if status != 200:
+            raise shodan_net.NetworkDown(f"HTTP {status}")
+        report = parse_report(json.loads(body.decode('utf-8')))
+        report["alerts"] = evaluate_alerts(report)
+        self.stats["fetched"] += 1
+        self.cache[key] = [report, time.time()]
+        return dict(report, query=city, cached=False, age_s=0.0)
+
+    def sweep(self, cities, concurrency=WEATHER_CONCURRENCY, refresh=False):
+        """
+        Reports for many sectors, fetched concurrently (cache hits answer at
+        once). Failures become {"sector", "error"}. Results are in input order.
+        """
+        def one(city):
+            try:
+                return self.report(city, refresh)
+            except (OSError, ValueError, KeyError, IndexError, shodan_net.NetworkDown) as e:
+                self.stats["errors"] += 1
+                return {"sector": city or "AUTO-DETECT", "query": city, "error": str(e) or type(e).__name__}
+        cities = list(cities) or [None]
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(cities)))) as pool:
+            return list(pool.map(one, cities))
+
+    def close(self):
+        self.save()
+        self.client.close()
+
+def alert_board(reports):
+    """Every alert across a sweep: [{"sector", "alert"}], in sweep order."""
+    return [{"sector": r["sector"], "alert": alert} for r in reports for alert in r.get("alerts", ())]
+
+_STATION = None
+
+def default_station():
+    """The process-wide station, so an interactive session keeps its cache warm."""
+    global _STATION
+    if _STATION is None: _STATION = WeatherStation()
+    return _STATION
@@ -0,0 +1,178 @@
+# ghost_web.py
+# THE LOOKING GLASS: Streaming <title> extraction that hangs up as soon as it has the answer.
+import html
+import http.client
+import re
+import socket
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import shodan_net
+
+# --- CONFIGURATION ---
+TITLE_BUDGET = 256 * 1024   # Bytes read before giving up on finding </title>
+CHUNK_SIZE = 16 * 1024
+MAX_REDIRECTS = 5
+PER_HOST_LIMIT = 4          # Concurrent requests per host in bulk mode
+BULK_CONCURRENCY = 16
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0.4472.124"
+
+_OPEN = re.compile(rb'<title\b[^>]*>', re.IGNORECASE)
+_CLOSE = re.compile(rb'</title\s*>', re.IGNORECASE)
+_META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+class TitleScanner:
+    """
+    Incremental <title> finder. feed() each chunk as it arrives; it returns
+    True once the closing tag has been seen. Only the bytes past the last
+    search point are scanned again; a miss resumes from the last '<' it saw,
+    so a tag split across chunks (attributes and all) is still found.
+    """
+    def __init__(self):
+        self.buffer = bytearray()
+        self.start = None   # Offset just past <title ...>
+        self.end = None     # Offset of </title>
+        self._resume = 0    # Where the next search starts
+
+    def _miss(self, pos):
+        last = self.buffer.rfind(b"<", pos)
+        self._resume = last if last >= 0 else len(self.buffer)
+        return False
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        pos = self._resume
+        if self.start is None:
+            match = _OPEN.search(self.buffer, pos)
+            if not match: return self._miss(pos)
+            self.start = pos = match.end()
+        match = _CLOSE.search(self.buffer, pos)
+        if not match: return self._miss(pos)
+        self.end = match.start()
+        return True
+
+    def title(self, charset=None):
+        """The decoded, unescaped, whitespace-collapsed title (None if no closing tag was seen)."""
+        if self.end is None: return None
+        if not charset:
+            meta = _META_CHARSET.search(self.buffer, 0, self.start)
+            charset = meta.group(1).decode('ascii') if meta else "utf-8"
+        raw = bytes(self.buffer[self.start:self.end])
+        try:
+            text = raw.decode(charset, errors='ignore')
+        except LookupError:
+            text = raw.decode('utf-8', errors='ignore')
+        return " ".join(html.unescape(text).split())
+
+def _charset(content_type):
+    match = re.search(r'charset=["\']?([\w-]+)', content_type or "", re.IGNORECASE)
+    return match.group(1) if match else None
+
+class TitleClient(shodan_net.HttpClient):
+    """
+    Keep-alive client specialised for titles. The body is read in chunks
+    and the connection is dropped the moment </title> appears or the byte
+    budget runs out; only fully-read responses go back into the pool.
+    """
+    def __init__(self, budget=TITLE_BUDGET, per_host=PER_HOST_LIMIT, user_agent=USER_AGENT, **kwargs):
+        super().__init__(user_agent=user_agent, **kwargs)
+        self.budget = budget
+        self.per_host = per_host
+        self.stats.update({"hangups": 0, "bytes": 0})
+        self._gates = {}
+
+    def _gate(self, host):
+        with self._lock:
+            return self._gates.setdefault(host, threading.BoundedSemaphore(self.per_host))
+
+    def _fetch(self, url):
+        """One GET, streamed into a TitleScanner. Returns (status, location, scanner, charset, bytes read)."""
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme or "http"
+        origin = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80))
+        path = parts.path or "/"
+        if parts.query: path += "?" + parts.query
+        headers = {"User-Agent": self.user_agent, "Connection": "keep-alive", "Accept": "text/html"}
+        with self._gate(parts.hostname):
+            for attempt in range(2):
+                self.stats["requests"] += 1
+                conn, reused = self._acquire(origin)
+                try:
+                    conn.request("GET", path, headers=headers)
+                    response = conn.getresponse()
+                    break
+                except (OSError, http.client.HTTPException) as e:
+                    conn.close()
+                    # A pooled socket the server already closed: redial once
+                    if not reused or isinstance(e, socket.timeout) or attempt: raise
+            scanner, read = TitleScanner(), 0
+            try:
+                if 300 <= response.status < 400:
+                    response.read()
+                else:
+                    while read < self.budget:
+                        chunk = response.read1(min(CHUNK_SIZE, self.budget - read))
+                        if not chunk: break
+                        read += len(chunk)
+                        if scanner.feed(chunk): break
+                    if response.length is not None and response.length <= CHUNK_SIZE:
+                        response.read()  # A short tail is cheaper to drain than a new connection
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                raise
+            if response.isclosed() and not response.will_close:
+                self._release(origin, conn)
+            else:
+                # Unread body left on the wire: hanging up is cheaper than draining it
+                if not response.isclosed(): self.stats["hangups"] += 1
+                conn.close()
+        self.stats["bytes"] += read
+        return response.status, response.getheader("Location"), scanner, _charset(response.getheader("Content-Type")), read
+
+    def title(self, url):
+        """
+        Returns {"url", "final_url", "status", "title", "bytes"} (title None
+        if absent within the budget). Follows redirects; raises on
+        connection failure.
+        """
+        if not url.startswith("http"): url = "https://" + url
+        current = url
+        for _ in range(MAX_REDIRECTS + 1):
+            status, location, scanner, charset, read = self._fetch(current)
+            if 300 <= status < 400 and location:
+                current = urllib.parse.urljoin(current, location)
+                continue
+            return {"url": url, "final_url": current, "status": status, "title": scanner.title(charset), "bytes": read}
+        raise shodan_net.NetworkDown(f"too many redirects ({MAX_REDIRECTS})")
+
+def page_title(url, client=None):
+    """Single-URL convenience: the title string, or None."""
+    client = client or TitleClient()
+    try:
+        return client.title(url)["title"]
+    finally:
+        client.close()
+
+def bulk_titles(urls, concurrency=BULK_CONCURRENCY, client=None, on_result=None):
+    """
+    Fetches titles for many URLs on a thread pool sharing one keep-alive
+    pool. Failures become {"url", "error"} records. Results come back in
+    input order; on_result(result) is called in completion order.
+    """
+    client = client or TitleClient()
+
+    def one(url):
+        try:
+            return client.title(url)
+        except (OSError, http.client.HTTPException, shodan_net.NetworkDown, ValueError) as e:
+            return {"url": url, "error": str(e) or type(e).__name__}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            futures = [pool.submit(one, url) for url in urls]
+            if on_result:
+                for future in as_completed(futures):
+                    on_result(future.result())
+            return [future.result() for future in futures]
+    finally:
+        client.close()
@@ -0,0 +1,146 @@
+# ghost_whois.py
+# THE REGISTRY: Bulk WHOIS with cached IANA referrals and per-server throttling.
+import asyncio
+import json
+import os
+import re
+import time
+
+# --- CONFIGURATION ---
+WHOIS_PORT = 43
+IANA_SERVER = "whois.iana.org"
+WHOIS_TIMEOUT = 10.0                              # Seconds per connection (connect + full reply)
+REFERRAL_TTL = 30 * 24 * 3600                     # A TLD's registry server practically never moves
+RESPONSE_TTL = float(os.getenv("GHOST_WHOIS_TTL", 24 * 3600))
+PER_SERVER_LIMIT = 2                              # Concurrent connections per WHOIS server
+BULK_CONCURRENCY = 16
+MAX_CACHED_RESPONSES = 1000
+WHOIS_CACHE_FILE = os.getenv("GHOST_WHOIS_CACHE", "whois_cache.json")
+
+# A domain query answers "refer:", a bare TLD query answers "whois:"
+_REFER = re.compile(r'^\s*(?:refer|whois):\s*(\S+)', re.IGNORECASE | re.MULTILINE)
+
+def tld_of(domain):
+    return domain.strip().rstrip(".").rsplit(".", 1)[-1].lower()
+
+class WhoisClient:
+    """
+    Resolves domains concurrently: IANA is asked once per TLD (referrals are
+    cached, and concurrent lookups for one TLD share that single query),
+    registry replies are cached for RESPONSE_TTL, and each server gets at
+    most PER_SERVER_LIMIT connections at a time. The cache persists as JSON.
+    """
+    def __init__(self, port=WHOIS_PORT, iana=IANA_SERVER, timeout=WHOIS_TIMEOUT, per_server=PER_SERVER_LIMIT,
+                 response_ttl=RESPONSE_TTL, cache_path=WHOIS_CACHE_FILE):
+        self.port = port
+        self.iana = iana
+        self.timeout = timeout
+        self.per_server = per_server
+        self.response_ttl = response_ttl
+        self.cache_path = cache_path
+        self.referrals = {}   # tld -> [server or None, fetched]
+        self.responses = {}   # domain -> [server, text, fetched]
+        self.stats = {"queries": 0, "referral_hits": 0, "response_hits": 0, "errors": 0}
+        self._gates = {}
+        self._pending = {}
+        self._load()
+
+    # --- CACHE ---
+    def _load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path): return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.referrals = data.get("referrals", {})
+            self.responses = data.get("responses", {})
+        except (OSError, ValueError):
+            pass
+
+    def save(self):
+        if not self.cache_path: return
+        now = time.time()
+        fresh = sorted(((d, e) for d, e in self.responses.items() if now - e[2] <= self.response_ttl),
+                       key=lambda item: item[1][2])[-MAX_CACHED_RESPONSES:]
+        self.responses = dict(fresh)
+        with open(self.cache_path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump({"referrals": self.referrals, "responses": self.responses}, f)
+        os.replace(self.cache_path + ".tmp", self.cache_path)
+
+    # --- WIRE ---
+    async def query(self, server, text):
+        """One WHOIS exchange. Reply chunks are collected in a list and joined once."""
+        gate = self._gates.setdefault(server, asyncio.Semaphore(self.per_server))
+        async with gate:
+            self.stats["queries"] += 1
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(server, self.port), self.timeout)
+            try:
+                writer.write(f"{text}\r\n".encode())
+                await writer.drain()
+                chunks = []
+                deadline = time.monotonic() + self.timeout
+                while True:
+                    data = await asyncio.wait_for(reader.read(65536), max(0.0, deadline - time.monotonic()))
+                    if not data: break
+                    chunks.append(data)
+            finally:
+                writer.close()
+        return b"".join(chunks).decode('utf-8', errors='ignore')
+
+    async def referral(self, tld):
+        """The registry server for a TLD (None if IANA names none), from cache or one shared IANA query."""
+        cached = self.referrals.get(tld)
+        if cached and time.time() - cached[1] <= REFERRAL_TTL:
+            self.stats["referral_hits"] += 1
+            return cached[0]
+        pending = self._pending.get(tld)
+        if pending is None:
+            pending = self._pending[tld] = asyncio.ensure_future(self.query(self.iana, tld))
+        try:
+            reply = await pending
+        finally:
+            self._pending.pop(tld, None)
+        match = _REFER.search(reply)
+        server = match.group(1).strip() if match else None
+        self.referrals[tld] = [server, time.time()]
+        return server
+
+    async def lookup(self, domain):
+        """Returns {"domain", "server", "response", "cached"} or {"domain", "server", "error"}."""
+        domain = domain.strip().lower()
+        cached = self.responses.get(domain)
+        if cached and time.time() - cached[2] <= self.response_ttl:
+            self.stats["response_hits"] += 1
+            return {"domain": domain, "server": cached[0], "response": cached[1], "cached": True}
+        server = self.iana
+        try:
+            server = await self.referral(tld_of(domain)) or self.iana
+            text = await self.query(server, domain)
+        except (OSError, asyncio.TimeoutError) as e:
+            self.stats["errors"] += 1
+            return {"domain": domain, "server": server, "error": str(e) or type(e).__name__}
+        self.responses[domain] = [server, text, time.time()]
+        return {"domain": domain, "server": server, "response": text, "cached": False}
+
+    async def lookup_many(self, domains, concurrency=BULK_CONCURRENCY, on_result=None):
+        """Resolves a list of domains concurrently. Results come back in input order."""
+        # Gates and shared referral queries belong to the running event loop
+        self._gates, self._pending = {}, {}
+        limit = asyncio.Semaphore(concurrency)
+
+        async def one(domain):
+            async with limit:
+                result = await self.lookup(domain)
+            if on_result: on_result(result)
+            return result
+        return await asyncio.gather(*(one(d) for d in domains))
+
+def bulk_whois(domains, concurrency=BULK_CONCURRENCY, client=None, on_result=None):
+    """Blocking wrapper: resolves the domains and persists the cache."""
+    client = client or WhoisClient()
+    try:
+        return asyncio.run(client.lookup_many(domains, concurrency, on_result))
+    finally:
+        client.save()
+
+def whois(domain, client=None):
+    return bulk_whois([domain], client=client)[0]
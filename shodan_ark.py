@@ -0,0 +1,549 @@
+# shodan_ark.py
+# THE ARK INDEX: Keyed and approximate recall over the local Ark.
+import json
+import math
+import mmap
+import os
+import re
+import shutil
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter
+import shodan_core as core
+
+FUZZY_THRESHOLD = 0.45  # Minimum trigram Jaccard similarity for a near-miss
+FUZZY_LIMIT = 5
+
+# "Threepenny Opera, The" / "The Threepenny Opera" -> "threepenny opera"
+_TRAILING_ARTICLE = re.compile(r",\s*(the|a|an)\s*$", re.IGNORECASE)
+_LEADING_ARTICLE = re.compile(r"^\s*(the|a|an)\s+", re.IGNORECASE)
+
+READ_CHUNK = 1 << 16
+_CANON_ARRAY = re.compile(r'"canon"\s*:\s*\[')
+
+def iter_ark(path, chunk_size=READ_CHUNK):
+    """
+    Streams artifacts out of an Ark file without loading it whole: a binary
+    vault (.ark), JSON Lines (.jsonl, meta lines skipped) or the classic
+    {"canon": [...]} document, decoded one element at a time.
+    """
+    if path.endswith(".ark"):
+        with ArkVault(path) as vault:
+            for artifact in vault:
+                yield artifact.to_dict()
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                line = line.strip()
+                if not line: continue
+                record = json.loads(line)
+                if "meta" in record and len(record) == 1: continue
+                yield record
+            return
+        yield from _iter_canon_array(f, chunk_size)
+
+def write_json(entries, path, meta=None):
+    """
+    Classic pretty-printed layout ({"meta": ..., "canon": [...]}, indent=2).
+    Entries are spooled to disk first because meta.total_artifacts leads the file.
+    """
+    total = 0
+    spool_path = path + ".spool"
+    with open(spool_path, 'w', encoding='utf-8') as spool:
+        for entry in entries:
+            if total: spool.write(",\n")
+            spool.write("\n".join("    " + line for line in json.dumps(entry, indent=2).split("\n")))
+            total += 1
+
+    header = json.dumps({"meta": dict(meta or {}, total_artifacts=total), "canon": []}, indent=2)
+    head, tail = header[:-len("[]\n}")], "\n  ]\n}"
+    with open(path + ".tmp", 'w', encoding='utf-8') as f, open(spool_path, 'r', encoding='utf-8') as spool:
+        if total:
+            f.write(head + "[\n")
+            while True:
+                block = spool.read(1 << 16)
+                if not block: break
+                f.write(block)
+            f.write(tail)
+        else:
+            f.write(header)
+    os.remove(spool_path)
+    os.replace(path + ".tmp", path)
+    return total
+
+def write_jsonl(entries, path, meta=None):
+    """
+    JSON Lines: one artifact per line, flushed as soon as it is scored, then
+    a closing {"meta": ...} line. Readers see the first records immediately.
+    """
+    total = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            total += 1
+        f.write(json.dumps({"meta": dict(meta or {}, total_artifacts=total)}) + "\n")
+    return total
+
+def _iter_canon_array(f, chunk_size):
+    decoder = json.JSONDecoder()
+    buf, eof = "", False
+
+    # 1. Locate the "canon" array (keeping a tail in case the marker straddles chunks)
+    while True:
+        match = _CANON_ARRAY.search(buf)
+        if match:
+            pos = match.end()
+            break
+        if eof: return
+        buf = buf[-64:]
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buf += chunk
+
+    # 2. Decode one element at a time, refilling when an element is cut off
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,": pos += 1
+        if pos < len(buf) and buf[pos] == "]": return
+        if pos < len(buf):
+            try:
+                record, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof: raise
+            else:
+                yield record
+                pos = end
+                continue
+        if eof: return
+        buf = buf[pos:]
+        pos = 0
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buf += chunk
+
+def title_key(title):
+    """Normalized title key: articles dropped (leading or ', The' style), alphanumerics only."""
+    if not title: return ""
+    title = _TRAILING_ARTICLE.sub("", title)
+    title = _LEADING_ARTICLE.sub("", title)
+    return core.normalize_key(title)
+
+def year_key(year):
+    """First four characters of a year ('1995', '2001–2003' -> '2001')."""
+    return str(year or "").strip()[:4]
+
+def trigrams(key):
+    padded = f"$${key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class ArkIndex:
+    """
+    Built once over the Ark's artifact list: an exact map on normalized
+    title (+ year), and a trigram inverted index for ranked near-misses.
+    """
+    def __init__(self, artifacts=()):
+        self.artifacts = []
+        self._by_title_year = {}
+        self._by_title = {}
+        self._grams = []
+        self._sizes = []
+        self._postings = {}
+        for artifact in artifacts:
+            self.add(artifact)
+
+    def __len__(self):
+        return len(self.artifacts)
+
+    def warm(self):
+        """Every index is built eagerly here; nothing to prepare."""
+
+    def add(self, artifact):
+        i = len(self.artifacts)
+        self.artifacts.append(artifact)
+        key = title_key(artifact.get('title'))
+        self._by_title.setdefault(key, []).append(i)
+        self._by_title_year.setdefault((key, year_key(artifact.get('year'))), []).append(i)
+        grams = trigrams(key)
+        self._grams.append(grams)
+        self._sizes.append(len(grams))
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(i)
+
+    def find(self, title, year=None):
+        """
+        Exact lookup. With a year, only that edition counts (a remake is not the
+        original); without one, any artifact carrying the title. Returns the artifact or None.
+        """
+        key = title_key(title)
+        hits = self._by_title_year.get((key, year_key(year))) if year else self._by_title.get(key)
+        return self.artifacts[hits[0]] if hits else None
+
+    def near(self, title, year=None, threshold=FUZZY_THRESHOLD, limit=FUZZY_LIMIT):
+        """
+        Ranked near-misses as (similarity, artifact), best first. Same-title
+        artifacts from another year rank at 1.0; otherwise trigram Jaccard.
+        """
+        key = title_key(title)
+        query = trigrams(key)
+        if not key: return []
+        # Prefix filter: a candidate reaching the threshold must share one of the
+        # rarest len(query) - need + 1 grams, so only those postings are scanned.
+        need = max(1, math.ceil(threshold * len(query)))
+        grams = sorted(query, key=lambda g: len(self._postings.get(g, ())))
+        candidates = set()
+        for gram in grams[:len(query) - need + 1]:
+            candidates.update(self._postings.get(gram, ()))
+
+        # Length filter: Jaccard >= t needs t*|q| <= |c| <= |q|/t
+        size = len(query)
+        floor, ceiling = threshold * size, size / threshold
+        sizes, all_grams = self._sizes, self._grams
+        ranked = []
+        wanted_year = year_key(year)
+        for i in candidates:
+            size_i = sizes[i]
+            if size_i > ceiling or size_i < floor: continue
+            overlap = len(query & all_grams[i])
+            score = overlap / (size + size_i - overlap)
+            if score >= threshold:
+                ranked.append((round(score, 3), i))
+        ranked.sort(key=lambda pair: (-pair[0], pair[1]))
+        results = []
+        for score, i in ranked:
+            artifact = self.artifacts[i]
+            # The exact edition is a hit, not a near-miss
+            if score == 1.0 and year and year_key(artifact.get('year')) == wanted_year: continue
+            results.append((score, artifact))
+            if len(results) >= limit: break
+        return results
+
+# --- THE VAULT: compact, memory-mapped Ark (canon.ark) ---
+# Layout (little-endian):
+#   header   magic, version, field count, record count, index/string offsets, meta ref
+#            (version 2+: then the sizes/grams/postings offsets and the gram count)
+#   records  fixed width: shodan_weight (f8) + one (offset, length) u4 pair per field
+#   index    (key offset, key length, record) u4 triples, sorted by "title_key\x1fyear"
+#   sizes    u4 per record: how many distinct trigrams its title key has
+#   grams    (gram offset, gram length, first posting, posting count) u4 quads, sorted by gram
+#   postings u4 record numbers, ascending within each gram
+#   strings  UTF-8 string table, deduplicated; offsets are relative to its start
+# Version 1 vaults (no trigram sections) still open; near() then indexes them in memory.
+ARK_MAGIC = b"SHODARK\x01"
+ARK_VERSION = 2
+ARTIFACT_KEYS = ("id", "title", "director", "year", "format", "type", "shodan_weight", "status", "tags", "notes")
+VAULT_FIELDS = ("id", "title", "director", "year", "format", "type", "status", "tags", "notes", "extra")
+
+_HEADER = struct.Struct("<8sIIQQQII")
+_RECORD = struct.Struct("<d" + "II" * len(VAULT_FIELDS))
+_FUZZY = struct.Struct("<QQQI")
+_INDEX = struct.Struct("<III")
+_GRAM = struct.Struct("<IIII")
+_BISECT_RATIO = 64  # near(): a posting list this many times longer than the candidate set is bisected, not read
+_ABSENT = 0xFFFFFFFF  # Length marker: key not present
+_NULL = 0xFFFFFFFE    # Length marker: key present, value None
+_TAG_SEP = "\x1f"
+_MISSING = object()
+
+def _split_tags(joined):
+    return joined.split(_TAG_SEP) if joined else []
+
+def _encode(artifact, ref):
+    """Artifact dict -> (weight, refs). Anything the columns can't hold verbatim goes to 'extra' as JSON."""
+    extra = {k: v for k, v in artifact.items() if k not in ARTIFACT_KEYS}
+    weight = artifact.get("shodan_weight")
+    if type(weight) is not float or weight != weight:
+        if "shodan_weight" in artifact: extra["shodan_weight"] = weight
+        weight = math.nan
+    refs = []
+    for field in VAULT_FIELDS[:-1]:
+        value = artifact.get(field, _MISSING)
+        if field == "tags" and isinstance(value, list) and all(isinstance(t, str) for t in value) \
+                and _split_tags(_TAG_SEP.join(value)) == value:
+            value = _TAG_SEP.join(value)
+        elif value is not _MISSING and value is not None and (field == "tags" or not isinstance(value, str)):
+            extra[field] = value
+            value = _MISSING
+        refs += (0, _ABSENT) if value is _MISSING else (0, _NULL) if value is None else ref(value)
+    refs += ref(json.dumps(extra)) if extra else (0, _ABSENT)
+    return weight, refs
+
+def _write_u32s(f, values):
+    for start in range(0, len(values), 4096):
+        part = values[start:start + 4096]
+        f.write(struct.pack(f"<{len(part)}I", *part))
+
+def _u32_view(buf, start, count):
+    """A u4 section as an indexable sequence: zero-copy on little-endian hosts, swapped into an array elsewhere."""
+    view = memoryview(buf)[start:start + 4 * count]
+    if sys.byteorder == "little": return view.cast("I")
+    values = array("I", view)
+    view.release()
+    values.byteswap()
+    return values
+
+def write_vault(artifacts, path, meta=None):
+    """
+    Writes artifacts into a binary vault, streaming the records; the string
+    table is spooled beside it and appended at the end. The trigram postings
+    near() needs are written too, so readers never build them. Returns the count.
+    """
+    strings, keys, sizes, postings, count = {}, [], [], {}, 0
+    tmp_path, spool_path = path + ".tmp", path + ".strings"
+    with open(tmp_path, 'w+b') as f, open(spool_path, 'w+b') as table:
+        def ref(value):
+            hit = strings.get(value)
+            if hit is None:
+                data = value.encode('utf-8')
+                hit = strings[value] = (table.tell(), len(data))
+                table.write(data)
+            return hit
+
+        f.write(b"\0" * (_HEADER.size + _FUZZY.size))
+        for artifact in artifacts:
+            weight, refs = _encode(artifact, ref)
+            f.write(_RECORD.pack(weight, *refs))
+            key = title_key(artifact.get('title'))
+            keys.append((f"{key}\x1f{year_key(artifact.get('year'))}", count))
+            grams = trigrams(key)
+            sizes.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(count)
+            count += 1
+
+        # Code point order == UTF-8 byte order, so the sorted keys bisect as bytes
+        keys.sort()
+        index_at = f.tell()
+        for key, record in keys:
+            f.write(_INDEX.pack(*ref(key), record))
+        del keys
+        sizes_at = f.tell()
+        _write_u32s(f, sizes)
+        grams_at = f.tell()
+        ordered, first = sorted(postings), 0
+        for gram in ordered:
+            f.write(_GRAM.pack(*ref(gram), first, len(postings[gram])))
+            first += len(postings[gram])
+        postings_at = f.tell()
+        for gram in ordered:
+            _write_u32s(f, postings[gram])
+        meta_ref = ref(json.dumps(dict(meta or {}, total_artifacts=count)))
+        strings_at = f.tell()
+        table.seek(0)
+        shutil.copyfileobj(table, f)
+        f.seek(0)
+        f.write(_HEADER.pack(ARK_MAGIC, ARK_VERSION, len(VAULT_FIELDS), count, index_at, strings_at, *meta_ref))
+        f.write(_FUZZY.pack(sizes_at, grams_at, postings_at, len(ordered)))
+    os.remove(spool_path)
+    os.replace(tmp_path, path)
+    return count
+
+class Artifact:
+    """
+    One Ark record, decoded from the vault only when it is accessed. Reads
+    like the dict it was written from (get, [], in, to_dict); a key the
+    record never had is an unset slot.
+    """
+    __slots__ = ARTIFACT_KEYS + ("_extra",)
+
+    def __init__(self):
+        self._extra = None
+
+    def get(self, key, default=None):
+        if key in ARTIFACT_KEYS: return getattr(self, key, default)
+        return self._extra.get(key, default) if self._extra else default
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING: raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def keys(self):
+        return [k for k in ARTIFACT_KEYS if hasattr(self, k)] + list(self._extra or ())
+
+    def to_dict(self):
+        return {k: self[k] for k in self.keys()}
+
+    def __repr__(self):
+        return f"Artifact({self.to_dict()!r})"
+
+class ArkVault:
+    """
+    Read-only, memory-mapped view of a binary vault. Opening it reads only
+    the header; records become Artifacts on access, exact lookups bisect
+    the on-disk key index and near() reads the on-disk trigram postings.
+    Same find/near interface as ArkIndex.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, fields, count, index_at, strings_at, meta_at, meta_len = _HEADER.unpack_from(self._map, 0)
+        except (ValueError, struct.error):
+            self.close()
+            raise ValueError(f"{path}: not an Ark vault")
+        if magic != ARK_MAGIC or not 1 <= version <= ARK_VERSION or fields != len(VAULT_FIELDS):
+            self.close()
+            raise ValueError(f"{path}: not a version {ARK_VERSION} Ark vault")
+        self._count, self._index_at, self._strings_at = count, index_at, strings_at
+        self._records_at = _HEADER.size
+        self._grams_at = None
+        if version >= 2:
+            self._sizes_at, self._grams_at, self._postings_at, self._gram_count = _FUZZY.unpack_from(self._map, _HEADER.size)
+            self._records_at += _FUZZY.size
+            self._sizes = _u32_view(self._map, self._sizes_at, count)
+            self._postings = _u32_view(self._map, self._postings_at, (strings_at - self._postings_at) // 4)
+        self.meta = json.loads(self._string(meta_at, meta_len))
+        self._fuzzy = None
+
+    def close(self):
+        for view in (getattr(self, "_sizes", None), getattr(self, "_postings", None)):
+            if isinstance(view, memoryview): view.release()  # The map cannot close while views are exported
+        if getattr(self, "_map", None) is not None: self._map.close()
+        self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _string(self, offset, length):
+        start = self._strings_at + offset
+        return self._map[start:start + length].decode('utf-8')
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if i < 0: i += self._count
+        if not 0 <= i < self._count: raise IndexError("ark record out of range")
+        values = _RECORD.unpack_from(self._map, self._records_at + i * _RECORD.size)
+        artifact = Artifact()
+        if values[0] == values[0]: artifact.shodan_weight = values[0]
+        for n, field in enumerate(VAULT_FIELDS):
+            offset, length = values[1 + 2 * n], values[2 + 2 * n]
+            if length == _ABSENT: continue
+            value = None if length == _NULL else self._string(offset, length)
+            if field == "extra":
+                extra = json.loads(value)
+                for key in [k for k in extra if k in ARTIFACT_KEYS]:
+                    setattr(artifact, key, extra.pop(key))
+                artifact._extra = extra or None
+            else:
+                setattr(artifact, field, _split_tags(value) if field == "tags" and value is not None else value)
+        return artifact
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+    def _key(self, i):
+        offset, length, record = _INDEX.unpack_from(self._map, self._index_at + i * _INDEX.size)
+        start = self._strings_at + offset
+        return self._map[start:start + length], record
+
+    def _lower_bound(self, probe):
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid)[0] < probe: lo = mid + 1
+            else: hi = mid
+        return lo
+
+    def find(self, title, year=None):
+        """Exact lookup, as ArkIndex.find: O(log n) probes of the mapped index."""
+        prefix = f"{title_key(title)}\x1f".encode('utf-8')
+        probe = prefix + year_key(year).encode('utf-8') if year else prefix
+        i = self._lower_bound(probe)
+        # Without a year the first artifact (in Ark order) carrying the title wins
+        best = None
+        while i < self._count:
+            key, record = self._key(i)
+            if not (key == probe if year else key.startswith(prefix)): break
+            if year: return self[record]
+            best = record if best is None else min(best, record)
+            i += 1
+        return self[best] if best is not None else None
+
+    def warm(self):
+        """Nothing to build: the trigram postings are on disk. A version 1 vault is indexed in memory here."""
+        if self._grams_at is None and self._fuzzy is None:
+            self._fuzzy = ArkIndex({"title": a.get('title'), "year": a.get('year'), "n": i} for i, a in enumerate(self))
+
+    def _posting(self, gram):
+        """(first posting, count) for a trigram, by bisecting the on-disk gram table."""
+        probe = gram.encode('utf-8')
+        lo, hi = 0, self._gram_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset, length, first, count = _GRAM.unpack_from(self._map, self._grams_at + mid * _GRAM.size)
+            start = self._strings_at + offset
+            found = self._map[start:start + length]
+            if found == probe: return first, count
+            if found < probe: lo = mid + 1
+            else: hi = mid
+        return 0, 0
+
+    def near(self, title, year=None, threshold=FUZZY_THRESHOLD, limit=FUZZY_LIMIT):
+        """
+        Ranked near-misses, as ArkIndex.near (same filters, same ranking).
+        Candidates come from the rarest grams' postings only; the common grams
+        are then checked against the survivors, and only the hits are decoded.
+        """
+        if self._grams_at is None:
+            self.warm()
+            return [(score, self[stub["n"]]) for score, stub in self._fuzzy.near(title, year, threshold, limit)]
+        key = title_key(title)
+        query = trigrams(key)
+        if not key: return []
+        # Prefix filter, as ArkIndex: a match must share one of the rarest len(query) - need + 1 grams
+        size = len(query)
+        need = max(1, math.ceil(threshold * size))
+        postings = sorted((self._posting(gram) for gram in query), key=lambda posting: posting[1])
+        rare, common = postings[:size - need + 1], postings[size - need + 1:]
+        postings, sizes = self._postings, self._sizes
+        overlaps = Counter()
+        for first, count in rare:
+            overlaps.update(postings[first:first + count])
+        candidates = list(overlaps)
+
+        # Common grams only add to those candidates: bisect (postings ascend) when they are
+        # few next to the list, else count the whole list in one pass
+        for first, count in common:
+            end = first + count
+            if count > _BISECT_RATIO * len(candidates):
+                for i in candidates:
+                    at = bisect_left(postings, i, first, end)
+                    if at < end and postings[at] == i: overlaps[i] += 1
+            else:
+                overlaps.update(postings[first:end])
+
+        # Length filter: Jaccard >= t needs t*|q| <= |c| <= |q|/t
+        floor, ceiling = threshold * size, size / threshold
+        ranked = []
+        for i in candidates:
+            overlap = overlaps[i]
+            if overlap < need: continue
+            size_i = sizes[i]
+            if size_i > ceiling or size_i < floor: continue
+            score = overlap / (size + size_i - overlap)
+            if score >= threshold:
+                ranked.append((round(score, 3), i))
+        ranked.sort(key=lambda hit: (-hit[0], hit[1]))
+        wanted_year = year_key(year)
+        results = []
+        for score, i in ranked:
+            artifact = self[i]
+            # The exact edition is a hit, not a near-miss
+            if score == 1.0 and year and year_key(artifact.get('year')) == wanted_year: continue
+            results.append((score, artifact))
+            if len(results) >= limit: break
+        return results
@@ -0,0 +1,362 @@
+# shodan_bench.py
+# THE PROVING GROUND: Synthetic collections, timed hot paths, and run-to-run regression flags.
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import generate_ark
+import shodan_core as core
+import shodan_store
+import shodan_uplink as uplink
+
+# --- CONFIGURATION ---
+SIZES = (100, 1000, 10000)
+REPEAT = 3
+RESULTS_FILE = "bench_results.json"
+REGRESSION_THRESHOLD = 0.25   # Flag anything 25% slower than the baseline...
+NOISE_FLOOR = 0.002           # ...unless the slowdown is under 2 ms (timer noise)
+TRAINING_PROBES = 200         # log_training_data calls per warm measurement
+MATCHER_TABLE_SIZES = (11, 32, 44, 64, 100, 200)  # Keys per table in the trie/substring crossover
+
+SOURCE_HEADER = ["Title", "Director", "Format", "Year", "Run Time", "Color/B&W", "Sound", "Aspect Ratio",
+                 "Spine", "Country of Origin", "Language", "Notes"]
+_WORDS = ("night signal machine ghost city shell red dream sea winter iron glass silent last world "
+          "empire blade mirror stalker solaris seven river paris tokyo angel wire cage heaven void").split()
+_FIRST = ("Akira Ingmar Jean Andrei Stanley Alfred Carl Yasujiro Federico Fritz Terrence Lars David "
+          "Mamoru Hideaki Hideo Lana James Paul Denis Christopher George Nicolas Agnes Chantal Wong").split()
+_LAST = ("Kurosawa Bergman Godard Tarkovsky Kubrick Hitchcock Dreyer Ozu Fellini Lang Malick Trier Lynch "
+         "Oshii Anno Kojima Cronenberg Verhoeven Villeneuve Nolan Miller Refn Varda Akerman Kar-wai "
+         "Smith Jones Brown Garcia Martin Moreau Rossi Tanaka Schmidt Novak").split()
+_COUNTRIES = ("USA", "UK", "France", "Japan", "Germany", "Italy", "Sweden", "Denmark", "Soviet Union", "Canada")
+_FORMATS = ("DVD", "Blu-Ray", "4K UHD", "VHS", "Laserdisc")
+_GENRES = ("Drama", "Sci-Fi", "Thriller", "Animation", "Action", "Horror", "Mystery", "Romance", "Crime")
+
+# --- SYNTHETIC DATA ---
+def _title(rng):
+    if rng.random() < 0.05:  # Some rows hit the Sacred Canon, as a real collection does
+        key = rng.choice(sorted(core.SACRED_CANON))
+        return key.title()
+    words = rng.sample(_WORDS, rng.randint(1, 4))
+    return " ".join(words).title()
+
+def _person(rng):
+    return f"{rng.choice(_FIRST)} {rng.choice(_LAST)}"
+
+def _prose(rng, low, high):
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(low, high))]
+    return " ".join(words).capitalize() + "."
+
+def synthetic_rows(n, seed=0):
+    """n source.csv rows (dicts keyed by SOURCE_HEADER)."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        last, first = _person(rng).split(" ", 1)[::-1]
+        rows.append({
+            "Title": _title(rng), "Director": f"{last}, {first}", "Format": rng.choice(_FORMATS),
+            "Year": str(rng.randint(1920, 2024)), "Run Time": str(rng.randint(70, 200)),
+            "Color/B&W": rng.choice(("Color", "B&W")), "Sound": rng.choice(("Mono", "Stereo", "5.1")),
+            "Aspect Ratio": rng.choice(("1.33:1", "1.85:1", "2.39:1")), "Spine": str(i + 1),
+            "Country of Origin": rng.choice(_COUNTRIES), "Language": "English", "Notes": "",
+        })
+    return rows
+
+def write_source_csv(path, n, seed=0):
+    """Writes an n-row source.csv (with the BOM an Excel export carries)."""
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=SOURCE_HEADER)
+        writer.writeheader()
+        writer.writerows(synthetic_rows(n, seed))
+    return path
+
+def _awards(rng):
+    roll = rng.random()
+    if roll < 0.4: return "N/A"
+    if roll < 0.55: return f"Won {rng.randint(1, 11)} Oscars. {rng.randint(5, 120)} wins & {rng.randint(5, 200)} nominations total"
+    if roll < 0.7: return f"Nominated for {rng.randint(1, 6)} Oscars. {rng.randint(1, 40)} wins & {rng.randint(1, 90)} nominations total"
+    return f"{rng.randint(1, 40)} wins & {rng.randint(1, 90)} nominations"
+
+def omdb_records(n, seed=0):
+    """n OMDb-shaped records. Plots run from a short blurb (~25 words) to a full synopsis (~300)."""
+    rng = random.Random(seed)
+    records = []
+    for _ in range(n):
+        records.append({
+            "Title": _title(rng), "Year": str(rng.randint(1920, 2024)), "Director": _person(rng),
+            "Country": ", ".join(rng.sample(_COUNTRIES, rng.randint(1, 2))),
+            "Genre": ", ".join(rng.sample(_GENRES, rng.randint(1, 3))),
+            "Plot": _prose(rng, 15, 40) if rng.random() < 0.7 else _prose(rng, 120, 320),
+            "Actors": ", ".join(_person(rng) for _ in range(3)) + (", Keanu Reeves" if rng.random() < 0.1 else ""),
+            "Awards": _awards(rng), "Type": "movie", "Response": "True",
+        })
+    return records
+
+def write_training_ledger(path, n, seed=0):
+    """Writes an n-row training CSV in the uplink's ledger layout."""
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(shodan_store.TRAINING_HEADER)
+        for i in range(n):
+            writer.writerow([f"2025-12-{rng.randint(1, 28):02d} 12:00:00", f"{_title(rng)} {i}", _person(rng),
+                             str(rng.randint(1920, 2024)), rng.choice(_GENRES), round(rng.uniform(1, 10), 1)])
+    return path
+
+# --- HARNESS ---
+def measure(run, repeat=REPEAT, setup=None):
+    """Times run() `repeat` times (setup() before each, untimed). Returns the list of seconds."""
+    times = []
+    for _ in range(repeat):
+        if setup: setup()
+        started = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - started)
+    return times
+
+def record(name, n, ops, times):
+    best = min(times)
+    return {"name": name, "n": n, "ops": ops, "best_s": round(best, 6), "median_s": round(statistics.median(times), 6),
+            "us_per_op": round(best * 1e6 / max(1, ops), 3)}
+
+@contextlib.contextmanager
+def _quiet():
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+# --- THE BENCHMARKS (each yields records for one data size) ---
+def bench_ark_weight(n, workdir, repeat):
+    rows = synthetic_rows(n)
+    yield record("generate_ark.calculate_shodan_weight", n, n,
+                 measure(lambda: [generate_ark.calculate_shodan_weight(r) for r in rows], repeat))
+
+def bench_core_weight(n, workdir, repeat):
+    records = omdb_records(n)
+    args = [(r["Title"], r["Director"], r["Year"], r["Country"], "Digital", r["Genre"], r["Plot"], r["Actors"], r["Awards"])
+            for r in records]
+    yield record("core.calculate_shodan_weight", n, n,
+                 measure(lambda: [core.calculate_shodan_weight(*a) for a in args], repeat))
+
+def matcher_keys(size, seed=0):
+    """A table of `size` keys: the real tables first, padded with synthetic names."""
+    tables = core.RULESET.tables
+    keys = list(dict.fromkeys(list(tables["resonance_keys"]) + tables["heavy_hitters"] + tables["tektons"]))
+    rng = random.Random(seed)
+    while len(keys) < size:
+        keys.append(f"{rng.choice(_LAST)}{rng.choice(_WORDS)}".capitalize())
+    return keys[:size]
+
+def bench_matcher(n, workdir, repeat):
+    # The TRIE_THRESHOLD crossover: both strategies at every table size
+    records = omdb_records(n)
+    content = [r["Genre"] + " " + r["Plot"] for r in records]
+    people = [r["Director"] for r in records]
+    for size in MATCHER_TABLE_SIZES:
+        for label, trie in (("substring", False), ("trie", True)):
+            matcher = core.SignalMatcher(matcher_keys(size), trie=trie)
+            yield record(f"SignalMatcher.scan ({size} keys, {label})", n, n,
+                         measure(lambda: [list(matcher.scan(text)) for text in content], repeat))
+            yield record(f"SignalMatcher.search ({size} keys, {label})", n, n,
+                         measure(lambda: [matcher.search(text) for text in people], repeat))
+
+def bench_awards(n, workdir, repeat):
+    awards = [r["Awards"] for r in omdb_records(n)]
+    yield record("core.calculate_awards_weight", n, n,
+                 measure(lambda: [core.calculate_awards_weight(a) for a in awards], repeat))
+
+def bench_canon(n, workdir, repeat):
+    probes = [(r["Title"], r["Year"], r["Director"]) for r in omdb_records(n)]
+    yield record("core.check_sacred_canon", n, n,
+                 measure(lambda: [core.check_sacred_canon(*p) for p in probes], repeat))
+
+def bench_generate_ark(n, workdir, repeat):
+    source = write_source_csv(os.path.join(workdir, f"source_{n}.csv"), n)
+    sqlite = shodan_store.STORE_BACKEND == "sqlite"
+    output = shodan_store.STORE_DB if sqlite else os.path.join(workdir, f"canon_{n}.json")
+    additions = iter(synthetic_rows(repeat, seed=n + 1))
+
+    def clean():
+        for path in (output, output + "-wal", output + "-shm", generate_ark.manifest_path(output)):
+            if os.path.exists(path): os.remove(path)
+
+    def add_row():
+        row = dict(next(additions), Title=f"Bench Addition {n}-{time.perf_counter_ns()}")
+        with open(source, 'a', newline='', encoding='utf-8') as f:
+            csv.DictWriter(f, fieldnames=SOURCE_HEADER).writerow(row)
+
+    def build():
+        with _quiet(): generate_ark.main(output=output)
+
+    generate_ark.INPUT_FILE = source
+    yield record("generate_ark.main (full build)", n, n, measure(build, repeat, setup=clean))
+    # The manifest from the last full build makes these incremental passes
+    yield record("generate_ark.main (no change)", n, n, measure(build, repeat))
+    yield record("generate_ark.main (one row added)", n, n, measure(build, repeat, setup=add_row))
+
+def bench_load_ark(n, workdir, repeat):
+    source = write_source_csv(os.path.join(workdir, f"source_{n}.csv"), n)
+    generate_ark.INPUT_FILE = source
+    arks = [os.path.join(workdir, f"load_{n}.json"), os.path.join(workdir, f"load_{n}.ark")]
+    if shodan_store.STORE_BACKEND == "sqlite":
+        arks = [shodan_store.STORE_DB]
+    for ark in arks:
+        with _quiet(): generate_ark.main(output=ark, full=True)
+        uplink.CANON_FILE = ark
+
+        def cold():
+            uplink._STORE = None  # Force a fresh open, as at process start
+        label = "sqlite" if ark == shodan_store.STORE_DB else os.path.splitext(ark)[1][1:]
+        yield record(f"uplink.load_local_ark ({label})", n, n, measure(uplink.load_local_ark, repeat, setup=cold))
+        uplink._STORE = None
+
+def bench_training(n, workdir, repeat):
+    ledger = os.path.join(workdir, f"training_{n}.csv")
+    fresh = [(f"Bench Title {i}", "Bench Director", str(1950 + i % 70), "Drama", 7.5) for i in range(TRAINING_PROBES)]
+    uplink.TRAINING_FILE = ledger
+
+    def reset():
+        write_training_ledger(ledger, n)
+        if uplink._STORE is not None: uplink._STORE.close()
+        if shodan_store.STORE_BACKEND == "sqlite":
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(shodan_store.STORE_DB + suffix): os.remove(shodan_store.STORE_DB + suffix)
+            store = shodan_store.SQLiteStore(shodan_store.STORE_DB)
+            store.import_training(ledger)
+            store.close()
+        uplink._STORE = None
+
+    def first():
+        uplink.log_training_data(*fresh[0])
+
+    def steady():
+        for sample in fresh[1:]: uplink.log_training_data(*sample)   # New entries
+        for sample in fresh[1:]: uplink.log_training_data(*sample)   # Duplicates
+
+    def warm_reset():
+        reset()
+        first()
+    yield record("uplink.log_training_data (first call, cold ledger)", n, 1, measure(first, repeat, setup=reset))
+    yield record("uplink.log_training_data (append + dedup)", n, 2 * (TRAINING_PROBES - 1),
+                 measure(steady, repeat, setup=warm_reset))
+    uplink._STORE = None
+
+BENCHMARKS = {
+    "ark_weight": bench_ark_weight,
+    "core_weight": bench_core_weight,
+    "matcher": bench_matcher,
+    "awards": bench_awards,
+    "canon": bench_canon,
+    "generate_ark": bench_generate_ark,
+    "load_ark": bench_load_ark,
+    "training": bench_training,
+}
+
+def run(sizes=SIZES, repeat=REPEAT, only=None, store="files", on_result=None):
+    """
+    Runs the selected benchmarks at every size inside a scratch directory
+    (the real Ark, ledger and database are never touched). Returns records.
+    """
+    saved = (generate_ark.INPUT_FILE, uplink.CANON_FILE, uplink.TRAINING_FILE, uplink._STORE,
+             shodan_store.STORE_BACKEND, shodan_store.STORE_DB)
+    workdir = tempfile.mkdtemp(prefix="shodan_bench_")
+    shodan_store.STORE_BACKEND = store
+    shodan_store.STORE_DB = os.path.join(workdir, "bench.sqlite3")
+    uplink._STORE = None
+    results = []
+    try:
+        for name, bench in BENCHMARKS.items():
+            if only and not any(o in name for o in only): continue
+            for n in sizes:
+                for result in bench(n, workdir, repeat):
+                    results.append(result)
+                    if on_result: on_result(result)
+    finally:
+        if uplink._STORE is not None: uplink._STORE.close()
+        (generate_ark.INPUT_FILE, uplink.CANON_FILE, uplink.TRAINING_FILE, uplink._STORE,
+         shodan_store.STORE_BACKEND, shodan_store.STORE_DB) = saved
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+# --- COMPARISON ---
+def _key(result):
+    return f"{result['name']} [n={result['n']}]"
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Matches results to a previous run by name and size. Returns one row per
+    match with the ratio (now / before, best-of-N times) and a verdict.
+    """
+    before = {_key(r): r for r in baseline.get("results", [])}
+    rows = []
+    for result in results:
+        old = before.get(_key(result))
+        if not old: continue
+        ratio = result["best_s"] / old["best_s"] if old["best_s"] else float("inf")
+        slower = result["best_s"] - old["best_s"]
+        verdict = "REGRESSION" if ratio > 1 + threshold and slower > NOISE_FLOOR else \
+                  "IMPROVED" if ratio < 1 - threshold and -slower > NOISE_FLOOR else "OK"
+        rows.append({"benchmark": _key(result), "before_s": old["best_s"], "now_s": result["best_s"],
+                     "ratio": round(ratio, 3), "verdict": verdict})
+    return rows
+
+def environment():
+    return {"python": platform.python_version(), "implementation": platform.python_implementation(),
+            "platform": platform.platform(), "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PROJECT SHODAN: BENCHMARKS")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="comma-separated data sizes")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="runs per measurement (best is kept)")
+    parser.add_argument("--only", help=f"comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--store", choices=("files", "sqlite"), default="files", help="storage backend under test")
+    parser.add_argument("--output", default=RESULTS_FILE, help="where to write this run's JSON")
+    parser.add_argument("--baseline", help="previous run to compare against (default: the existing --output file)")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="slowdown ratio flagged as a regression")
+    args = parser.parse_args(argv)
+
+    baseline_path = args.baseline or args.output
+    baseline = None
+    if os.path.exists(baseline_path):
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print("/// PROJECT SHODAN: PROVING GROUND ///")
+    print(f"{'BENCHMARK':<58} {'N':>7} {'BEST (s)':>10} {'us/op':>10}")
+
+    def show(r):
+        print(f"{r['name']:<58} {r['n']:>7} {r['best_s']:>10.4f} {r['us_per_op']:>10.2f}")
+        sys.stdout.flush()
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    only = [o.strip() for o in args.only.split(",")] if args.only else None
+    results = run(sizes, args.repeat, only, args.store, on_result=show)
+
+    report = {"environment": dict(environment(), store=args.store, repeat=args.repeat), "results": results}
+    status = 0
+    if baseline:
+        report["comparison"] = rows = compare(results, baseline, args.threshold)
+        flagged = [r for r in rows if r["verdict"] != "OK"]
+        print(f"--- AGAINST {baseline_path} ({baseline.get('environment', {}).get('timestamp', '?')}) ---")
+        for row in flagged:
+            print(f"[{row['verdict']}] {row['benchmark']}: {row['before_s']:.4f}s -> {row['now_s']:.4f}s (x{row['ratio']})")
+        if not flagged:
+            print(f"[OK] {len(rows)} benchmarks within {args.threshold:.0%} of the baseline.")
+        status = 1 if any(r["verdict"] == "REGRESSION" for r in rows) else 0
+
+    with open(args.output + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    os.replace(args.output + ".tmp", args.output)
+    print(f"[OUTPUT] Results written to '{args.output}'.")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
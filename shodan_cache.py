@@ -0,0 +1,110 @@
+# shodan_cache.py
+# THE RECALL: Persistent memory of every OMDb interrogation.
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# --- CONFIGURATION ---
+CACHE_FILE = os.getenv("SHODAN_CACHE_FILE", "omdb_cache.sqlite3")
+CACHE_TTL = float(os.getenv("SHODAN_CACHE_TTL", 7 * 24 * 3600))        # Found artifacts
+CACHE_NEGATIVE_TTL = float(os.getenv("SHODAN_CACHE_NEGATIVE_TTL", 24 * 3600))  # "Not found" verdicts
+CACHE_MAX_ENTRIES = int(os.getenv("SHODAN_CACHE_MAX", 5000))
+
+MISS = object()  # Sentinel: nothing usable in the cache
+
+def cache_key(title, year=None, type_=None):
+    """(title, year, type) -> stable cache key. Titles compare case-insensitively."""
+    return "|".join([(title or "").strip().lower(), str(year or ""), (type_ or "").lower()])
+
+class ResponseCache:
+    """
+    On-disk OMDb response cache (SQLite) with TTL expiry, LRU eviction and
+    negative caching. get() returns the cached payload, None for a cached
+    "not found", or MISS.
+    """
+    def __init__(self, path=CACHE_FILE, ttl=CACHE_TTL, negative_ttl=CACHE_NEGATIVE_TTL, max_entries=CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "negative_hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS omdb_cache ("
+            " key TEXT PRIMARY KEY, payload TEXT, fetched REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS omdb_cache_accessed ON omdb_cache (accessed)")
+        self._db.commit()
+        # Running row count, so put() never scans the table to decide on eviction
+        self._count = self._db.execute("SELECT COUNT(*) FROM omdb_cache").fetchone()[0]
+
+    def get(self, key, allow_stale=False):
+        """Looks up a key. allow_stale serves expired entries (OFFLINE MODE)."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT payload, fetched FROM omdb_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return MISS
+            payload, fetched = row
+            ttl = self.ttl if payload is not None else self.negative_ttl
+            stale = now - fetched > ttl
+            if stale and not allow_stale:
+                self.stats["misses"] += 1
+                return MISS
+            self._db.execute("UPDATE omdb_cache SET accessed = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            if stale: self.stats["stale_hits"] += 1
+            if payload is None:
+                self.stats["negative_hits"] += 1
+                return None
+            self.stats["hits"] += 1
+            return json.loads(payload)
+
+    def put(self, key, data):
+        """Stores a payload; data=None records a negative ("not found") verdict."""
+        now = time.time()
+        payload = json.dumps(data) if data is not None else None
+        with self._lock:
+            # A primary-key probe: only a new key grows the table
+            if self._db.execute("SELECT 1 FROM omdb_cache WHERE key = ?", (key,)).fetchone() is None:
+                self._count += 1
+            self._db.execute(
+                "INSERT OR REPLACE INTO omdb_cache (key, payload, fetched, accessed) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now)
+            )
+            if self._count > self.max_entries: self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        cur = self._db.execute(
+            "DELETE FROM omdb_cache WHERE key IN (SELECT key FROM omdb_cache ORDER BY accessed LIMIT ?)",
+            (self._count - self.max_entries,)
+        )
+        self._count -= cur.rowcount
+        self.stats["evictions"] += cur.rowcount
+
+    def purge_expired(self):
+        """Drops every entry past its TTL. Returns the count removed."""
+        now = time.time()
+        with self._lock:
+            cur = self._db.execute(
+                "DELETE FROM omdb_cache WHERE (payload IS NOT NULL AND fetched < ?) OR (payload IS NULL AND fetched < ?)",
+                (now - self.ttl, now - self.negative_ttl)
+            )
+            self._db.commit()
+            self._count -= cur.rowcount
+            return cur.rowcount
+
+    def __len__(self):
+        """Exact count (also resyncs the running one with rows other processes wrote)."""
+        with self._lock:
+            self._count = self._db.execute("SELECT COUNT(*) FROM omdb_cache").fetchone()[0]
+            return self._count
+
+    def close(self):
+        with self._lock:
+            self._db.close()
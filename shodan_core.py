@@ -1,5 +1,8 @@
 # shodan_core.py
 # THE LOGOS: The immutable logic of the Ark.
+import bisect
+import json
+import os
 import re
 
 # 1. THE SACRED CANON
@@ -42,122 +45,489 @@ APOCRYPHA = {
     "michigan: report from hell": "SIMULACRUM ARTIFACT (SUDA51 ECHO)"
 }
 
-# 3. THE HIGH PRIESTS
-HEAVY_HITTERS = [
-    "Kurosawa", "Bergman", "Godard", "Tarkovsky", "Kubrick", 
-    "Hitchcock", "Dreyer", "Ozu", "Fellini", "Lang", 
-    "Malick", "Trier", "Lynch", "Oshii", "Anno", "Kojima",
-    "Wachowski", "Sega", "Team Silent", "Namco", "Cronenberg",
-    "Gibson", "Cameron", "Verhoeven", 
-    "Madhouse", "Kawajiri", "Koike", "Watanabe",
-    "Villeneuve", "Nolan", "Miller", "Refn"
-]
-
-# 4. THE TEKTONS
-TEKTONS = [
-    "Ryan Gosling", "Keanu Reeves", "Tom Hardy", 
-    "Christian Bale", "Scarlett Johansson", "Willem Dafoe",
-    "Tilda Swinton", "Mads Mikkelsen", "Jake Gyllenhaal",
-    "Song Kang-ho", "Takeshi Kitano"
-]
-
-# 5. RESONANCE KEYS
-RESONANCE_KEYS = {
-    "Cyberpunk": 1.5, "Dystopia": 1.0, "Surreal": 1.0,
-    "Animation": 0.5, "Cult": 1.0, "Hacker": 1.5,
-    "Robot": 1.0, "Philosophy": 1.0, "Noir": 0.5,
-    "Tech-Noir": 2.0, "Cyborg": 1.5, "Time Travel": 1.0,
-    "Artificial Intelligence": 1.5, "AI": 1.0,
-    "Mars": 1.0, "Memory": 1.0, "Virtual Reality": 1.5, 
-    "Simulation": 1.5, "Dream": 0.5,
-    "Vampire": 1.5, "Gothic": 1.5, "Post-Apocalyptic": 1.5,
-    "Hunter": 0.5, "Occult": 1.0, "Demon": 1.0,
-    "Racing": 2.0, "Speed": 1.0, "Tournament": 1.0, 
-    "Car": 0.5, "Hand-Drawn": 1.5,
-    "Jazz": 1.5, "Space Western": 1.5, "Bounty Hunter": 1.0,
-    "Samurai": 1.5, "Hip-Hop": 1.5, "Funk": 1.0,
-    "Android": 1.5, "Hologram": 1.0, "Neon": 0.5, "Identity": 1.0,
-    "Neo-Noir": 2.0,
-    "Synthwave": 2.5, "Retrowave": 2.0, "Outrun": 2.0
-}
+# 3-5. THE HIGH PRIESTS, THE TEKTONS, THE RESONANCE KEYS
+# Declared in the ruleset file alongside every other scoring weight, so the
+# doctrine can change without editing Python. Loaded below (see THE RULESET).
+RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shodan_rules.json")
+HEAVY_HITTERS = []
+TEKTONS = []
+RESONANCE_KEYS = {}
 
 def normalize_key(title):
     if not title: return ""
-    return "".join(c for c in title.lower() if c.isalnum())
+    return "".join(filter(str.isalnum, title.lower()))
+
+# 6. THE INDEX (normalized title -> canon keys, built once at import)
+_CANON_INDEX = {}
+_APOCRYPHA_INDEX = {}
+
+def rebuild_canon_index():
+    """Rebuilds the normalized lookup index from SACRED_CANON and APOCRYPHA."""
+    _CANON_INDEX.clear()
+    _APOCRYPHA_INDEX.clear()
+    for key in SACRED_CANON:
+        _CANON_INDEX.setdefault(normalize_key(key), []).append(key)
+    for key in APOCRYPHA:
+        _APOCRYPHA_INDEX.setdefault(normalize_key(key), []).append(key)
+
+rebuild_canon_index()
+
+def register_canon(title, weight, year=None, director=None):
+    """Inscribes (or overwrites) a Sacred Canon entry and indexes it."""
+    key = title.lower()
+    data = {"weight": weight}
+    if year: data["year"] = str(year)
+    if director: data["director"] = director
+    if key not in SACRED_CANON:
+        _CANON_INDEX.setdefault(normalize_key(key), []).append(key)
+    SACRED_CANON[key] = data
+    return data
+
+def remove_canon(title):
+    """Purges every Sacred Canon entry matching the title. Returns the count removed."""
+    keys = _CANON_INDEX.pop(normalize_key(title), [])
+    for key in keys:
+        SACRED_CANON.pop(key, None)
+    return len(keys)
+
+def register_apocrypha(title, status):
+    """Inscribes (or overwrites) an Apocrypha entry and indexes it."""
+    key = title.lower()
+    if key not in APOCRYPHA:
+        _APOCRYPHA_INDEX.setdefault(normalize_key(key), []).append(key)
+    APOCRYPHA[key] = status
+    return status
+
+def remove_apocrypha(title):
+    """Purges every Apocrypha entry matching the title. Returns the count removed."""
+    keys = _APOCRYPHA_INDEX.pop(normalize_key(title), [])
+    for key in keys:
+        APOCRYPHA.pop(key, None)
+    return len(keys)
 
 def get_sacred_data(title):
     """Retrieves the raw Sacred Canon data if the title matches."""
-    clean_title = normalize_key(title)
-    for key, data in SACRED_CANON.items():
-        if normalize_key(key) == clean_title:
-            return data
+    keys = _CANON_INDEX.get(normalize_key(title))
+    if keys:
+        return SACRED_CANON[keys[0]]
     return None
 
 def check_sacred_canon(title, year=None, director=None):
     clean_title = normalize_key(title)
     
-    for key, data in SACRED_CANON.items():
-        if normalize_key(key) == clean_title:
-            # IDENTITY CHECK
-            if "year" in data:
-                if not year or data["year"] not in str(year):
-                    continue 
-            
-            if "director" in data:
-                if not director or data["director"].lower() not in director.lower():
-                    continue
-
-            return ("SACRED", data["weight"])
+    for key in _CANON_INDEX.get(clean_title, ()):
+        data = SACRED_CANON[key]
+        # IDENTITY CHECK
+        if "year" in data:
+            if not year or data["year"] not in str(year):
+                continue 
+        
+        if "director" in data:
+            if not director or data["director"].lower() not in director.lower():
+                continue
+
+        return ("SACRED", data["weight"])
         
-    for key, status in APOCRYPHA.items():
-        if normalize_key(key) == clean_title: return ("APOCRYPHA", status)
+    keys = _APOCRYPHA_INDEX.get(clean_title)
+    if keys: return ("APOCRYPHA", APOCRYPHA[keys[0]])
         
     return None
 
+# 7. THE SIGNAL MATCHER (compiled once, rebuilt when the tables change)
+# Crossover measured by `shodan_bench.py --only matcher`: a yes/no search() over
+# a short field is faster through the compiled trie at every table size, but
+# scan() (every hit, over genre + plot) only overtakes per-key substring checks
+# at around 50 keys. Smaller tables scan key by key.
+TRIE_THRESHOLD = 50
+
+def _trie_pattern(node):
+    # Children before termination: the regex lands on the longest key at an offset
+    branches = []
+    for ch, child in sorted(node.items()):
+        if ch == "": continue
+        edge = re.escape(ch)
+        while "" not in child and len(child) == 1:
+            (ch, child), = child.items()
+            edge += re.escape(ch)
+        branches.append(edge + _trie_pattern(child))
+    if not branches: return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" not in node: return body
+    return "(?:" + body + ")?" if len(branches) == 1 else body + "?"
+
+class SignalMatcher:
+    """
+    Multi-pattern scanner over a table of case-insensitive keys. The table
+    compiles into a trie-shaped regex that finds the longest key at each hit
+    offset. search() always uses it; scan() does from TRIE_THRESHOLD keys up
+    (or as forced by `trie`), taking the shorter keys that prefix each match
+    from a precomputed map, so every overlapping substring hit is reported.
+    """
+    def __init__(self, keys, case_sensitive=False, trie=None):
+        self.keys = list(keys)
+        self.case_sensitive = case_sensitive
+        self._order = {}
+        self._originals = {}
+        for i, key in enumerate(self.keys):
+            lowered = self.fold(key)
+            if not lowered: continue
+            self._order.setdefault(key, i)
+            self._originals.setdefault(lowered, []).append(key)
+        self._lowered = list(self._originals)
+        self._pairs = [(self.fold(key), key) for key in self.keys if key]
+        self._regex = None
+        self._scan_trie = len(self._lowered) >= TRIE_THRESHOLD if trie is None else trie
+        if self._lowered and trie is not False:
+            root = {}
+            for lowered in self._lowered:
+                node = root
+                for ch in lowered:
+                    node = node.setdefault(ch, {})
+                node[""] = {}
+            self._regex = re.compile(_trie_pattern(root))
+        if self._regex and self._scan_trie:
+            self._prefixes = {
+                lowered: [lowered[:n] for n in range(1, len(lowered) + 1) if lowered[:n] in self._originals]
+                for lowered in self._lowered
+            }
+
+    def fold(self, text):
+        return text if self.case_sensitive else text.lower()
+
+    def search(self, text):
+        """True if any key occurs in the text."""
+        if not text: return False
+        text = self.fold(text)
+        if self._regex: return self._regex.search(text) is not None
+        return any(lowered in text for lowered in self._lowered)
+
+    def scan(self, text):
+        """Yields every key found in the text, in table order (lazily, so callers may stop early)."""
+        if not text: return
+        text = self.fold(text)
+        if not (self._regex and self._scan_trie):
+            for lowered, key in self._pairs:
+                if lowered in text: yield key
+            return
+        hits = set()
+        search = self._regex.search
+        match = search(text)
+        while match:
+            hits.update(self._prefixes[match.group()])
+            match = search(text, match.start() + 1)
+        yield from sorted((key for lowered in hits for key in self._originals[lowered]), key=self._order.__getitem__)
+
+_MATCHERS = {}
+
+def matcher_for(table, case_sensitive=False):
+    """Returns the cached SignalMatcher for a table, recompiling it if the table's keys changed."""
+    signature = tuple(table)
+    slot = (id(table), case_sensitive)
+    cached = _MATCHERS.get(slot)
+    if cached is None or cached[0] != signature:
+        cached = _MATCHERS[slot] = (signature, SignalMatcher(signature, case_sensitive))
+    return cached[1]
+
+def get_signal_matchers():
+    """Returns (resonance, heavy_hitters, tektons) matchers, recompiling stale ones."""
+    return matcher_for(RESONANCE_KEYS), matcher_for(HEAVY_HITTERS), matcher_for(TEKTONS)
+
+def _parse_year(year_str):
+    try: return int(year_str)
+    except (TypeError, ValueError): return None
+
+# 8. THE RULESET (declarative weights, compiled once per profile into a ScoringPlan)
+class Ruleset:
+    """
+    Scoring doctrine loaded from a data file: named tables (High Priests,
+    Tektons, Resonance Keys) plus per-profile rules. The "uplink" profile
+    scores OMDb signals; the "ark" profile scores collection exports.
+    """
+    def __init__(self, data):
+        self.version = data.get("version", 1)
+        self.tables = data.get("tables", {})
+        self.profiles = data.get("profiles", {})
+
+    @classmethod
+    def load(cls, path=RULES_FILE):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def compile(self, profile="uplink"):
+        if profile not in self.profiles:
+            raise KeyError(f"Unknown scoring profile: {profile}")
+        return ScoringPlan(self, profile)
+
+class ScoringPlan:
+    """
+    A compiled profile: flat year buckets, pre-lowered table matchers and
+    precompiled award regexes, so per-call work is only the evaluation.
+    """
+    def __init__(self, ruleset, profile):
+        rules = ruleset.profiles[profile]
+        self.profile = profile
+        self.base = float(rules.get("base", 5.0))
+        self.sacred_canon = bool(rules.get("sacred_canon", False))
+
+        year = rules.get("year", {})
+        self.year_buckets = [(int(bound), float(bonus)) for bound, bonus in year.get("buckets", [])]
+        self.year_beyond = float(year.get("beyond", 0.0))
+
+        self.director = self._table_rule(ruleset, rules.get("director"))
+        self.actors = self._table_rule(ruleset, rules.get("actors"))
+
+        resonance = rules.get("resonance")
+        self.resonance_table = ruleset.tables[resonance["table"]] if resonance else None
+        self.resonance_ceiling = float(resonance.get("ceiling", 10.0)) if resonance else None
+
+        self.awards = [
+            (re.compile(rule["pattern"]), float(rule["each"]), bool(rule.get("first_only", False)))
+            for rule in rules.get("awards", [])
+        ]
+
+        origin = rules.get("origin", {})
+        self.origin_bonus = float(origin.get("bonus", 0.0))
+        self.origin_domestic = list(origin.get("domestic", []))
+
+        fmt = rules.get("format", {})
+        self.format_bonus = float(fmt.get("bonus", 0.0))
+        self.format_match = list(fmt.get("match", []))
+
+        self.floor, self.ceiling = (float(x) for x in rules.get("clamp", [1.0, 10.0]))
+
+    @staticmethod
+    def _table_rule(ruleset, rule):
+        if not rule: return None
+        return (ruleset.tables[rule["table"]], float(rule["bonus"]), bool(rule.get("case_sensitive", False)))
+
+    def year_bonus(self, year):
+        for bound, bonus in self.year_buckets:
+            if year < bound: return bonus
+        return self.year_beyond
+
+    def awards_weight(self, awards_str):
+        if not awards_str or awards_str == "N/A": return 0.0
+        weight = 0.0
+        for regex, each, first_only in self.awards:
+            if first_only:
+                match = regex.search(awards_str)
+                if match: weight += int(match.group(1)) * each
+            else:
+                for n in regex.findall(awards_str): weight += int(n) * each
+        return weight
+
+    def score(self, title, director, year_str, country, fmt="Digital", genre="", plot="", actors="", awards=""):
+        if self.sacred_canon:
+            check = check_sacred_canon(title, year_str, director)
+            if check:
+                if check[0] == "SACRED": return check[1]
+                if check[0] == "APOCRYPHA": return 0.0
+
+        weight = self.base
+        year = _parse_year(year_str)
+        if year is not None: weight += self.year_bonus(year)
+
+        if self.director:
+            table, bonus, case_sensitive = self.director
+            if matcher_for(table, case_sensitive).search(director): weight += bonus
+
+        if self.actors:
+            table, bonus, case_sensitive = self.actors
+            if matcher_for(table, case_sensitive).search(actors): weight += bonus
+
+        if self.resonance_table is not None:
+            table = self.resonance_table
+            for key in matcher_for(table).scan(genre + " " + plot):
+                weight += table[key]
+                if weight >= self.resonance_ceiling:
+                    weight = self.resonance_ceiling
+                    break
+
+        if self.awards: weight += self.awards_weight(awards)
+
+        if self.origin_bonus and not any(d in country for d in self.origin_domestic): weight += self.origin_bonus
+        if self.format_bonus and any(m in fmt for m in self.format_match): weight += self.format_bonus
+
+        return min(max(round(weight, 1), self.floor), self.ceiling)
+
+RULESET = None
+_PLANS = {}
+
+def load_ruleset(path=RULES_FILE):
+    """Loads (or reloads) the active ruleset and rebinds the module-level tables."""
+    global RULESET, HEAVY_HITTERS, TEKTONS, RESONANCE_KEYS
+    RULESET = Ruleset.load(path)
+    HEAVY_HITTERS = RULESET.tables.setdefault("heavy_hitters", [])
+    TEKTONS = RULESET.tables.setdefault("tektons", [])
+    RESONANCE_KEYS = RULESET.tables.setdefault("resonance_keys", {})
+    _PLANS.clear()
+    return RULESET
+
+def get_plan(profile="uplink"):
+    """Returns the compiled ScoringPlan for a profile of the active ruleset."""
+    plan = _PLANS.get(profile)
+    if plan is None:
+        plan = _PLANS[profile] = RULESET.compile(profile)
+    return plan
+
+load_ruleset()
+
 def calculate_awards_weight(awards_str):
-    if not awards_str or awards_str == "N/A": return 0.0
-    weight = 0.0
-    oscar_match = re.search(r'Won (\d+) Oscar', awards_str)
-    if oscar_match:
-        weight += int(oscar_match.group(1)) * 0.1
-    numbers = re.findall(r'(\d+) win', awards_str)
-    for n in numbers: weight += int(n) * 0.01
-    numbers = re.findall(r'(\d+) nomination', awards_str)
-    for n in numbers: weight += int(n) * 0.01
-    return weight
+    return get_plan().awards_weight(awards_str)
 
 def calculate_shodan_weight(title, director, year_str, country, fmt="Digital", genre="", plot="", actors="", awards=""):
-    check = check_sacred_canon(title, year_str, director)
-    if check:
-        if check[0] == "SACRED": return check[1]
-        if check[0] == "APOCRYPHA": return 0.0 
-
-    weight = 5.0
-    try:
-        year = int(year_str)
-        if year < 1960: weight += 2.0
-        elif year < 1980: weight += 1.5
-        elif year < 2000: weight += 1.0
-        elif year <= 2020: weight += 0.5
-    except ValueError: pass 
-
-    if any(h.lower() in director.lower() for h in HEAVY_HITTERS):
-        weight += 2.0
-
-    if any(t.lower() in actors.lower() for t in TEKTONS):
-        weight += 1.5
-
-    content_signal = (genre + " " + plot).lower()
-    for key, value in RESONANCE_KEYS.items():
-        if key.lower() in content_signal:
-            weight += value
-            if weight >= 9.8: 
-                weight = 9.8
+    return get_plan().score(title, director, year_str, country, fmt, genre, plot, actors, awards)
+
+# 9. THE BATCH ENGINE (column-wise scoring for full dumps and collection exports)
+BATCH_CHUNK = 4096
+
+def _bulk_map(values, fn):
+    """Applies fn once per distinct value and returns the results as a list."""
+    cache = {}
+    out = []
+    for value in values:
+        if value not in cache:
+            cache[value] = fn(value)
+        out.append(cache[value])
+    return out
+
+class _Column:
+    """A chunk of lowered text cells joined into one string, so each key costs a single C-level scan."""
+    def __init__(self, cells):
+        self.starts = []
+        pos = 0
+        for cell in cells:
+            self.starts.append(pos)
+            pos += len(cell) + 1
+        self.cells = cells
+        self.text = "\x00".join(cells)
+
+    def rows(self, needle):
+        """Indices of the cells containing needle (each row reported once)."""
+        found = []
+        starts = self.starts
+        last = len(starts) - 1
+        budget = len(starts) // 8
+        find = self.text.find
+        pos = find(needle)
+        while pos >= 0:
+            row = bisect.bisect_right(starts, pos) - 1
+            found.append(row)
+            if row == last: break
+            if len(found) > budget:
+                # Dense key: one membership test per remaining cell beats hopping between hits
+                cells = self.cells
+                found.extend(i for i in range(row + 1, last + 1) if needle in cells[i])
                 break
+            pos = find(needle, starts[row + 1])
+        return found
+
+def _contains(np, column, matcher):
+    """Boolean mask: True where any matcher key occurs in the column."""
+    mask = np.zeros(len(column.starts), dtype=bool)
+    for lowered in matcher._lowered:
+        mask[column.rows(lowered)] = True
+    return mask
+
+def calculate_shodan_weight_batch(titles, directors, years, countries, formats=None,
+                                  genres=None, plots=None, actors=None, awards=None, profile="uplink"):
+    """
+    Column-wise calculate_shodan_weight. Takes equal-length sequences and
+    returns a float64 NumPy array that matches the scalar plan row for row.
+    Optional columns default to the scalar defaults ("Digital" / "").
+    """
+    import numpy as np
+
+    plan = get_plan(profile)
+    n = len(titles)
+    def column(values, default):
+        if values is None: return [default] * n
+        values = list(values)
+        if len(values) != n: raise ValueError("batch columns must be the same length")
+        return values
 
-    weight += calculate_awards_weight(awards)
+    titles = column(titles, "")
+    directors = column(directors, "")
+    years = column(years, "")
+    countries = column(countries, "")
+    formats = column(formats, "Digital")
+    genres = column(genres, "")
+    plots = column(plots, "")
+    actors = column(actors, "")
+    awards = column(awards, "")
 
-    if "USA" not in country and "United States" not in country: weight += 0.5
-    if "Blu-Ray" in fmt: weight += 0.5
+    out = np.empty(n, dtype=np.float64)
+    for start in range(0, n, BATCH_CHUNK):
+        stop = min(start + BATCH_CHUNK, n)
+        out[start:stop] = _score_chunk(
+            np, plan, titles[start:stop], directors[start:stop], years[start:stop],
+            countries[start:stop], formats[start:stop], genres[start:stop],
+            plots[start:stop], actors[start:stop], awards[start:stop]
+        )
+    return out
 
-    return min(max(round(weight, 1), 1.0), 10.0)
\ No newline at end of file
+def _table_mask(np, rule, cells):
+    table, bonus, case_sensitive = rule
+    matcher = matcher_for(table, case_sensitive)
+    return np.where(_contains(np, _Column([matcher.fold(c) for c in cells]), matcher), bonus, 0.0)
+
+def _score_chunk(np, plan, titles, directors, years, countries, formats, genres, plots, actors, awards):
+    # 1. DURABILITY (Age)
+    parsed = _bulk_map(years, _parse_year)
+    valid = np.array([y is not None for y in parsed], dtype=bool)
+    year = np.array([y if y is not None else 0 for y in parsed], dtype=np.int64)
+    bonus = np.select([year < bound for bound, _ in plan.year_buckets],
+                      [b for _, b in plan.year_buckets], plan.year_beyond)
+    weight = plan.base + np.where(valid, bonus, 0.0)
+
+    # 2. HIGH PRIESTS & TEKTONS
+    if plan.director: weight = weight + _table_mask(np, plan.director, directors)
+    if plan.actors: weight = weight + _table_mask(np, plan.actors, actors)
+
+    # 3. RESONANCE (sequential in table order, with the ceiling clamp per row)
+    if plan.resonance_table is not None:
+        table = plan.resonance_table
+        ceiling_value = plan.resonance_ceiling
+        content = _Column([(g + " " + p).lower() for g, p in zip(genres, plots)])
+        clamped = np.zeros(len(content.starts), dtype=bool)
+        for lowered, key in matcher_for(table)._pairs:
+            if clamped.all(): break
+            rows = content.rows(lowered)
+            if not rows: continue
+            hit = np.zeros(len(clamped), dtype=bool)
+            hit[rows] = True
+            hit &= ~clamped
+            weight = np.where(hit, weight + table[key], weight)
+            ceiling = hit & (weight >= ceiling_value)
+            weight[ceiling] = ceiling_value
+            clamped |= ceiling
+
+    # 4. AWARDS, ORIGIN, HAPTICS
+    if plan.awards:
+        weight = weight + np.array(_bulk_map(awards, plan.awards_weight), dtype=np.float64)
+    if plan.origin_bonus:
+        country = np.array(countries, dtype=str)
+        foreign = np.ones(len(country), dtype=bool)
+        for domestic in plan.origin_domestic:
+            foreign &= np.char.find(country, domestic) < 0
+        weight = weight + np.where(foreign, plan.origin_bonus, 0.0)
+    if plan.format_bonus:
+        fmt = np.array(formats, dtype=str)
+        matched = np.zeros(len(fmt), dtype=bool)
+        for m in plan.format_match:
+            matched |= np.char.find(fmt, m) >= 0
+        weight = weight + np.where(matched, plan.format_bonus, 0.0)
+
+    # Python's round() is correctly rounded where np.round is not; apply it per distinct value
+    distinct, inverse = np.unique(weight, return_inverse=True)
+    weight = np.clip(np.array([round(w, 1) for w in distinct.tolist()], dtype=np.float64)[inverse], plan.floor, plan.ceiling)
+
+    # 5. THE LOGOS (canon overrides, resolved only for rows whose title is indexed)
+    if plan.sacred_canon:
+        keys = _bulk_map(titles, normalize_key)
+        for i, key in enumerate(keys):
+            if key in _CANON_INDEX or key in _APOCRYPHA_INDEX:
+                check = check_sacred_canon(titles[i], years[i], directors[i])
+                if check:
+                    weight[i] = check[1] if check[0] == "SACRED" else 0.0
+    return weight
@@ -0,0 +1,147 @@
+# shodan_net.py
+# THE CONDUIT: Persistent, bounded connections to the outside signal.
+import http.client
+import random
+import socket
+import threading
+import time
+import urllib.parse
+
+# --- CONFIGURATION ---
+CONNECT_TIMEOUT = 3.0   # Seconds to establish TCP (+TLS)
+READ_TIMEOUT = 10.0     # Seconds of silence tolerated mid-response
+RETRIES = 3             # Extra attempts after the first, on 5xx / timeouts / dropped sockets
+BACKOFF = 0.5           # Base delay, doubled per attempt, with full jitter
+MAX_BACKOFF = 8.0
+POOL_SIZE = 4           # Idle keep-alive connections kept per host
+USER_AGENT = "ShodanUplink/2.0"
+
+class NetworkDown(Exception):
+    """Raised when every attempt failed at the transport level (or with 5xx)."""
+
+class HttpClient:
+    """
+    Keep-alive HTTP client. Idle connections are pooled per (scheme, host, port),
+    connect and read timeouts are split, and transient failures are retried
+    with jittered exponential backoff. Thread-safe.
+    """
+    def __init__(self, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT, retries=RETRIES,
+                 backoff=BACKOFF, max_backoff=MAX_BACKOFF, pool_size=POOL_SIZE, user_agent=USER_AGENT):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pool_size = pool_size
+        self.user_agent = user_agent
+        self.stats = {"requests": 0, "connections": 0, "reused": 0, "retries": 0}
+        self._pool = {}
+        self._lock = threading.Lock()
+
+    # --- POOL ---
+    def _acquire(self, origin):
+        with self._lock:
+            idle = self._pool.get(origin)
+            if idle:
+                self.stats["reused"] += 1
+                return idle.pop(), True
+            self.stats["connections"] += 1
+        scheme, host, port = origin
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = cls(host, port, timeout=self.connect_timeout)
+        conn.connect()
+        conn.sock.settimeout(self.read_timeout)
+        return conn, False
+
+    def _release(self, origin, conn):
+        with self._lock:
+            idle = self._pool.setdefault(origin, [])
+            if len(idle) < self.pool_size:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        """Closes every idle connection."""
+        with self._lock:
+            pools, self._pool = self._pool, {}
+        for idle in pools.values():
+            for conn in idle: conn.close()
+
+    # --- REQUESTS ---
+    def _delay(self, attempt):
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def get(self, url, headers=None):
+        """
+        GET a URL. Returns (status, headers, body). Retries 5xx responses,
+        timeouts and dropped sockets; raises NetworkDown once attempts run out.
+        """
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        origin = (scheme, parts.hostname, port)
+        path = parts.path or "/"
+        if parts.query: path += "?" + parts.query
+        request_headers = {"User-Agent": self.user_agent, "Connection": "keep-alive"}
+        if headers: request_headers.update(headers)
+
+        last_error = None
+        attempt, redial = 0, False
+        while attempt <= self.retries:
+            if attempt and not redial:
+                self.stats["retries"] += 1
+                time.sleep(self._delay(attempt - 1))
+            redial = False
+            self.stats["requests"] += 1
+            conn, reused = None, False
+            try:
+                conn, reused = self._acquire(origin)
+                conn.request("GET", path, headers=request_headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (socket.timeout, OSError, http.client.HTTPException) as e:
+                if conn: conn.close()
+                last_error = e
+                # A pooled socket the server already closed is not a failure: redial at once
+                redial = reused and not isinstance(e, socket.timeout)
+                if not redial: attempt += 1
+                continue
+            if response.will_close: conn.close()
+            else: self._release(origin, conn)
+            if response.status >= 500:
+                last_error = NetworkDown(f"HTTP {response.status}")
+                attempt += 1
+                continue
+            return response.status, dict(response.getheaders()), body
+        raise NetworkDown(str(last_error))
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter: refills `rate` tokens per second up to
+    `capacity`; acquire() waits until a token is available.
+    """
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        # A zero rate never refills and a capacity under one token never fills: either would hang acquire()
+        if not self.rate > 0: raise ValueError(f"token bucket rate must be positive (got {rate})")
+        if not self.capacity >= 1: raise ValueError(f"token bucket capacity must be at least 1 (got {capacity})")
+        self.tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._lock = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    async def acquire(self):
+        import asyncio
+        if self._lock is None: self._lock = asyncio.Lock()
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1.0:
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1.0
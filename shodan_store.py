@@ -0,0 +1,347 @@
+# shodan_store.py
+# THE STRATA: One storage interface for the Ark, the training memory and the canon,
+# kept either in the classic flat files or in a single indexed SQLite database.
+import argparse
+import csv
+import datetime
+import heapq
+import json
+import os
+import sqlite3
+import threading
+import shodan_core as core
+from shodan_ark import (FUZZY_LIMIT, FUZZY_THRESHOLD, ArkIndex, ArkVault, iter_ark, title_key, year_key,
+                        write_json, write_jsonl, write_vault)
+
+# --- CONFIGURATION ---
+STORE_BACKEND = os.getenv("SHODAN_STORE", "files")  # "files" or "sqlite"
+STORE_DB = os.getenv("SHODAN_DB", "shodan.sqlite3")
+BULK_ROWS = 1000  # Rows per executemany() batch
+SQLITE_SUFFIXES = (".sqlite3", ".sqlite", ".db")
+
+TRAINING_HEADER = ['timestamp', 'title', 'director', 'year', 'genre', 'weight']
+
+class Store:
+    """
+    The common interface. Both backends provide:
+      iter_artifacts()                 -> artifact dicts, in Ark order
+      write_artifacts(entries, meta)   -> replaces the Ark, returns the count
+    SQLiteStore also has patch_artifacts(entries, dropped, meta), which
+    rewrites only the given rows (incremental rebuilds).
+      load_index()                     -> lookup object with find/near/len
+      ranked(limit, min_weight)        -> heaviest artifacts first
+      has_training / add_training      -> the training memory
+      load_canon()                     -> merges stored canon rules into shodan_core
+    """
+    def log_training(self, title, director, year, genre, weight):
+        """Logs a training sample unless already present. Returns "SUCCESS" or "DUPLICATE"."""
+        if self.has_training(title, year):
+            return "DUPLICATE"
+        return "SUCCESS" if self.add_training(title, director, year, genre, weight) else "DUPLICATE"
+
+    def load_canon(self):
+        return 0
+
+    def close(self):
+        pass
+
+class TrainingLedger:
+    """
+    Dedup index over the training CSV. (title, year) keys are loaded once and
+    extended on each append; if the file changes underneath us (mtime/size
+    drift from an external edit) the index is rebuilt before the next check.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.keys = set()
+        self._stamp = None
+
+    def _fingerprint(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _rebuild(self, stamp):
+        keys = set()
+        if stamp is not None:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for row in csv.reader(f):
+                    # CSV Format: [timestamp, title, director, year, genre, weight]
+                    if len(row) > 3:
+                        keys.add((row[1].lower(), str(row[3])))
+        self.keys = keys
+        self._stamp = stamp
+
+    def sync(self):
+        """Rebuilds the index if the CSV was edited, created or deleted externally."""
+        stamp = self._fingerprint()
+        if stamp != self._stamp:
+            self._rebuild(stamp)
+        return stamp is not None
+
+    def __contains__(self, key):
+        title, year = key
+        return (title.lower(), str(year)) in self.keys
+
+    def append(self, title, director, year, genre, weight):
+        file_exists = self.sync()
+        with open(self.path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if not file_exists:
+                writer.writerow(TRAINING_HEADER)
+                self.keys.add(('title', 'year'))
+            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            writer.writerow([timestamp, title, director, year, genre, weight])
+        self.keys.add((title.lower(), str(year)))
+        self._stamp = self._fingerprint()
+
+class FileStore(Store):
+    """The flat files: an Ark file (.json / .jsonl / .ark vault) and the training CSV."""
+    def __init__(self, ark_path="canon.json", training_path="training_data.csv"):
+        self.ark_path = ark_path
+        self.training_path = training_path
+        self.ledger = TrainingLedger(training_path)
+
+    def iter_artifacts(self):
+        if os.path.exists(self.ark_path):
+            yield from iter_ark(self.ark_path)
+
+    def write_artifacts(self, entries, meta=None):
+        if self.ark_path.endswith(".ark"): return write_vault(entries, self.ark_path, meta)
+        if self.ark_path.endswith(".jsonl"): return write_jsonl(entries, self.ark_path, meta)
+        return write_json(entries, self.ark_path, meta)
+
+    def load_index(self):
+        """A .ark vault is memory-mapped (constant startup); JSON/JSONL is streamed into an ArkIndex."""
+        if not os.path.exists(self.ark_path): return ArkIndex()
+        if self.ark_path.endswith(".ark"): return ArkVault(self.ark_path)
+        return ArkIndex(iter_ark(self.ark_path))
+
+    def ranked(self, limit=10, min_weight=None):
+        weighted = (a for a in self.iter_artifacts()
+                    if isinstance(a.get('shodan_weight'), (int, float))
+                    and (min_weight is None or a['shodan_weight'] >= min_weight))
+        return heapq.nlargest(limit, weighted, key=lambda a: a['shodan_weight'])
+
+    def has_training(self, title, year):
+        self.ledger.sync()
+        return (title, year) in self.ledger
+
+    def add_training(self, title, director, year, genre, weight):
+        self.ledger.append(title, director, year, genre, weight)
+        return True
+
+class SQLiteStore(Store):
+    """
+    Everything in one SQLite database (WAL mode, so the uplink can read while
+    the Ark is rebuilt). Lookups, dedup checks and rankings are index probes.
+    """
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS artifacts ("
+        " seq INTEGER PRIMARY KEY, id TEXT, title_key TEXT NOT NULL, year_key TEXT NOT NULL,"
+        " weight REAL, body TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS artifacts_title ON artifacts (title_key, year_key)",
+        "CREATE INDEX IF NOT EXISTS artifacts_weight ON artifacts (weight)",
+        "CREATE INDEX IF NOT EXISTS artifacts_id ON artifacts (id)",
+        "CREATE TABLE IF NOT EXISTS training ("
+        " seq INTEGER PRIMARY KEY, logged TEXT, title TEXT, director TEXT, year TEXT, genre TEXT,"
+        " weight REAL, title_lower TEXT NOT NULL, UNIQUE (title_lower, year))",
+        "CREATE TABLE IF NOT EXISTS canon ("
+        " key TEXT PRIMARY KEY, kind TEXT NOT NULL, weight REAL, status TEXT, year TEXT, director TEXT)",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+    )
+
+    def __init__(self, path=STORE_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        with self._db:
+            for statement in self.SCHEMA:
+                self._db.execute(statement)
+            if not self._db.execute("SELECT 1 FROM canon LIMIT 1").fetchone():
+                self._seed_canon()
+
+    def _seed_canon(self):
+        """First open: the hardcoded canon becomes the stored canon rules."""
+        self._db.executemany(
+            "INSERT OR IGNORE INTO canon (key, kind, weight, year, director) VALUES (?, 'SACRED', ?, ?, ?)",
+            [(key, data["weight"], data.get("year"), data.get("director")) for key, data in core.SACRED_CANON.items()]
+        )
+        self._db.executemany(
+            "INSERT OR IGNORE INTO canon (key, kind, status) VALUES (?, 'APOCRYPHA', ?)",
+            list(core.APOCRYPHA.items())
+        )
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # --- THE ARK ---
+    def iter_artifacts(self):
+        with self._lock:
+            cursor = self._db.execute("SELECT body FROM artifacts ORDER BY seq")
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(BULK_ROWS)
+            if not rows: return
+            for (body,) in rows:
+                yield json.loads(body)
+
+    @staticmethod
+    def _artifact_row(entry):
+        weight = entry.get('shodan_weight')
+        return (title_key(entry.get('title')), year_key(entry.get('year')),
+                weight if isinstance(weight, (int, float)) else None, json.dumps(entry), entry.get('id'))
+
+    def _write_meta(self, meta, count):
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('ark', ?)",
+                         (json.dumps(dict(meta or {}, total_artifacts=count)),))
+
+    def write_artifacts(self, entries, meta=None):
+        """Replaces the Ark in one transaction; readers see the old Ark until commit."""
+        count = 0
+        def rows():
+            nonlocal count
+            for entry in entries:
+                yield self._artifact_row(entry)
+                count += 1
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM artifacts")
+            self._db.executemany(
+                "INSERT INTO artifacts (title_key, year_key, weight, body, id) VALUES (?, ?, ?, ?, ?)", rows())
+            self._write_meta(meta, count)
+        return count
+
+    def patch_artifacts(self, entries, dropped=(), meta=None):
+        """
+        Updates the Ark in place, in one transaction: each entry replaces the
+        row with its id (new ids are appended), then every id in `dropped` is
+        deleted. `dropped` is read only once `entries` is exhausted, so it may
+        be filled while they stream. Returns the artifact count.
+        """
+        with self._lock, self._db:
+            for entry in entries:
+                row = self._artifact_row(entry)
+                if not self._db.execute("UPDATE artifacts SET title_key = ?, year_key = ?, weight = ?, body = ?"
+                                        " WHERE id = ?", row).rowcount:
+                    self._db.execute("INSERT INTO artifacts (title_key, year_key, weight, body, id)"
+                                     " VALUES (?, ?, ?, ?, ?)", row)
+            self._db.executemany("DELETE FROM artifacts WHERE id = ?", ((ark_id,) for ark_id in dropped))
+            count = self._db.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0]
+            self._write_meta(meta, count)
+        return count
+
+    def load_index(self):
+        return SQLiteArk(self)
+
+    def ranked(self, limit=10, min_weight=None):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT body FROM artifacts WHERE weight IS NOT NULL AND weight >= ? ORDER BY weight DESC, seq LIMIT ?",
+                (min_weight if min_weight is not None else float("-inf"), limit)
+            ).fetchall()
+        return [json.loads(body) for (body,) in rows]
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    # --- THE MEMORY ---
+    def has_training(self, title, year):
+        return bool(self._query("SELECT 1 FROM training WHERE title_lower = ? AND year = ?",
+                                (title.lower(), str(year))))
+
+    def add_training(self, title, director, year, genre, weight):
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock, self._db:
+            cur = self._db.execute(
+                "INSERT OR IGNORE INTO training (logged, title, director, year, genre, weight, title_lower)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (timestamp, title, director, str(year), genre, weight, title.lower())
+            )
+        return cur.rowcount > 0
+
+    def import_training(self, path):
+        """Bulk-loads a training CSV (header optional). Returns the rows inserted."""
+        with open(path, 'r', encoding='utf-8') as f, self._lock, self._db:
+            before = self._db.total_changes
+            rows = (row for row in csv.reader(f) if len(row) > 5 and row != TRAINING_HEADER)
+            self._db.executemany(
+                "INSERT OR IGNORE INTO training (logged, title, director, year, genre, weight, title_lower)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((r[0], r[1], r[2], r[3], r[4], r[5], r[1].lower()) for r in rows)
+            )
+            return self._db.total_changes - before
+
+    # --- THE CANON ---
+    def load_canon(self):
+        """Registers every stored canon rule into shodan_core. Returns the count."""
+        rows = self._query("SELECT key, kind, weight, status, year, director FROM canon")
+        for key, kind, weight, status, year, director in rows:
+            if kind == "APOCRYPHA": core.register_apocrypha(key, status)
+            else: core.register_canon(key, weight, year, director)
+        return len(rows)
+
+class SQLiteArk:
+    """Lookup view over the artifacts table, with the same find/near interface as ArkIndex."""
+    def __init__(self, store):
+        self.store = store
+        self._fuzzy = None
+
+    def __len__(self):
+        return self.store._query("SELECT COUNT(*) FROM artifacts")[0][0]
+
+    def _fetch(self, sql, params):
+        rows = self.store._query(sql, params)
+        return json.loads(rows[0][0]) if rows else None
+
+    def find(self, title, year=None):
+        if year:
+            return self._fetch("SELECT body FROM artifacts WHERE title_key = ? AND year_key = ? ORDER BY seq LIMIT 1",
+                               (title_key(title), year_key(year)))
+        return self._fetch("SELECT body FROM artifacts WHERE title_key = ? ORDER BY seq LIMIT 1", (title_key(title),))
+
+    def warm(self):
+        """Builds the trigram index near() needs (otherwise built on its first call)."""
+        if self._fuzzy is None:
+            rows = self.store._query("SELECT seq, json_extract(body, '$.title'), json_extract(body, '$.year') FROM artifacts")
+            self._fuzzy = ArkIndex({"title": t, "year": y, "seq": seq} for seq, t, y in rows)
+
+    def near(self, title, year=None, threshold=FUZZY_THRESHOLD, limit=FUZZY_LIMIT):
+        """Ranked near-misses, as ArkIndex.near. The trigram index is built on first call."""
+        self.warm()
+        return [(score, self._fetch("SELECT body FROM artifacts WHERE seq = ?", (stub["seq"],)))
+                for score, stub in self._fuzzy.near(title, year, threshold, limit)]
+
+def open_ark(path):
+    """The store holding the Ark at `path`: SQLite for .sqlite3/.sqlite/.db, flat files otherwise."""
+    return SQLiteStore(path) if path.endswith(SQLITE_SUFFIXES) else FileStore(path)
+
+def open_store(ark_path="canon.json", training_path="training_data.csv", backend=None, db_path=None):
+    """The configured backend (SHODAN_STORE): flat files, or SQLite at SHODAN_DB."""
+    if (backend or STORE_BACKEND) == "sqlite":
+        return SQLiteStore(db_path or STORE_DB)
+    return FileStore(ark_path, training_path)
+
+def migrate(ark_path, training_path, db_path=STORE_DB):
+    """Copies the flat-file Ark and training CSV into the SQLite store. Returns (artifacts, samples)."""
+    store = SQLiteStore(db_path)
+    try:
+        artifacts = store.write_artifacts(iter_ark(ark_path)) if os.path.exists(ark_path) else 0
+        samples = store.import_training(training_path) if os.path.exists(training_path) else 0
+    finally:
+        store.close()
+    return artifacts, samples
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PROJECT SHODAN: migrate the flat files into the SQLite store")
+    parser.add_argument("--ark", default="canon.json")
+    parser.add_argument("--training", default="training_data.csv")
+    parser.add_argument("--db", default=STORE_DB)
+    args = parser.parse_args()
+    artifacts, samples = migrate(args.ark, args.training, args.db)
+    print(f"[SUCCESS] {artifacts} artifacts and {samples} training samples secured in '{args.db}'.")
@@ -0,0 +1,106 @@
+# shodan_trace.py
+# THE STOPWATCH: Per-stage timing spans aggregated into latency histograms.
+import json
+import math
+import os
+import threading
+import time
+
+# --- CONFIGURATION ---
+BUCKETS_PER_DOUBLING = 8   # Bucket width ~9%: percentiles are accurate to within that
+MIN_SECONDS = 1e-7         # Everything faster lands in bucket 0
+
+class Histogram:
+    """
+    Log-bucketed latency histogram: constant memory however many samples,
+    percentiles read off the cumulative bucket counts (clamped to the exact
+    min / max seen).
+    """
+    __slots__ = ("buckets", "count", "total", "low", "high")
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.low = math.inf
+        self.high = 0.0
+
+    def add(self, seconds):
+        index = 0 if seconds <= MIN_SECONDS else int(math.log2(seconds / MIN_SECONDS) * BUCKETS_PER_DOUBLING) + 1
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.low: self.low = seconds
+        if seconds > self.high: self.high = seconds
+
+    def percentile(self, p):
+        """The p-th percentile (0-100) in seconds: the geometric middle of the bucket holding it."""
+        if not self.count: return None
+        rank = max(1, math.ceil(self.count * p / 100.0))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank: break
+        if index == 0: return self.low
+        middle = MIN_SECONDS * 2 ** ((index - 0.5) / BUCKETS_PER_DOUBLING)
+        return min(max(middle, self.low), self.high)
+
+    def summary(self):
+        ms = lambda s: round(s * 1000, 3) if s is not None else None
+        return {"count": self.count, "total_ms": ms(self.total), "mean_ms": ms(self.total / self.count if self.count else None),
+                "p50_ms": ms(self.percentile(50)), "p95_ms": ms(self.percentile(95)), "p99_ms": ms(self.percentile(99)),
+                "min_ms": ms(self.low if self.count else None), "max_ms": ms(self.high if self.count else None)}
+
+class _Span:
+    __slots__ = ("tracer", "stage", "started")
+
+    def __init__(self, tracer, stage):
+        self.tracer = tracer
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.stage, time.perf_counter() - self.started)
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class Tracer:
+    """
+    Collects spans per stage. While disabled, span() hands back one shared
+    no-op context manager, so an instrumented line costs a method call.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.stages = {}   # stage -> Histogram, in first-seen order
+        self._lock = threading.Lock()
+
+    def span(self, stage):
+        return _Span(self, stage) if self.enabled else _NULL_SPAN
+
+    def record(self, stage, seconds):
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None: histogram = self.stages[stage] = Histogram()
+            histogram.add(seconds)
+
+    def summary(self):
+        with self._lock:
+            return {stage: histogram.summary() for stage, histogram in self.stages.items()}
+
+    def dump(self, path):
+        """Writes the per-stage summary as JSON."""
+        with open(path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump({"generated": time.strftime("%Y-%m-%d %H:%M:%S"), "stages": self.summary()}, f, indent=2)
+        os.replace(path + ".tmp", path)
@@ -1,227 +1,564 @@
-import json
-import urllib.request
-import urllib.parse
-import os
-import sys
-import csv
-import datetime
-import shodan_core as core
-
-# --- CONFIGURATION ---
-API_KEY = os.getenv("OMDB_API_KEY")
-CANON_FILE = "canon.json"
-TRAINING_FILE = "training_data.csv"
-
-# ANSI Colors
-C_RESET  = "\033[0m"
-C_RED    = "\033[31m"
-C_GREEN  = "\033[32m"
-C_CYAN   = "\033[36m"
-C_YELLOW = "\033[33m"
-C_MAGENTA = "\033[35m" 
-C_GREY   = "\033[90m"
-
-def log(tag, message, color=C_RESET):
-    print(f"{color}[{tag}] {message}{C_RESET}")
-
-def fetch_movie_data(title, year=None, type_=None):
-    if not API_KEY: return None
-    base_url = "http://www.omdbapi.com/?"
-    
-    # [THE LOGOS] Construct Query
-    query_params = {'t': title, 'apikey': API_KEY}
-    if year: query_params['y'] = year
-    if type_: query_params['type'] = type_
-        
-    params = urllib.parse.urlencode(query_params)
-    try:
-        with urllib.request.urlopen(base_url + params) as r:
-            data = json.loads(r.read().decode())
-            return data if data.get('Response') == 'True' else None
-    except: return None
-
-def load_local_ark():
-    if os.path.exists(CANON_FILE):
-        try:
-            with open(CANON_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f).get('canon', [])
-        except: return []
-    return []
-
-def log_training_data(title, director, year, genre, weight):
-    """
-    Logs data to CSV only if it is not already present.
-    Returns: "SUCCESS", "DUPLICATE", or "ERROR"
-    """
-    file_exists = os.path.exists(TRAINING_FILE)
-    
-    # 1. READ CHECK (The Recall)
-    if file_exists:
-        try:
-            with open(TRAINING_FILE, 'r', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    # CSV Format: [timestamp, title, director, year, genre, weight]
-                    # We check if Title and Year match to avoid duplicates
-                    if len(row) > 3:
-                        existing_title = row[1]
-                        existing_year = row[3]
-                        if existing_title.lower() == title.lower() and str(existing_year) == str(year):
-                            return "DUPLICATE"
-        except Exception: 
-            return "ERROR"
-
-    # 2. WRITE ACTION (The Inscription)
-    try:
-        with open(TRAINING_FILE, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            if not file_exists:
-                writer.writerow(['timestamp', 'title', 'director', 'year', 'genre', 'weight'])
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            writer.writerow([timestamp, title, director, year, genre, weight])
-            return "SUCCESS"
-    except Exception: 
-        return "ERROR"
-
-def parse_query(raw_input):
-    """
-    Parses 'Title :: Year :: Type' syntax.
-    Returns (title, year, type)
-    """
-    parts = raw_input.split("::")
-    title = parts[0].strip()
-    year = None
-    media_type = None
-
-    # Analyze additional segments
-    for part in parts[1:]:
-        clean_part = part.strip().lower()
-        if clean_part.isdigit():
-            year = clean_part
-        elif clean_part in ['movie', 'series', 'episode']:
-            media_type = clean_part
-            
-    return title, year, media_type
-
-def main():
-    online_mode = False
-    print("-" * 60)
-    if API_KEY:
-        log("SYSTEM", "SHODAN UPLINK: CONNECTED TO OMDb", C_GREEN)
-        online_mode = True
-    else:
-        log("SYSTEM", "SHODAN UPLINK: OFFLINE MODE", C_RED)
-    
-    canon = load_local_ark()
-    log("STATUS", f"Local Ark Loaded: {len(canon)} Artifacts", C_CYAN)
-    print("-" * 60)
-    
-    while True:
-        try:
-            raw_input = input(f"{C_CYAN}>> SEARCH GLOBAL DATABASE: {C_RESET}").strip()
-        except KeyboardInterrupt:
-            print("\n"); log("SYSTEM", "DISCONNECTING...", C_RED); break
-
-        if raw_input.lower() in ['exit', 'quit']: break
-        if not raw_input: continue
-
-        # [SEMANTIC PARSING]
-        query_title, query_year, query_type = parse_query(raw_input)
-        
-        if query_year or query_type:
-            log("SYSTEM", f"MANUAL OVERRIDE DETECTED. YEAR: {query_year} | TYPE: {query_type}", C_YELLOW)
-
-        # 1. ATTEMPT UPLINK
-        data = None
-        if online_mode:
-            search_year = query_year 
-
-            # [PRE-COGNITION] Sacred Override (Only if no manual year set)
-            if not search_year:
-                sacred_data = core.get_sacred_data(query_title)
-                if sacred_data and "year" in sacred_data:
-                    search_year = sacred_data["year"]
-                    log("SYSTEM", f"SACRED OVERRIDE ENGAGED. TARGETING YEAR: {search_year}", C_YELLOW)
-            
-            # Execute Interrogation
-            data = fetch_movie_data(query_title, search_year, query_type)
-
-        # 2. PROCESS SIGNAL
-        if data:
-            title = data.get('Title')
-            director = data.get('Director', 'N/A')
-            writer = data.get('Writer', 'N/A')
-            actors = data.get('Actors', 'N/A')
-            raw_year = data.get('Year', '0000')
-            year = raw_year[:4] if len(raw_year) >= 4 else raw_year
-            country = data.get('Country')
-            genre = data.get('Genre')
-            plot = data.get('Plot', 'N/A')
-            awards = data.get('Awards', 'N/A')
-            m_type = data.get('Type', 'N/A')
-            
-            # [DISPLAY THE TABLE]
-            print(f"\n{C_GREEN}/// DATA RETRIEVED ({m_type.upper()}) ///{C_RESET}")
-            print(f"   TITLE:    {title}")
-            print(f"   YEAR:     {year}")
-            print(f"   CREATOR:  {director}")
-            print(f"   WRITER:   {writer}")
-            print(f"   ACTORS:   {actors}")
-            print(f"   GENRE:    {genre}")
-            print(f"   AWARDS:   {awards}")
-            print(f"   PLOT:     {C_GREY}{plot}{C_RESET}")
-            
-            # [THE LOGOS] Check Status
-            canon_check = core.check_sacred_canon(title, year, director)
-            
-            if canon_check and canon_check[0] == "APOCRYPHA":
-                print(f"   STATUS:   {C_MAGENTA}/// {canon_check[1]} ///{C_RESET}")
-                print(f"   NOTE:     Object exists in the Simulacrum but not the Ark.")
-                
-            else:
-                weight = core.calculate_shodan_weight(
-                    title, director, year, country, "Digital", genre, plot, actors, awards
-                )
-                
-                if canon_check and canon_check[0] == "SACRED":
-                    print(f"   STATUS:   {C_CYAN}SACRED TEXT (METADATA MERGED){C_RESET}")
-                
-                w_color = C_GREEN if weight > 8.0 else (C_YELLOW if weight > 5.0 else C_RED)
-                print(f"   WEIGHT:   {w_color}{weight} / 10.0{C_RESET}")
-                
-                # [THE MEMORY] Check for Duplicates
-                if weight >= 8.0:
-                    status = log_training_data(title, director, year, genre, weight)
-                    if status == "SUCCESS":
-                        log("MEMORY", "ARTIFACT SAVED TO TRAINING DATA.", C_GREEN)
-                    elif status == "DUPLICATE":
-                        log("MEMORY", "ARTIFACT ALREADY IN TRAINING DATA. SKIPPING.", C_YELLOW)
-                    else:
-                        log("ERROR", "MEMORY WRITE FAILED.", C_RED)
-                
-                if any(x['title'] == title for x in canon):
-                    log("STATUS", "ARTIFACT ALREADY SECURED IN ARK.", C_GREEN)
-                else:
-                    if weight > 8.0: log("VERDICT", "HIGH RESONANCE. ACQUIRE.", C_GREEN)
-                    elif weight < 5.0: log("VERDICT", "LOW SIGNAL. IGNORE.", C_RED)
-
-        else:
-            # Fallback
-            canon_check = core.check_sacred_canon(query_title)
-            if canon_check:
-                if canon_check[0] == "APOCRYPHA":
-                    print(f"\n{C_MAGENTA}/// APOCRYPHA IDENTIFIED ///{C_RESET}")
-                    print(f"   TITLE:    {query_title.title()}")
-                    print(f"   STATUS:   {canon_check[1]}")
-                else:
-                    print(f"\n{C_GREEN}/// SACRED TEXT IDENTIFIED (OFFLINE) ///{C_RESET}")
-                    print(f"   TITLE:    {query_title.title()}")
-                    print(f"   STATUS:   HARDCODED")
-                    print(f"   WEIGHT:   {C_GREEN}{canon_check[1]} / 10.0{C_RESET}")
-            elif online_mode:
-                log("ERROR", "Artifact not found in Global Database.", C_RED)
-            else:
-                log("ERROR", "Uplink Down.", C_RED)
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+import time
+_BOOT = time.perf_counter()  # --startup-profile measures from here
+import argparse
+import json
+import urllib.parse
+import os
+import sys
+import threading
+import shodan_core as core
+from shodan_cache import ResponseCache, cache_key, MISS
+from shodan_trace import Tracer
+# Deferred until first use (keeps the prompt fast): asyncio (batch mode),
+# shodan_net (first network lookup), shodan_store / shodan_ark (the Ark loader thread)
+STARTUP = {"imports": time.perf_counter() - _BOOT}  # Stage -> seconds (--startup-profile)
+
+# --- CONFIGURATION ---
+API_KEY = os.getenv("OMDB_API_KEY")
+OMDB_URL = os.getenv("OMDB_URL", "http://www.omdbapi.com/")
+# The binary vault (generate_ark.py --format ark) is preferred: it is mapped, not parsed
+CANON_FILE = os.getenv("SHODAN_ARK_FILE") or ("canon.ark" if os.path.exists("canon.ark") else "canon.json")
+TRAINING_FILE = "training_data.csv"
+BATCH_CONCURRENCY = int(os.getenv("SHODAN_BATCH_CONCURRENCY", 8))
+BATCH_RATE = float(os.getenv("SHODAN_BATCH_RATE", 5.0))  # OMDb requests per second
+ARK_WAIT = float(os.getenv("SHODAN_ARK_WAIT", 30.0))  # Seconds a lookup waits on the background loader
+TRACE_FILE = os.getenv("SHODAN_TRACE_FILE", "shodan_trace.json")
+PSTATS_FILE = "shodan_uplink.pstats"
+
+# Per-stage timing spans (--trace or SHODAN_TRACE=1); a shared no-op while disabled
+TRACER = Tracer(enabled=os.getenv("SHODAN_TRACE") == "1")
+
+# ANSI Colors
+C_RESET  = "\033[0m"
+C_RED    = "\033[31m"
+C_GREEN  = "\033[32m"
+C_CYAN   = "\033[36m"
+C_YELLOW = "\033[33m"
+C_MAGENTA = "\033[35m" 
+C_GREY   = "\033[90m"
+
+def log(tag, message, color=C_RESET):
+    print(f"{color}[{tag}] {message}{C_RESET}")
+
+# Interrogation verdicts
+FOUND = "FOUND"
+NOT_FOUND = "NOT_FOUND"
+RATE_LIMITED = "RATE_LIMITED"
+NETWORK_DOWN = "NETWORK_DOWN"
+API_ERROR = "API_ERROR"
+
+_CACHE = None
+_CLIENT = None
+
+def get_cache():
+    """The shared on-disk OMDb response cache (opened on first use)."""
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = ResponseCache()
+    return _CACHE
+
+def get_client():
+    """The shared keep-alive HTTP client for the OMDb uplink."""
+    global _CLIENT
+    if _CLIENT is None:
+        from shodan_net import HttpClient
+        _CLIENT = HttpClient()
+    return _CLIENT
+
+def recall(title, year=None, type_=None):
+    """Cache-only lookup. Returns (verdict, data) or None on a miss."""
+    # [THE RECALL] OFFLINE MODE accepts stale entries
+    with TRACER.span("recall_cache"):
+        cached = get_cache().get(cache_key(title, year, type_), allow_stale=not API_KEY)
+    if cached is MISS: return None
+    return (FOUND, cached) if cached else (NOT_FOUND, None)
+
+def uplink(title, year=None, type_=None):
+    """Network-only lookup against OMDb; records the outcome in the cache."""
+    if not API_KEY: return NETWORK_DOWN, None
+    
+    # [THE LOGOS] Construct Query
+    query_params = {'t': title, 'apikey': API_KEY}
+    if year: query_params['y'] = year
+    if type_: query_params['type'] = type_
+        
+    params = urllib.parse.urlencode(query_params)
+    from shodan_net import NetworkDown
+    try:
+        with TRACER.span("omdb_round_trip"):
+            status, _, body = get_client().get(OMDB_URL + "?" + params)
+    except NetworkDown:
+        return NETWORK_DOWN, None
+    try:
+        with TRACER.span("json_decode"):
+            data = json.loads(body.decode())
+    except ValueError:
+        return (RATE_LIMITED if status == 429 else API_ERROR), None
+
+    key = cache_key(title, year, type_)
+    if data.get('Response') == 'True':
+        get_cache().put(key, data)
+        return FOUND, data
+    error = str(data.get('Error', '')).lower()
+    if status == 429 or "limit" in error:
+        return RATE_LIMITED, None
+    # Negative cache only a genuine "not found" (not quota or key errors)
+    if "not found" in error:
+        get_cache().put(key, None)
+        return NOT_FOUND, None
+    return API_ERROR, None
+
+def interrogate(title, year=None, type_=None):
+    """
+    Resolves a query against the Recall cache, then OMDb.
+    Returns (verdict, data): FOUND with the payload, or NOT_FOUND /
+    RATE_LIMITED / NETWORK_DOWN / API_ERROR with None.
+    """
+    return recall(title, year, type_) or uplink(title, year, type_)
+
+def fetch_movie_data(title, year=None, type_=None):
+    verdict, data = interrogate(title, year, type_)
+    return data if verdict == FOUND else None
+
+ARK_INDEX = None
+_ARK_READY = threading.Event()  # Exact lookups available
+_ARK_WARM = threading.Event()   # Near-miss index built too (stays clear if warm-up failed)
+_ARK_LOADER = None
+
+_STORE = None
+
+def get_store():
+    """
+    The shared storage backend (SHODAN_STORE=files|sqlite), rebound if
+    CANON_FILE / TRAINING_FILE are repointed. Stored canon rules are merged on open.
+    """
+    global _STORE
+    if _STORE is None or (getattr(_STORE, "ark_path", CANON_FILE), getattr(_STORE, "training_path", TRAINING_FILE)) \
+            != (CANON_FILE, TRAINING_FILE):
+        from shodan_store import open_store
+        _STORE = open_store(CANON_FILE, TRAINING_FILE)
+        _STORE.load_canon()
+    return _STORE
+
+def load_local_ark():
+    """
+    Points ARK_INDEX at the Ark and returns it (find / near / len). A .ark
+    vault is memory-mapped and SQLite is queried in place; JSON/JSONL is
+    streamed into an ArkIndex.
+    """
+    global ARK_INDEX
+    try:
+        ARK_INDEX = get_store().load_index()
+    except Exception as e:
+        from shodan_ark import ArkIndex
+        log("WARNING", f"ARK UNREADABLE ({e})", C_RED)
+        ARK_INDEX = ArkIndex()
+    return ARK_INDEX
+
+def _load_ark_stages():
+    """
+    Loader stages. Whatever fails, the Ark ends up ready (empty if unreadable).
+    A failed warm-up keeps the loaded index: near() then indexes on first use.
+    """
+    global ARK_INDEX
+    started = time.perf_counter()
+    try:
+        load_local_ark()
+    except Exception as e:
+        from shodan_ark import ArkIndex
+        log("WARNING", f"ARK UNREADABLE ({e})", C_RED)
+        ARK_INDEX = ArkIndex()
+    finally:
+        STARTUP["ark_load"] = time.perf_counter() - started
+        _ARK_READY.set()
+    loaded = time.perf_counter()
+    try:
+        # Vault / SQLite indexes build their near-miss trigrams lazily: do it now, off the prompt
+        ARK_INDEX.warm()
+        _ARK_WARM.set()
+    except Exception as e:
+        log("WARNING", f"ARK WARM-UP FAILED ({e}). NEAR-MISSES WILL INDEX ON FIRST USE.", C_RED)
+    finally:
+        STARTUP["index_build"] = time.perf_counter() - loaded
+        STARTUP["ark_ready"] = time.perf_counter() - _BOOT
+
+def start_ark_loader():
+    """Loads the Ark (and its indexes) in a background thread; the prompt does not wait."""
+    global _ARK_LOADER
+    if _ARK_LOADER is None and not _ARK_READY.is_set():
+        _ARK_LOADER = threading.Thread(target=_load_ark_stages, name="ark-loader", daemon=True)
+        _ARK_LOADER.start()
+    return _ARK_LOADER
+
+def get_ark(warm=False):
+    """
+    The Ark index, loaded on first use (waits for the background loader if
+    it is running). warm=True also waits for the near-miss index.
+    """
+    ready = _ARK_WARM if warm else _ARK_READY
+    if not ready.is_set():
+        if _ARK_LOADER is None:
+            if not _ARK_READY.is_set(): _load_ark_stages()
+        else:
+            # The loader exits right after its warm-up, failed or not, so warm callers wait on the thread
+            if warm: _ARK_LOADER.join(ARK_WAIT)
+            else: _ARK_READY.wait(ARK_WAIT)
+            if not _ARK_READY.is_set() or _ARK_LOADER.is_alive() and warm:
+                log("WARNING", f"ARK STILL LOADING AFTER {ARK_WAIT:.0f}s. PROCEEDING WITHOUT IT.", C_RED)
+                if ARK_INDEX is None:
+                    from shodan_ark import ArkIndex
+                    return ArkIndex()
+    return ARK_INDEX
+
+def log_training_data(title, director, year, genre, weight):
+    """
+    Logs data to the training memory only if it is not already present.
+    Returns: "SUCCESS", "DUPLICATE", or "ERROR"
+    """
+    # Dedup is an index probe on either backend (the CSV ledger is rebuilt only after external edits)
+    try:
+        return get_store().log_training(title, director, year, genre, weight)
+    except Exception:
+        return "ERROR"
+
+def parse_query(raw_input):
+    """
+    Parses 'Title :: Year :: Type' syntax.
+    Returns (title, year, type)
+    """
+    parts = raw_input.split("::")
+    title = parts[0].strip()
+    year = None
+    media_type = None
+
+    # Analyze additional segments
+    for part in parts[1:]:
+        clean_part = part.strip().lower()
+        if clean_part.isdigit():
+            year = clean_part
+        elif clean_part in ['movie', 'series', 'episode']:
+            media_type = clean_part
+            
+    return title, year, media_type
+
+def print_startup_profile():
+    """Prints the startup stage timings (waits for the Ark so every stage is measured)."""
+    get_ark(warm=True)
+    stages = [("imports", "import"), ("prompt_ready", "first prompt"), ("ark_load", "ark load"),
+              ("index_build", "index build"), ("ark_ready", "ark ready")]
+    for key, label in stages:
+        log("PROFILE", f"{label.upper():<13} {STARTUP.get(key, 0.0) * 1000:8.1f} ms", C_GREY)
+    log("PROFILE", f"ARK SIZE      {len(ARK_INDEX):8d} artifacts", C_GREY)
+
+def print_trace_stats():
+    """The `stats` command: per-stage latency percentiles for this session."""
+    if not TRACER.enabled:
+        log("TRACE", "INSTRUMENTATION DISABLED. RESTART WITH --trace (OR SHODAN_TRACE=1).", C_GREY)
+        return
+    summary = TRACER.summary()
+    if not summary:
+        log("TRACE", "NO QUERIES TIMED YET.", C_GREY)
+        return
+    print(f"{C_GREY}   {'STAGE':<17}{'COUNT':>6}{'P50 ms':>10}{'P95 ms':>10}{'P99 ms':>10}{'MAX ms':>10}")
+    for stage, s in summary.items():
+        print(f"   {stage:<17}{s['count']:>6}{s['p50_ms']:>10.3f}{s['p95_ms']:>10.3f}{s['p99_ms']:>10.3f}{s['max_ms']:>10.3f}")
+    print(C_RESET, end="")
+
+def main(profile=False):
+    print("-" * 60)
+    if API_KEY:
+        log("SYSTEM", "SHODAN UPLINK: CONNECTED TO OMDb", C_GREEN)
+    else:
+        log("SYSTEM", "SHODAN UPLINK: OFFLINE MODE", C_RED)
+    
+    start_ark_loader()
+    if _ARK_READY.is_set():
+        log("STATUS", f"Local Ark Loaded: {len(ARK_INDEX)} Artifacts", C_CYAN)
+    else:
+        log("STATUS", "Local Ark: LOADING IN BACKGROUND", C_CYAN)
+    log("STATUS", f"Recall Cache: {len(get_cache())} Signals", C_CYAN)
+    print("-" * 60)
+    STARTUP["prompt_ready"] = time.perf_counter() - _BOOT
+    if profile:
+        print_startup_profile()
+        return
+    
+    while True:
+        try:
+            raw_input = input(f"{C_CYAN}>> SEARCH GLOBAL DATABASE: {C_RESET}").strip()
+        except (KeyboardInterrupt, EOFError):
+            print("\n"); log("SYSTEM", "DISCONNECTING...", C_RED); break
+
+        if raw_input.lower() in ['exit', 'quit']: break
+        if not raw_input: continue
+        if raw_input.lower() == 'stats':
+            print_trace_stats()
+            continue
+        query_started = time.perf_counter()
+
+        # [SEMANTIC PARSING]
+        with TRACER.span("parse"):
+            query_title, query_year, query_type = parse_query(raw_input)
+        
+        if query_year or query_type:
+            log("SYSTEM", f"MANUAL OVERRIDE DETECTED. YEAR: {query_year} | TYPE: {query_type}", C_YELLOW)
+
+        # 1. ATTEMPT UPLINK (OFFLINE MODE still consults the Recall cache)
+        search_year = query_year 
+
+        # [PRE-COGNITION] Sacred Override (Only if no manual year set)
+        if not search_year:
+            with TRACER.span("sacred_override"):
+                sacred_data = core.get_sacred_data(query_title)
+            if sacred_data and "year" in sacred_data:
+                search_year = sacred_data["year"]
+                log("SYSTEM", f"SACRED OVERRIDE ENGAGED. TARGETING YEAR: {search_year}", C_YELLOW)
+        
+        # Execute Interrogation
+        with TRACER.span("interrogate"):
+            verdict, data = interrogate(query_title, search_year, query_type)
+
+        # 2. PROCESS SIGNAL
+        if data:
+            title = data.get('Title')
+            director = data.get('Director', 'N/A')
+            writer = data.get('Writer', 'N/A')
+            actors = data.get('Actors', 'N/A')
+            raw_year = data.get('Year', '0000')
+            year = raw_year[:4] if len(raw_year) >= 4 else raw_year
+            country = data.get('Country')
+            genre = data.get('Genre')
+            plot = data.get('Plot', 'N/A')
+            awards = data.get('Awards', 'N/A')
+            m_type = data.get('Type', 'N/A')
+            
+            # [DISPLAY THE TABLE]
+            print(f"\n{C_GREEN}/// DATA RETRIEVED ({m_type.upper()}) ///{C_RESET}")
+            print(f"   TITLE:    {title}")
+            print(f"   YEAR:     {year}")
+            print(f"   CREATOR:  {director}")
+            print(f"   WRITER:   {writer}")
+            print(f"   ACTORS:   {actors}")
+            print(f"   GENRE:    {genre}")
+            print(f"   AWARDS:   {awards}")
+            print(f"   PLOT:     {C_GREY}{plot}{C_RESET}")
+            
+            # [THE LOGOS] Check Status
+            with TRACER.span("canon_check"):
+                canon_check = core.check_sacred_canon(title, year, director)
+            
+            if canon_check and canon_check[0] == "APOCRYPHA":
+                print(f"   STATUS:   {C_MAGENTA}/// {canon_check[1]} ///{C_RESET}")
+                print(f"   NOTE:     Object exists in the Simulacrum but not the Ark.")
+                
+            else:
+                with TRACER.span("scoring"):
+                    weight = core.calculate_shodan_weight(
+                        title, director, year, country, "Digital", genre, plot, actors, awards
+                    )
+                
+                if canon_check and canon_check[0] == "SACRED":
+                    print(f"   STATUS:   {C_CYAN}SACRED TEXT (METADATA MERGED){C_RESET}")
+                
+                w_color = C_GREEN if weight > 8.0 else (C_YELLOW if weight > 5.0 else C_RED)
+                print(f"   WEIGHT:   {w_color}{weight} / 10.0{C_RESET}")
+                
+                # [THE MEMORY] Check for Duplicates
+                if weight >= 8.0:
+                    with TRACER.span("training_dedup"):
+                        status = log_training_data(title, director, year, genre, weight)
+                    if status == "SUCCESS":
+                        log("MEMORY", "ARTIFACT SAVED TO TRAINING DATA.", C_GREEN)
+                    elif status == "DUPLICATE":
+                        log("MEMORY", "ARTIFACT ALREADY IN TRAINING DATA. SKIPPING.", C_YELLOW)
+                    else:
+                        log("ERROR", "MEMORY WRITE FAILED.", C_RED)
+                
+                with TRACER.span("ark_find"):
+                    secured = get_ark().find(title, year)
+                if secured:
+                    log("STATUS", "ARTIFACT ALREADY SECURED IN ARK.", C_GREEN)
+                else:
+                    with TRACER.span("ark_near"):
+                        nearby = get_ark(warm=True).near(title, year, limit=3)
+                    for score, near in nearby:
+                        log("ARK", f"NEAR MATCH ({score:.2f}): {near.get('title')} [{near.get('year')}]", C_GREY)
+                    if weight > 8.0: log("VERDICT", "HIGH RESONANCE. ACQUIRE.", C_GREEN)
+                    elif weight < 5.0: log("VERDICT", "LOW SIGNAL. IGNORE.", C_RED)
+
+        else:
+            # Fallback
+            with TRACER.span("canon_check"):
+                canon_check = core.check_sacred_canon(query_title)
+            if canon_check:
+                if canon_check[0] == "APOCRYPHA":
+                    print(f"\n{C_MAGENTA}/// APOCRYPHA IDENTIFIED ///{C_RESET}")
+                    print(f"   TITLE:    {query_title.title()}")
+                    print(f"   STATUS:   {canon_check[1]}")
+                else:
+                    print(f"\n{C_GREEN}/// SACRED TEXT IDENTIFIED (OFFLINE) ///{C_RESET}")
+                    print(f"   TITLE:    {query_title.title()}")
+                    print(f"   STATUS:   HARDCODED")
+                    print(f"   WEIGHT:   {C_GREEN}{canon_check[1]} / 10.0{C_RESET}")
+            elif verdict == NOT_FOUND:
+                log("ERROR", "Artifact not found in Global Database.", C_RED)
+            elif verdict == RATE_LIMITED:
+                log("ERROR", "Uplink Throttled. OMDb quota exhausted.", C_RED)
+            elif verdict == API_ERROR:
+                log("ERROR", "Uplink Rejected the Query (check OMDB_API_KEY).", C_RED)
+            else:
+                log("ERROR", "Uplink Down.", C_RED)
+        if TRACER.enabled: TRACER.record("query_total", time.perf_counter() - query_started)
+
+    stats = get_cache().stats
+    log("CACHE", f"HITS: {stats['hits']} | NEGATIVE: {stats['negative_hits']} | STALE: {stats['stale_hits']} | MISSES: {stats['misses']}", C_GREY)
+    if TRACER.enabled and TRACER.stages:
+        TRACER.dump(TRACE_FILE)
+        log("TRACE", f"STAGE TIMINGS WRITTEN TO '{TRACE_FILE}'", C_GREY)
+
+# --- BATCH MODE (non-interactive, JSON Lines out) ---
+def resolve_target(query_title, query_year):
+    """Applies the Sacred Override: canon entries pin their year when none was given."""
+    if not query_year:
+        sacred_data = core.get_sacred_data(query_title)
+        if sacred_data and "year" in sacred_data:
+            return sacred_data["year"]
+    return query_year
+
+def assess(raw_query, verdict, data):
+    """Builds the JSON record for one batch query: metadata, weight and canon status."""
+    query_title, query_year, query_type = parse_query(raw_query)
+    record = {"query": raw_query, "verdict": verdict}
+    if data:
+        raw_year = data.get('Year', '0000')
+        year = raw_year[:4] if len(raw_year) >= 4 else raw_year
+        record.update({
+            "title": data.get('Title'), "year": year, "type": data.get('Type'),
+            "director": data.get('Director', 'N/A'), "genre": data.get('Genre'),
+            "imdb_id": data.get('imdbID'),
+        })
+        canon_check = core.check_sacred_canon(record["title"], year, record["director"])
+        if canon_check and canon_check[0] == "APOCRYPHA":
+            record.update({"canon": "APOCRYPHA", "canon_note": canon_check[1], "weight": None})
+        else:
+            record["canon"] = canon_check[0] if canon_check else None
+            record["weight"] = core.calculate_shodan_weight(
+                record["title"], record["director"], year, data.get('Country') or "", "Digital",
+                data.get('Genre') or "", data.get('Plot') or "", data.get('Actors') or "", data.get('Awards') or ""
+            )
+    else:
+        # Fallback: the hardcoded canon still answers without metadata
+        canon_check = core.check_sacred_canon(query_title)
+        record.update({"title": query_title, "year": query_year, "type": query_type})
+        record["canon"] = canon_check[0] if canon_check else None
+        if canon_check and canon_check[0] == "APOCRYPHA":
+            record.update({"canon_note": canon_check[1], "weight": None})
+        else:
+            record["weight"] = canon_check[1] if canon_check else None
+    return record
+
+async def run_batch(lines, out=sys.stdout, concurrency=BATCH_CONCURRENCY, rate=BATCH_RATE, burst=None):
+    """
+    Resolves 'Title :: Year :: Type' lines concurrently. Cache hits skip the
+    rate limiter; network lookups wait on a token bucket. Identical queries
+    in flight at once share one lookup. Each record is written as one JSON
+    line the moment it completes. Returns verdict counts.
+    """
+    import asyncio
+    from shodan_net import HttpClient, TokenBucket
+    global _CLIENT
+    if _CLIENT is None: _CLIENT = HttpClient(pool_size=concurrency)
+    bucket = TokenBucket(rate, burst if burst is not None else concurrency)
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    counts = {}
+    in_flight = {}  # cache key -> the lookup task every duplicate awaits
+
+    async def lookup(title, year, type_):
+        result = await asyncio.to_thread(recall, title, year, type_)
+        if result is None:
+            await bucket.acquire()
+            result = await asyncio.to_thread(uplink, title, year, type_)
+        return result
+
+    async def worker():
+        while True:
+            raw_query = await queue.get()
+            if raw_query is None: return
+            try:
+                query_title, query_year, query_type = parse_query(raw_query)
+                target_year = resolve_target(query_title, query_year)
+                key = cache_key(query_title, target_year, query_type)
+                task = in_flight.get(key)
+                if task is None:
+                    task = in_flight[key] = asyncio.create_task(lookup(query_title, target_year, query_type))
+                    task.add_done_callback(lambda _, key=key: in_flight.pop(key, None))
+                result = await asyncio.shield(task)
+                record = assess(raw_query, *result)
+            except Exception as e:
+                # One malformed signal must not sink the batch
+                record = {"query": raw_query, "verdict": "ERROR", "error": str(e)}
+            counts[record["verdict"]] = counts.get(record["verdict"], 0) + 1
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+
+    async def produce():
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"): continue
+            await queue.put(line)
+        for _ in range(concurrency): await queue.put(None)
+
+    tasks = [asyncio.create_task(produce())] + [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks: task.cancel()
+    return counts
+
+def run_cli(argv=None):
+    parser = argparse.ArgumentParser(description="PROJECT SHODAN // OMNI-DATABASE UPLINK")
+    parser.add_argument("--batch", metavar="QUERIES", help="file of 'Title :: Year :: Type' lines ('-' for stdin); streams JSON Lines to stdout")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="max in-flight lookups (batch mode)")
+    parser.add_argument("--rate", type=float, default=BATCH_RATE, help="max OMDb requests per second (batch mode)")
+    parser.add_argument("--burst", type=int, default=None, help="token bucket capacity (default: concurrency)")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="report import / ark load / index build / time-to-prompt and exit")
+    parser.add_argument("--trace", action="store_true",
+                        help=f"time each query stage (p50/p95/p99 via the `stats` command; JSON to {TRACE_FILE} on exit)")
+    parser.add_argument("--profile", nargs="?", const=PSTATS_FILE, metavar="PSTATS",
+                        help=f"run the session under cProfile and write a pstats file (default: {PSTATS_FILE})")
+    args = parser.parse_args(argv)
+    if not args.rate > 0: parser.error("--rate must be positive")
+    if args.burst is not None and args.burst < 1: parser.error("--burst must be at least 1")
+    if args.trace: TRACER.enabled = True
+
+    if not args.profile:
+        return run_session(args)
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return run_session(args)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        print(f"{C_GREY}[PROFILE] cProfile STATS WRITTEN TO '{args.profile}' (python -m pstats {args.profile}){C_RESET}", file=sys.stderr)
+
+def run_session(args):
+    if not args.batch:
+        main(profile=args.startup_profile)
+        return
+    source = sys.stdin if args.batch == "-" else open(args.batch, 'r', encoding='utf-8')
+    import asyncio
+    try:
+        counts = asyncio.run(run_batch(source, concurrency=max(1, args.concurrency), rate=args.rate, burst=args.burst))
+    finally:
+        if source is not sys.stdin: source.close()
+    summary = " | ".join(f"{k}: {v}" for k, v in sorted(counts.items()))
+    print(f"{C_GREY}[BATCH] {summary or 'NO QUERIES'}{C_RESET}", file=sys.stderr)
+    if TRACER.enabled and TRACER.stages:
+        TRACER.dump(TRACE_FILE)
+        print(f"{C_GREY}[TRACE] STAGE TIMINGS WRITTEN TO '{TRACE_FILE}'{C_RESET}", file=sys.stderr)
+
+if __name__ == "__main__":
+    run_cli()
\ No newline at end of file
@@ -0,0 +1,55 @@
+# test_ghost_journal.py
+# THE CHRONICLE, AUDITED: appends grow the sidecar, they never rewrite it.
+import os
+
+import ghost_journal
+from ghost_journal import Journal
+
+def _log(tmp_path, text=""):
+    path = tmp_path / "mission_log.txt"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+def test_appends_only_extend_the_sidecar(tmp_path, monkeypatch):
+    journal = Journal(_log(tmp_path, "2025-01-01 09:00:00 | first light\n"))
+    journal.refresh()  # Creates the sidecar whole, once
+    replaced = []
+    real_replace = os.replace
+    monkeypatch.setattr(ghost_journal.os, "replace", lambda a, b: (replaced.append(b), real_replace(a, b)))
+
+    sidecar = journal.index_path
+    before = open(sidecar, 'rb').read()
+    for n in range(50):
+        journal.append(f"mission {n} alpha" if n % 2 else f"mission {n} bravo", f"2025-01-02 10:{n:02d}:00")
+        after = open(sidecar, 'rb').read()
+        assert after.startswith(before) and len(after) > len(before)
+        before = after
+    assert replaced == []
+
+    assert len(journal.query(words=["alpha"])) == 25
+    reopened = Journal(journal.log_path)
+    assert reopened.stats() == journal.stats()
+    assert [e["mission"] for e in reopened.query(words=["bravo"], limit=2)] == ["mission 46 bravo", "mission 48 bravo"]
+
+def test_torn_sidecar_tail_is_dropped(tmp_path):
+    journal = Journal(_log(tmp_path))
+    journal.append("one", "2025-01-01")
+    journal.append("two", "2025-01-02")
+    with open(journal.index_path, 'ab') as f:
+        f.write(b'["2025-01-03",99,')  # A write cut short
+    reopened = Journal(journal.log_path)
+    reopened.append("three", "2025-01-03")
+    assert [e["mission"] for e in Journal(journal.log_path).query()] == ["one", "two", "three"]
+
+def test_rewritten_log_rebuilds(tmp_path):
+    journal = Journal(_log(tmp_path))
+    journal.append("old entry", "2025-01-01")
+    with open(journal.log_path, 'w', encoding='utf-8') as f:
+        f.write("2024-06-01 | replaced\nnot an entry\n")
+    assert [e["mission"] for e in journal.query()] == ["replaced"]
+    assert journal.stats()["malformed"] == 1
+    assert Journal(journal.log_path).stats() == journal.stats()
+
+def test_journal_for_is_long_lived(tmp_path):
+    path = _log(tmp_path)
+    assert ghost_journal.journal_for(path) is ghost_journal.journal_for(path)
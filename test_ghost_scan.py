@@ -0,0 +1,61 @@
+# test_ghost_scan.py
+# THE SONAR, CALIBRATED: open, closed and filtered ports against local stand-ins.
+import asyncio
+import errno
+import socket
+from asyncio import selector_events
+
+import pytest
+
+import ghost_scan
+
+@pytest.fixture
+def ports(monkeypatch):
+    """An open port (listening), a closed one (bound, never listening) and two that black-hole or are unreachable."""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(16)
+    closed = socket.socket()
+    closed.bind(("127.0.0.1", 0))
+    hole, unreachable = 9, 13  # Only ever reached through the patched connect below
+
+    real_connect = selector_events.BaseSelectorEventLoop.sock_connect
+    async def sock_connect(loop, sock, address):
+        if address[1] == hole: await asyncio.sleep(3600)  # SYN dropped: no answer at all
+        if address[1] == unreachable: raise OSError(errno.EHOSTUNREACH, "No route to host")
+        return await real_connect(loop, sock, address)
+    monkeypatch.setattr(selector_events.BaseSelectorEventLoop, "sock_connect", sock_connect)
+
+    yield {"open": listener.getsockname()[1], "closed": closed.getsockname()[1], "hole": hole, "unreachable": unreachable}
+    listener.close()
+    closed.close()
+
+def test_states(ports):
+    records = []
+    hosts = ghost_scan.run_scan(["127.0.0.1"], sorted(ports.values()), concurrency=2, timeout=0.2, on_result=records.append)
+    states = {r["port"]: r["state"] for r in records}
+    assert states == {ports["open"]: ghost_scan.OPEN, ports["closed"]: ghost_scan.CLOSED,
+                      ports["hole"]: ghost_scan.FILTERED, ports["unreachable"]: ghost_scan.FILTERED}
+    assert [r["latency_ms"] is None for r in records if r["state"] == ghost_scan.FILTERED] == [True, True]
+    [host] = hosts
+    assert host["open"][0]["port"] == ports["open"] and host["closed"] == 1 and host["filtered"] == 2
+
+def test_summary_matches_streamed_records(ports):
+    records = []
+    targets = ["127.0.0.1/32", "127.0.0.1"]
+    hosts = ghost_scan.run_scan(targets, [ports["open"], ports["closed"]], timeout=0.2, on_result=records.append)
+    assert len(records) == 4
+    assert sorted(map(str, hosts)) == sorted(map(str, ghost_scan.summarize(records)))
+    assert [h["target"] for h in hosts] == targets
+
+@pytest.mark.parametrize("concurrency", [0, -5])
+def test_concurrency_must_be_positive(concurrency):
+    with pytest.raises(ValueError):
+        ghost_scan.run_scan(["127.0.0.1"], [1], concurrency=concurrency)
+
+def test_rejects_oversized_blocks_and_bad_ports():
+    with pytest.raises(ValueError):
+        ghost_scan.run_scan(["10.0.0.0/8"], [80])
+    with pytest.raises(ValueError):
+        ghost_scan.parse_ports("0-80")
+    assert ghost_scan.parse_ports("22, 80-82,22") == [22, 80, 81, 82]
@@ -0,0 +1,99 @@
+# test_ghost_weather.py
+# THE SENTINEL, ON A TIMER: a local wttr.in stand-in checks what the cache TTL lets through.
+import json
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import ghost_weather
+from ghost_weather import WeatherStation
+
+READINGS = {"london": ("Light snow", "25", "1"), "paris": ("Sunny", "5", "10"), "": ("Partly cloudy", "8", "6")}
+
+class StandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        city = urllib.parse.unquote(urllib.parse.urlsplit(self.path).path.strip("/")).lower()
+        self.server.hits.append(city)
+        if city in READINGS:
+            desc, wind, visibility = READINGS[city]
+            body = json.dumps({
+                "current_condition": [{"weatherDesc": [{"value": desc}], "temp_F": "40", "windspeedMiles": wind,
+                                       "winddir16Point": "NW", "visibility": visibility, "humidity": "80"}],
+                "nearest_area": [{"areaName": [{"value": city.title() or "Auto"}], "region": [{"value": "Region"}]}],
+            }).encode()
+            self.send_response(200)
+        else:
+            body = b"Unknown location"
+            self.send_response(404)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    srv.hits, srv.daemon_threads = [], True
+    threading.Thread(target=srv.serve_forever, args=(0.05,), daemon=True).start()
+    srv.url = f"http://127.0.0.1:{srv.server_address[1]}"
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A hand-wound time.time() for the station."""
+    now = [1_800_000_000.0]
+    monkeypatch.setattr(ghost_weather.time, "time", lambda: now[0])
+    return now
+
+def _station(server, tmp_path, ttl=600):
+    return WeatherStation(base=server.url, ttl=ttl, cache_path=str(tmp_path / "weather.json"))
+
+def test_repeat_inside_ttl_never_touches_the_network(server, tmp_path, clock):
+    station = _station(server, tmp_path)
+    first = station.sweep(["London", "Paris"])
+    clock[0] += 599
+    second = station.sweep(["london", "  PARIS "])
+    assert sorted(server.hits) == ["london", "paris"]  # Sweeps fetch concurrently
+    assert [r["cached"] for r in first + second] == [False, False, True, True]
+    assert second[0]["age_s"] == 599.0 and second[0]["alerts"] == first[0]["alerts"]
+    assert "FROZEN PRECIPITATION" in first[0]["alerts"]
+
+def test_expired_sector_is_fetched_again(server, tmp_path, clock):
+    station = _station(server, tmp_path, ttl=60)
+    station.report("London")
+    clock[0] += 61
+    assert station.report("London")["cached"] is False
+    assert server.hits == ["london", "london"] and station.stats["fetched"] == 2
+
+def test_refresh_bypasses_the_cache(server, tmp_path, clock):
+    station = _station(server, tmp_path)
+    station.report(None)
+    assert station.report(None, refresh=True)["cached"] is False
+    assert server.hits == ["", ""]
+
+def test_cache_file_survives_a_restart_but_not_the_ttl(server, tmp_path, clock):
+    station = _station(server, tmp_path, ttl=60)
+    station.sweep(["London", "Paris"])
+    clock[0] += 30
+    station.report("Paris", refresh=True)
+    station.close()
+
+    clock[0] += 40  # London is now 70 s old, Paris 40 s
+    reopened = _station(server, tmp_path, ttl=60)
+    results = reopened.sweep(["London", "Paris"])
+    assert [r["cached"] for r in results] == [False, True]
+    assert sorted(server.hits[:2]) == ["london", "paris"] and server.hits[2:] == ["paris", "london"]
+
+def test_failures_are_records_and_never_cached(server, tmp_path, clock):
+    station = _station(server, tmp_path)
+    assert "error" in station.sweep(["Atlantis"])[0]
+    assert "error" in station.sweep(["Atlantis"])[0]
+    assert server.hits == ["atlantis", "atlantis"] and station.stats["errors"] == 2
@@ -0,0 +1,124 @@
+# test_ghost_web.py
+# THE LOOKING GLASS, SHATTERED: however the page is chunked, the same title comes out.
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ghost_web import TitleClient, TitleScanner
+
+PAGES = [
+    b'<html><head><title data-x="1" lang="en">Split &amp; Found</title></head>',
+    b'<html><head><meta charset="utf-8"><TITLE>Shout</TITLE ></head>',
+    b'<html><head><link rel="icon" href="x"><title>\n  Many   Lines \n</title>',
+]
+
+def _feed(page, size):
+    scanner = TitleScanner()
+    done = False
+    for i in range(0, len(page), size):
+        done = scanner.feed(page[i:i + size])
+        if done: break
+    return done, scanner.title()
+
+@pytest.mark.parametrize("page", PAGES)
+def test_every_split_point(page):
+    whole = _feed(page, len(page))
+    assert whole[0]
+    for cut in range(1, len(page)):
+        scanner = TitleScanner()
+        scanner.feed(page[:cut])
+        scanner.feed(page[cut:])
+        assert scanner.title() == whole[1], cut
+
+@pytest.mark.parametrize("page", PAGES)
+def test_single_byte_feed(page):
+    assert _feed(page, 1) == _feed(page, len(page))
+
+def test_titles():
+    assert [_feed(page, 3)[1] for page in PAGES] == ["Split & Found", "Shout", "Many Lines"]
+
+def test_no_closing_tag():
+    assert _feed(b'<html><title data-x="1">never closed', 2) == (False, None)
+
+# --- THE STAND-IN: a local HTTP/1.1 server with the pages the client has to survive ---
+class StandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, body, status=200, **headers):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items(): self.send_header(name.replace("_", "-"), value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        if self.server.drop_after: self.close_connection = True  # Hang up without saying so
+        if self.path == "/chunked":
+            # Each HTTP chunk is flushed on its own, splitting the attributed tag mid-attribute
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("Content-Type", "text/html")
+            self.end_headers()
+            for part in [b"<html><tit", b'le data-x="1', b'">Split', b" Title</ti", b"tle>", b"y" * 100]:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+                self.wfile.flush()
+                time.sleep(0.01)
+            self.wfile.write(b"0\r\n\r\n")
+        elif self.path == "/big":
+            self._send(b"<head><meta charset='latin-1'><TITLE>\n Caf\xe9 &amp; Bar </title></head>" + b"x" * 2_000_000)
+        elif self.path == "/redirect":
+            self._send(b"", 302, Location="/small")
+        elif self.path == "/untitled":
+            self._send(b"z" * 100_000)
+        else:
+            self._send(b"<title>Small Page</title>", Content_Type="text/html; charset=utf-8")
+
+    def log_message(self, *args):
+        pass
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # Clients hanging up mid-body is the behaviour under test
+
+@pytest.fixture
+def server():
+    srv = Server(("127.0.0.1", 0), StandIn)
+    srv.paths, srv.drop_after = [], False
+    threading.Thread(target=srv.serve_forever, args=(0.05,), daemon=True).start()
+    srv.url = f"http://127.0.0.1:{srv.server_address[1]}"
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+def test_chunked_page_split_mid_tag(server):
+    client = TitleClient()
+    assert client.title(f"{server.url}/chunked")["title"] == "Split Title"
+
+def test_hangs_up_at_closing_tag(server):
+    client = TitleClient()
+    result = client.title(f"{server.url}/big")
+    assert result["title"] == "Café & Bar" and result["bytes"] < 100_000
+    assert client.stats["hangups"] == 1
+
+def test_redirect_then_pooled_connection(server):
+    client = TitleClient()
+    result = client.title(f"{server.url}/redirect")
+    assert result["final_url"] == f"{server.url}/small" and result["title"] == "Small Page"
+    assert client.title(f"{server.url}/small")["title"] == "Small Page"
+    assert client.stats["connections"] == 1 and client.stats["reused"] == 2
+
+def test_stale_pooled_socket_is_redialed(server):
+    server.drop_after = True
+    client = TitleClient()
+    assert [client.title(f"{server.url}/small")["title"] for _ in range(3)] == ["Small Page"] * 3
+    assert client.stats["connections"] == 3 and server.paths == ["/small"] * 3
+
+def test_budget_runs_out_without_a_title(server):
+    client = TitleClient(budget=10_000)
+    result = client.title(f"{server.url}/untitled")
+    assert result["title"] is None and result["bytes"] == 10_000
@@ -0,0 +1,81 @@
+# test_ghost_whois.py
+# THE REGISTRY, REHEARSED: a local asyncio stand-in plays both IANA and the registry.
+import asyncio
+import socket
+
+import pytest
+
+import ghost_whois
+from ghost_whois import WhoisClient
+
+class StandIn:
+    """A bare TLD gets an IANA-style referral back to this server; a domain gets a registry record."""
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.queries = []
+        self.active = self.peak = 0
+
+    async def handle(self, reader, writer):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        query = (await reader.readline()).decode().strip()
+        self.queries.append(query)
+        await asyncio.sleep(self.delay)
+        if "." in query:
+            reply = f"Domain Name: {query.upper()}\n" + "x" * 100000 + "\n"  # Several reads' worth
+        else:
+            reply = f"% IANA WHOIS server\nrefer:        127.0.0.1\n"
+        writer.write(reply.encode())
+        await writer.drain()
+        writer.close()
+        self.active -= 1
+
+def _run(stand_in, client_kwargs, domains, concurrency=16):
+    async def go():
+        server = await asyncio.start_server(stand_in.handle, "127.0.0.1", 0)
+        client = WhoisClient(port=server.sockets[0].getsockname()[1], iana="127.0.0.1", **client_kwargs)
+        async with server:
+            results = await client.lookup_many(domains, concurrency)
+        client.save()
+        return client, results
+    return asyncio.run(go())
+
+DOMAINS = ["alpha.com", "bravo.com", "charlie.com", "delta.org", "echo.org", "foxtrot.com"]
+
+def test_one_referral_per_tld_and_throttled(tmp_path):
+    stand_in = StandIn()
+    client, results = _run(stand_in, {"cache_path": str(tmp_path / "whois.json"), "per_server": 2}, DOMAINS)
+    assert [r["domain"] for r in results] == DOMAINS
+    assert all(r["response"].startswith(f"Domain Name: {r['domain'].upper()}") for r in results)
+    assert sorted(q for q in stand_in.queries if "." not in q) == ["com", "org"]  # Shared, not one per domain
+    assert sorted(q for q in stand_in.queries if "." in q) == sorted(DOMAINS)
+    assert stand_in.peak <= 2
+    assert client.stats["queries"] == len(DOMAINS) + 2 and client.stats["errors"] == 0
+
+def test_cache_persists_referrals_and_responses(tmp_path):
+    cache = str(tmp_path / "whois.json")
+    _run(StandIn(0), {"cache_path": cache}, DOMAINS[:3])
+
+    stand_in = StandIn(0)
+    client, results = _run(stand_in, {"cache_path": cache}, DOMAINS[:3] + ["golf.com"])
+    assert [r["cached"] for r in results] == [True, True, True, False]
+    assert stand_in.queries == ["golf.com"]  # The .com referral came from the cache too
+    assert client.stats["response_hits"] == 3 and client.stats["referral_hits"] == 1
+
+def test_expired_responses_are_fetched_again(tmp_path, monkeypatch):
+    cache = str(tmp_path / "whois.json")
+    _run(StandIn(0), {"cache_path": cache, "response_ttl": 60}, ["alpha.com"])
+    later = ghost_whois.time.time() + 120
+    monkeypatch.setattr(ghost_whois.time, "time", lambda: later)
+    stand_in = StandIn(0)
+    _, [result] = _run(stand_in, {"cache_path": cache, "response_ttl": 60}, ["alpha.com"])
+    assert result["cached"] is False and stand_in.queries == ["alpha.com"]
+
+def test_unreachable_server_is_an_error_record(tmp_path):
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()  # Nothing listens there now
+    client = WhoisClient(port=port, iana="127.0.0.1", timeout=1.0, cache_path=str(tmp_path / "whois.json"))
+    [result] = ghost_whois.bulk_whois(["alpha.com"], client=client)
+    assert "error" in result and client.stats["errors"] == 1
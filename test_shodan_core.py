@@ -0,0 +1,160 @@
+# test_shodan_core.py
+# THE MIRROR: The batch engine must agree with the scalar Logos, row for row.
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import shodan_core
+from shodan_core import calculate_shodan_weight, calculate_shodan_weight_batch, get_plan
+
+COLUMNS = ("titles", "directors", "years", "countries", "formats", "genres", "plots", "actors", "awards")
+
+def _pools():
+    tables = shodan_core.RULESET.tables
+    canon = list(shodan_core.SACRED_CANON) + list(shodan_core.APOCRYPHA)
+    resonance = list(tables["resonance_keys"])
+    return {
+        # Canon titles in odd casings/punctuation, so the normalized index is exercised too
+        "titles": canon + [t.upper() for t in canon] + [t.replace(" ", "  ") + "!" for t in canon]
+                  + ["Blade Runner", "Heat", "", "Stalker", "Ghost In The Shell 2"],
+        "directors": tables["heavy_hitters"] + [d.lower() for d in tables["ark_heavy_hitters"]]
+                     + ["Katsuhiro Otomo", "Mamoru Oshii", "Greg Miller", "Nobody", "", "N/A"],
+        # Missing and malformed years next to every bucket edge
+        "years": ["1959", "1960", "1979", "1980", "1999", "2000", "2020", "2021", "2030",
+                  "1988", "1995", "2002", "", "N/A", None, "19xx", "2001-2003", " 1990 "],
+        "countries": ["USA", "United States", "Japan", "UK, USA", "France", "", "US"],
+        "formats": ["Digital", "Blu-Ray", "4K Blu-Ray", "DVD", ""],
+        "genres": resonance + [k.lower() for k in resonance] + ["Drama", "Comedy, Romance", ""],
+        "plots": ["", "A quiet story.", "An AI hacker in a cyberpunk dystopia.",
+                  "A surreal noir about a robot and a cyborg on mars, with time travel."],
+        "actors": tables["tektons"] + ["Nobody", "", "keanu reeves"],
+        "awards": ["", "N/A", "Won 2 Oscars. 10 wins & 5 nominations", "3 wins", "1 nomination",
+                   "Won 1 Oscar. Another 40 wins & 60 nominations."],
+    }
+
+def _random_rows(rng, n):
+    pools = _pools()
+    rows = [[rng.choice(pools[c]) for c in COLUMNS] for _ in range(n)]
+    # Resonance-ceiling rows: every key at once pushes the running total past the ceiling
+    everything = " ".join(shodan_core.RULESET.tables["resonance_keys"])
+    for row in rows[::7]:
+        row[5], row[6] = everything, everything
+    return rows
+
+def _scalar(rows, profile):
+    plan = get_plan(profile)
+    return [plan.score(*row) for row in rows]
+
+def _batch(rows, profile):
+    columns = [list(col) for col in zip(*rows)] if rows else [[] for _ in COLUMNS]
+    return calculate_shodan_weight_batch(*columns, profile=profile)
+
+@pytest.mark.parametrize("profile", ["uplink", "ark"])
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_batch_matches_scalar_on_random_columns(profile, seed):
+    rows = _random_rows(random.Random(seed), 600)
+    assert _batch(rows, profile).tolist() == _scalar(rows, profile)
+
+def test_canon_and_apocrypha_rows():
+    rows = [
+        ["Akira", "Katsuhiro Otomo", "1988", "Japan", "Blu-Ray", "", "", "", ""],
+        ["AKIRA", "Someone Else", "1988", "Japan", "Blu-Ray", "", "", "", ""],   # Director mismatch
+        ["Akira", "Katsuhiro Otomo", "2016", "Japan", "Digital", "", "", "", ""],  # Year mismatch
+        ["Tekken 3", "", None, "", "Digital", "", "", "", ""],
+        ["Rule of Rose", "Sony", "2006", "Japan", "Digital", "Horror", "", "", ""],
+    ]
+    batch = _batch(rows, "uplink").tolist()
+    assert batch == [calculate_shodan_weight(*row) for row in rows]
+    assert batch[0] == 10.0 and batch[3] == 9.0 and batch[4] == 0.0
+
+def test_resonance_ceiling_rows():
+    everything = " ".join(shodan_core.RESONANCE_KEYS)
+    rows = [["Nowhere", "Kubrick", year, "Japan", "Blu-Ray", everything, everything, "Keanu Reeves", ""]
+            for year in ("1950", "2010", "", "bad")]
+    assert _batch(rows, "uplink").tolist() == _scalar(rows, "uplink")
+
+def test_missing_and_bad_years():
+    rows = [["X", "", year, "USA", "Digital", "", "", "", ""] for year in ("", None, "N/A", "19xx", "2001-2003")]
+    batch = _batch(rows, "uplink").tolist()
+    assert batch == _scalar(rows, "uplink")
+    assert len(set(batch)) == 1  # No year bonus for any of them
+
+def test_empty_input():
+    out = calculate_shodan_weight_batch([], [], [], [])
+    assert isinstance(out, np.ndarray) and out.dtype == np.float64 and out.shape == (0,)
+
+def test_optional_columns_default_like_scalar():
+    rows = _random_rows(random.Random(9), 50)
+    titles, directors, years, countries = ([row[i] for row in rows] for i in range(4))
+    batch = calculate_shodan_weight_batch(titles, directors, years, countries).tolist()
+    assert batch == [calculate_shodan_weight(t, d, y, c) for t, d, y, c in zip(titles, directors, years, countries)]
+
+def test_chunk_boundaries(monkeypatch):
+    monkeypatch.setattr(shodan_core, "BATCH_CHUNK", 7)
+    rows = _random_rows(random.Random(5), 100)
+    assert _batch(rows, "uplink").tolist() == _scalar(rows, "uplink")
+
+def test_mismatched_columns_rejected():
+    with pytest.raises(ValueError):
+        calculate_shodan_weight_batch(["a", "b"], ["x"], ["1990", "1991"], ["USA", "USA"])
+
+@pytest.mark.parametrize("case_sensitive", [False, True])
+def test_matcher_strategies_agree(case_sensitive):
+    # Overlapping keys ("AI" inside "Artificial Intelligence", "Noir" inside "Tech-Noir") must all be reported
+    keys = list(shodan_core.RESONANCE_KEYS) + ["noir", "Tech", ""]
+    texts = [r[6] for r in _random_rows(random.Random(3), 200)] + ["", "TECH-NOIR", "tech-noir ai", "Kubrick"]
+    substring = shodan_core.SignalMatcher(keys, case_sensitive, trie=False)
+    trie = shodan_core.SignalMatcher(keys, case_sensitive, trie=True)
+    for text in texts:
+        assert list(trie.scan(text)) == list(substring.scan(text))
+        assert trie.search(text) == substring.search(text)
+
+# --- THE INDEX: _CANON_INDEX must always equal a fresh rebuild from SACRED_CANON ---
+@pytest.fixture
+def canon():
+    saved = dict(shodan_core.SACRED_CANON)
+    yield shodan_core.SACRED_CANON
+    shodan_core.SACRED_CANON.clear()
+    shodan_core.SACRED_CANON.update(saved)
+    shodan_core.rebuild_canon_index()
+
+def _assert_index_consistent():
+    incremental = {k: list(v) for k, v in shodan_core._CANON_INDEX.items()}
+    shodan_core.rebuild_canon_index()
+    assert incremental == shodan_core._CANON_INDEX
+    assert sorted(k for keys in incremental.values() for k in keys) == sorted(shodan_core.SACRED_CANON)
+
+def test_register_and_remove_with_duplicate_normalized_keys(canon):
+    # Three spellings, one normalized key "bladerunner"; the year-bound one is checked first
+    shodan_core.register_canon("Blade Runner", 9.0, year="1982")
+    shodan_core.register_canon("blade-runner", 7.0)
+    shodan_core.register_canon("BLADE RUNNER!", 6.0, director="Scott")
+    _assert_index_consistent()
+    assert shodan_core._CANON_INDEX["bladerunner"] == ["blade runner", "blade-runner", "blade runner!"]
+    assert shodan_core.check_sacred_canon("Blade Runner", "1982") == ("SACRED", 9.0)
+    assert shodan_core.check_sacred_canon("Blade Runner", "2049") == ("SACRED", 7.0)
+
+    # Overwriting a key keeps its slot instead of indexing it twice
+    shodan_core.register_canon("blade-runner", 5.0)
+    _assert_index_consistent()
+    assert shodan_core._CANON_INDEX["bladerunner"].count("blade-runner") == 1
+
+    # Any spelling purges every entry sharing the normalized key
+    assert shodan_core.remove_canon("  Blade...Runner ") == 3
+    _assert_index_consistent()
+    assert "bladerunner" not in shodan_core._CANON_INDEX and shodan_core.get_sacred_data("Blade Runner") is None
+    assert shodan_core.remove_canon("Blade Runner") == 0
+
+def test_random_register_remove_sequence(canon):
+    rng = random.Random(11)
+    spellings = ["Heat", "heat", "HEAT!", "Stalker", "stal-ker", "Akira", "A.K.I.R.A", "Solaris", "Tekken 3", "tekken-3"]
+    for _ in range(300):
+        title = rng.choice(spellings)
+        if rng.random() < 0.6:
+            shodan_core.register_canon(title, rng.choice([5.0, 8.0]), year=rng.choice([None, "1979"]))
+        else:
+            before = sum(shodan_core.normalize_key(k) == shodan_core.normalize_key(title) for k in canon)
+            assert shodan_core.remove_canon(title) == before
+        _assert_index_consistent()
@@ -0,0 +1,93 @@
+# test_shodan_net.py
+# THE CONDUIT, UNDER LOAD: a local stand-in server checks retries, backoff and keep-alive reuse.
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import shodan_net
+from shodan_net import HttpClient, NetworkDown
+
+class StandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive unless the handler says otherwise
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits.append((self.path, self.client_address[1]))
+            status = server.statuses.pop(0) if server.statuses else 200
+        body = f"{self.path} {status}".encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # Hang up without announcing it, as an idle keep-alive timeout would
+        if server.drop_after: self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    srv.hits, srv.statuses, srv.drop_after, srv.lock = [], [], False, threading.Lock()
+    srv.daemon_threads = True
+    thread = threading.Thread(target=srv.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    srv.url = f"http://127.0.0.1:{srv.server_address[1]}"
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(shodan_net.time, "sleep", delays.append)
+    return delays
+
+def test_keep_alive_reuses_one_connection(server):
+    client = HttpClient()
+    for n in range(5):
+        status, _, body = client.get(f"{server.url}/q{n}")
+        assert status == 200 and body == f"/q{n} 200".encode()
+    client.close()
+    assert client.stats == {"requests": 5, "connections": 1, "reused": 4, "retries": 0}
+    assert len({port for _, port in server.hits}) == 1
+
+def test_5xx_is_retried_with_capped_backoff(server, sleeps):
+    server.statuses = [503, 502, 500]
+    client = HttpClient(retries=3, backoff=0.5, max_backoff=1.0)
+    status, _, _ = client.get(f"{server.url}/flaky")
+    assert status == 200
+    assert client.stats["retries"] == 3 and len(server.hits) == 4
+    # Full jitter: each delay lies in [0, min(max_backoff, backoff * 2**attempt)]
+    assert [0 <= d <= cap for d, cap in zip(sleeps, (0.5, 1.0, 1.0))] == [True] * 3
+
+def test_attempts_run_out(server, sleeps):
+    server.statuses = [500] * 10
+    client = HttpClient(retries=2)
+    with pytest.raises(NetworkDown, match="HTTP 500"):
+        client.get(f"{server.url}/down")
+    assert len(server.hits) == 3 and len(sleeps) == 2
+
+def test_4xx_is_not_retried(server, sleeps):
+    server.statuses = [404]
+    client = HttpClient()
+    assert client.get(f"{server.url}/missing")[0] == 404
+    assert len(server.hits) == 1 and sleeps == []
+
+def test_stale_pooled_socket_redials_without_backoff(server, sleeps):
+    server.drop_after = True
+    client = HttpClient()
+    assert client.get(f"{server.url}/one")[0] == 200
+    assert client.get(f"{server.url}/two")[0] == 200
+    assert client.stats["retries"] == 0 and client.stats["connections"] == 2 and sleeps == []
+    assert [path for path, _ in server.hits] == ["/one", "/two"]
+
+def test_refused_connection_is_network_down(sleeps):
+    probe = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    port = probe.server_address[1]
+    probe.server_close()  # Nothing listens there now
+    with pytest.raises(NetworkDown):
+        HttpClient(retries=1).get(f"http://127.0.0.1:{port}/")
+    assert len(sleeps) == 1